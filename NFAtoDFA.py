@@ -43,20 +43,26 @@ def main():
     parser = argparse.ArgumentParser(description='Program to convert an NFA represented by the DOT-language into an equivalent minimal DFA and view the corresponding results.')
     parser.add_argument('NFA',action='store',type=str,help='the NFA file (as a .gv filetype)')
     parser.add_argument('-f','--full',action='store_true',help='will write and display a fully connected DFA, including trap and NULL states')
+    parser.add_argument('-c','--collapse',action='store_true',help='draw each strongly-connected component as a single summary state')
+    parser.add_argument('--focus',action='store',type=str,nargs='+',help='only draw the states near the given states')
+    parser.add_argument('--hops',action='store',type=int,default=1,help='the neighbourhood size for --focus (default: 1)')
+    parser.add_argument('--limit',action='store',type=int,default=automata.RENDER_LIMIT,help='only draw the first LIMIT states reached from q_0, or from the --focus states (default: %(default)s)')
+    parser.add_argument('-b','--background',action='store_true',help='render the PDFs in background processes without viewing them')
+    parser.add_argument('--no-view',action='store_true',help='render the PDFs without viewing them')
     args = parser.parse_args()
     if args.full:
         N = automata.NFA(str(args.NFA))
         D = N.toDFA()
+        D.trim(removeDead=False)
     else:
         N = automata.NFA(str(args.NFA))
-        D = N.toDFA()
+        D = N.toDFA(sparse=True)
         D.reduce()
         
-    N = automata.NFA('./testGraphs/nfa_8.gv')
-    N.saveAndView()
-    D = N.toDFA()
-    D.reduce()
-    D.saveAndView()
+    View = {'view':not args.no_view,'background':args.background,'collapse':args.collapse,
+            'focus':args.focus,'hops':args.hops,'limit':args.limit}
+    N.saveAndView(**View)
+    D.saveAndView(**View)
     
     del N
     del D
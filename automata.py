@@ -23,16 +23,1299 @@ Created on Wed Feb 24 10:07:22 2021
 
 @author: jimleon
 """
+import bisect
+import functools
+import hashlib
+import marshal
+import multiprocessing
+import multiprocessing.resource_tracker
+import multiprocessing.shared_memory
+import os
+import random
+import sys
+import threading
+import types
+import unicodedata
 import networkx as nx
 import graphviz as gv
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_CODE_POINT = 0x10FFFF
+#A DFA state is stored as a dense row when at least this fraction of the 
+#Alphabet leads somewhere other than the NULL state.
+DENSE_FANOUT = 0.5
+#Larger automata are sampled before rendering (see saveAndView()).
+RENDER_LIMIT = 2000
+#Largest byte-table size (in bytes) for the NumPy NFASimulator.
+SIMULATOR_TABLE_BYTES = 1 << 28
+#Compiled matchers (see DFA.compile()) are cached in this directory.
+COMPILE_CACHE = os.path.join(os.path.expanduser('~'),'.cache','automata')
+#Symbols with at most this many characters are written out in compiled 
+#matchers; larger ones are looked up on first use.
+COMPILE_EXPAND = 256
+#Header fields of a SharedDFA block, stored as int64 ahead of the arrays.
+_SHARED_HEADER = ('Magic','Rows','Columns','Spans','Start','Tracker')
+_SHARED_MAGIC = 0x32414644
+#The SharedDFA attached by each process-pool worker (see _sharedAttach()).
+_SHARED = None
+#The Graphviz DOT parser keeps global state, so files are read one at a time.
+_READ_LOCK = threading.Lock()
+
+def _splitLabel(label):
+    """
+    Splits an edge label into its symbols.  Symbols are separated by commas and
+    are either a single character (including 'λ') or a bracketed character
+    class such as '[a-z]', '[^0-9]' or '[\\p{L}]'.
+
+    Parameters
+    ----------
+    label : str
+        The edge label as given in the .gv file.
+
+    Returns
+    -------
+    List
+        The symbols of the label, in order of appearance.
+
+    """
+    Symbols = []
+    index = 0
+    while index < len(label):
+        if label[index] == ',':
+            index = index + 1
+        elif label[index] == '[':
+            indey = index + 1
+            while indey < len(label) and label[indey] != ']':
+                if label[indey] == '\\':
+                    indey = indey + 1
+                indey = indey + 1
+            Symbols.append(label[index:indey+1])
+            index = indey + 1
+        else:
+            Symbols.append(label[index])
+            index = index + 1
+    return Symbols
+
+def _mergeRanges(ranges):
+    """
+    Sorts a list of (low, high) code point ranges and merges the ones that
+    overlap or touch.
+
+    Parameters
+    ----------
+    ranges : List
+        The (low, high) ranges to merge.
+
+    Returns
+    -------
+    List
+        Sorted, disjoint (low, high) ranges.
+
+    """
+    Merged = []
+    for i in sorted(ranges):
+        if Merged and i[0] <= Merged[-1][1] + 1:
+            if i[1] > Merged[-1][1]:
+                Merged[-1] = (Merged[-1][0],i[1])
+        else:
+            Merged.append(i)
+    return Merged
+
+@functools.lru_cache(maxsize=None)
+def _categoryRanges(category):
+    """
+    Returns the code point ranges of a Unicode general category (or category
+    prefix, e.g. 'L' for all letters).
+
+    Parameters
+    ----------
+    category : str
+        The Unicode general category name, as in unicodedata.category().
+
+    Returns
+    -------
+    tuple
+        Sorted, disjoint (low, high) ranges.
+
+    """
+    Ranges = []
+    Start = -1
+    for i in range(MAX_CODE_POINT + 1):
+        if unicodedata.category(chr(i)).startswith(category):
+            if Start < 0:
+                Start = i
+        elif Start >= 0:
+            Ranges.append((Start,i-1))
+            Start = -1
+    if Start >= 0:
+        Ranges.append((Start,MAX_CODE_POINT))
+    return tuple(Ranges)
+
+@functools.lru_cache(maxsize=None)
+def _symbolRanges(symbol):
+    """
+    Returns the set of characters denoted by a symbol as code point ranges.
+
+    Parameters
+    ----------
+    symbol : str
+        A single character or a bracketed character class (see _splitLabel()).
+
+    Returns
+    -------
+    tuple
+        Sorted, disjoint (low, high) ranges.
+
+    """
+    if len(symbol) == 1 or symbol[0] != '[':
+        return ((ord(symbol[0]),ord(symbol[0])),)
+    Body = symbol[1:-1]
+    Negate = Body.startswith('^')
+    if Negate:
+        Body = Body[1:]
+    Ranges = []
+    Items = []
+    index = 0
+    while index < len(Body):
+        if Body[index] == '\\' and index + 1 < len(Body):
+            Esc = Body[index+1]
+            if Esc == 'p' and index + 2 < len(Body) and Body[index+2] == '{':
+                End = Body.index('}',index)
+                Ranges.extend(_categoryRanges(Body[index+3:End]))
+                Items.append(None)
+                index = End + 1
+            elif Esc == 'u':
+                Items.append(int(Body[index+2:index+6],16))
+                index = index + 6
+            elif Esc == 'U':
+                Items.append(int(Body[index+2:index+10],16))
+                index = index + 10
+            else:
+                Items.append(ord(Esc))
+                index = index + 2
+        elif Body[index] == '-' and Items and Items[-1] is not None and index + 1 < len(Body):
+            Items.append('-')
+            index = index + 1
+        else:
+            Items.append(ord(Body[index]))
+            index = index + 1
+    index = 0
+    while index < len(Items):
+        if index + 2 < len(Items) and Items[index+1] == '-' and isinstance(Items[index+2],int):
+            Ranges.append((Items[index],Items[index+2]))
+            index = index + 3
+        else:
+            if Items[index] == '-':
+                Ranges.append((ord('-'),ord('-')))
+            elif Items[index] is not None:
+                Ranges.append((Items[index],Items[index]))
+            index = index + 1
+    Ranges = _mergeRanges(Ranges)
+    if Negate:
+        Complement = []
+        Low = 0
+        for i in Ranges:
+            if i[0] > Low:
+                Complement.append((Low,i[0]-1))
+            Low = i[1] + 1
+        if Low <= MAX_CODE_POINT:
+            Complement.append((Low,MAX_CODE_POINT))
+        Ranges = Complement
+    return tuple(Ranges)
+
+def _rangesLabel(ranges):
+    """
+    Creates the symbol for a list of code point ranges.  A lone character is
+    written as itself; anything else is written as a bracketed character class.
+
+    Parameters
+    ----------
+    ranges : List
+        Sorted, disjoint (low, high) ranges.
+
+    Returns
+    -------
+    str
+        The symbol denoting exactly the given ranges.
+
+    """
+    def escape(cp):
+        Char = chr(cp)
+        if Char in '\\]-^':
+            return '\\' + Char
+        if not Char.isprintable() or Char.isspace():
+            if cp > 0xFFFF:
+                return '\\U%08X' % cp
+            return '\\u%04X' % cp
+        return Char
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        Char = chr(ranges[0][0])
+        if Char not in ',[\\"\u03BB' and Char.isprintable() and not Char.isspace():
+            return Char
+    Label = '['
+    for i in ranges:
+        Label = Label + escape(i[0])
+        if i[1] > i[0]:
+            Label = Label + '-' + escape(i[1])
+    return Label + ']'
+
+def _tableRows(alphabet,deltas,storage):
+    """
+    Builds the FrozenDFA table rows for the given Delta-transitions: a dense 
+    row (one slot per Alphabet symbol) or a sparse row (sorted symbol/target 
+    tuples) per state with live transitions, according to the storage mode.  
+    Transitions to the NULL state are left out.
+
+    Parameters
+    ----------
+    alphabet : List
+        The Alphabet of the DFA.
+    deltas : List (2D)
+        The Delta-transitions.
+    storage : str
+        'dense', 'sparse', or 'auto' (see DENSE_FANOUT).
+
+    Returns
+    -------
+    dict
+        The row of each state, by state name.
+
+    """
+    if storage not in ['dense','sparse','auto']:
+        raise ValueError('unknown storage mode %r' % storage)
+    Index = {}
+    for i in range(len(alphabet)):
+        Index[alphabet[i]] = i
+    Live = {}
+    for i in deltas:
+        if i[2] != '\u2205':
+            Live.setdefault(i[0],[]).append((Index[i[1]],i[2]))
+    Table = {}
+    for i in Live:
+        Row = sorted(Live[i])
+        if storage == 'dense' or (storage == 'auto' and len(Row) >= DENSE_FANOUT*len(alphabet)):
+            Dense = [None]*len(alphabet)
+            for j in Row:
+                Dense[j[0]] = j[1]
+            Table[i] = tuple(Dense)
+        else:
+            Table[i] = (tuple(j[0] for j in Row),tuple(j[1] for j in Row))
+    return Table
+
+def _deepSize(objs,seen):
+    """
+    Returns the memory used by the given objects and everything they hold
+    (container items, dict keys and values, instance attributes and slots,
+    NumPy buffers).  Objects already in seen are not counted again, so a
+    name or row shared between structures is counted once.
+
+    Parameters
+    ----------
+    objs : List
+        The objects.
+    seen : set
+        The ids of the objects already counted; updated in place.
+
+    Returns
+    -------
+    int
+        The size, in bytes.
+
+    """
+    Size = 0
+    Stack = list(objs)
+    while Stack:
+        Obj = Stack.pop()
+        if Obj is None or id(Obj) in seen or isinstance(Obj,(type,types.ModuleType,types.FunctionType)):
+            continue
+        seen.add(id(Obj))
+        if type(Obj) is types.MappingProxyType:
+            Obj = dict(Obj)
+            seen.add(id(Obj))
+        Size = Size + sys.getsizeof(Obj)
+        if isinstance(Obj,dict):
+            Stack.extend(Obj.keys())
+            Stack.extend(Obj.values())
+        elif isinstance(Obj,(list,tuple,set,frozenset)):
+            Stack.extend(Obj)
+        elif np is not None and isinstance(Obj,np.ndarray):
+            Stack.append(Obj.base)
+        elif not isinstance(Obj,(str,bytes,int,float,bool)):
+            if hasattr(Obj,'__dict__'):
+                Stack.append(vars(Obj))
+            for i in type(Obj).__mro__:
+                for j in i.__dict__.get('__slots__',()):
+                    Name = '_' + i.__name__.lstrip('_') + j if j[:2] == '__' else j
+                    Stack.append(getattr(Obj,Name,None))
+    return Size
+
+def _minterms(symbols):
+    """
+    Splits the character sets of the given symbols into disjoint minterms;
+    i.e. the classes of characters that are matched by exactly the same
+    symbols.
+
+    Parameters
+    ----------
+    symbols : List
+        The (non-lambda) symbols of an automaton.
+
+    Returns
+    -------
+    Minterms : List
+        The minterm symbols, ordered by their lowest character.
+    Covers : dict
+        Maps each given symbol to the list of minterms it is made up of.
+
+    """
+    Events = {}
+    for i in symbols:
+        for j in _symbolRanges(i):
+            Events.setdefault(j[0],[]).append((i,1))
+            Events.setdefault(j[1]+1,[]).append((i,-1))
+    Active = {}
+    Groups = {}
+    Bounds = sorted(Events)
+    for index in range(len(Bounds)):
+        for i in Events[Bounds[index]]:
+            Active[i[0]] = Active.get(i[0],0) + i[1]
+            if Active[i[0]] == 0:
+                del Active[i[0]]
+        if Active and index + 1 < len(Bounds):
+            Key = frozenset(Active)
+            Groups.setdefault(Key,[]).append((Bounds[index],Bounds[index+1]-1))
+    Minterms = []
+    Covers = {}
+    for i in symbols:
+        Covers[i] = []
+    for Key in sorted(Groups,key=lambda k: Groups[k][0][0]):
+        Label = _rangesLabel(_mergeRanges(Groups[Key]))
+        Minterms.append(Label)
+        for i in Key:
+            Covers[i].append(Label)
+    return Minterms, Covers
+
+def _subsetMoves(deltas,covers,index):
+    """
+    Computes, for each state of an automaton, the lambda-closed set of states 
+    that each minterm leads to (see _minterms()).  A lambda-closed set of 
+    states moves on a minterm to the union of its states' sets.
+
+    Parameters
+    ----------
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    covers : dict
+        Maps each symbol of the automaton to its minterms.
+    index : dict
+        Maps each minterm to its number.
+
+    Returns
+    -------
+    Moves : dict
+        Maps each state to a dict from minterm numbers to sets of states.
+    Start : frozenset
+        The lambda closure of 'q_0'.
+
+    """
+    Lambdas = {}
+    for i in deltas:
+        if i[1] == '\u03BB':
+            Lambdas.setdefault(i[0],[]).append(i[2])
+    Closures = {}
+    def closure(state):
+        if state not in Closures:
+            Seen = {state}
+            Stack = [state]
+            while Stack:
+                for j in Lambdas.get(Stack.pop(),()):
+                    if j not in Seen:
+                        Seen.add(j)
+                        Stack.append(j)
+            Closures[state] = frozenset(Seen)
+        return Closures[state]
+    Moves = {}
+    for i in deltas:
+        if i[1] != '\u03BB':
+            Row = Moves.setdefault(i[0],{})
+            for j in covers[i[1]]:
+                Row.setdefault(index[j],set()).update(closure(i[2]))
+    return Moves, closure('q_0')
+
+def _antichainSearch(left,leftStarts,leftFinals,right,rightStart,rightFinals,chars):
+    """
+    Searches for a string accepted by the left automaton and rejected by the 
+    right one, over pairs of a left state and a lambda-closed set of right 
+    states (the subset construction of the right automaton, run alongside 
+    the left one).  The search is breadth-first, so the string found is a 
+    shortest one.  A pair is dropped when another pair with the same left 
+    state and a subset of its right states has been found at the same or a 
+    smaller depth: any string rejected from the larger set is also rejected 
+    from the smaller one.  
+    Only the minimal pairs (an antichain) are kept and explored, which 
+    often avoids most of the exponentially many subsets (De Wulf, Doyen, 
+    Henzinger and Raskin).
+
+    Parameters
+    ----------
+    left : dict
+        The moves of the left automaton (see _subsetMoves()).
+    leftStarts : iterable
+        The start states of the left automaton.
+    leftFinals : set
+        The final states of the left automaton.
+    right : dict
+        The moves of the right automaton.
+    rightStart : frozenset
+        The start set of the right automaton.
+    rightFinals : set
+        The final states of the right automaton.
+    chars : List
+        A character of each minterm.
+
+    Returns
+    -------
+    str
+        A string accepted by the left automaton and not by the right one, or 
+        None if there is none.
+
+    """
+    Antichain = {}
+    Queue = []
+    def insert(state,subset,parent,char):
+        #the sets kept for each left state, by size (only smaller sets can be 
+        #proper subsets), with the depth each was found at.
+        Seen = Antichain.setdefault(state,{})
+        Size = len(subset)
+        Depth = 0 if parent is None else Queue[parent][4] + 1
+        if subset in Seen.get(Size,()):
+            return False
+        for i in Seen:
+            if i < Size and any(j <= subset for j in Seen[i]):
+                return False
+        #a larger set is only dropped if found at this depth, since one still 
+        #queued at a smaller depth may lead to a shorter string.
+        for i in Seen:
+            if i > Size:
+                Seen[i] = {j: Seen[i][j] for j in Seen[i] if Seen[i][j] < Depth or not subset < j}
+        Seen.setdefault(Size,{})[subset] = Depth
+        Queue.append((state,subset,parent,char,Depth))
+        return state in leftFinals and subset.isdisjoint(rightFinals)
+    def witness(index):
+        Chars = []
+        while Queue[index][2] is not None:
+            Chars.append(Queue[index][3])
+            index = Queue[index][2]
+        return ''.join(reversed(Chars))
+    #pairs are checked as they are found, in breadth-first order.
+    for i in sorted(leftStarts):
+        if insert(i,rightStart,None,None):
+            return witness(len(Queue) - 1)
+    index = 0
+    while index < len(Queue):
+        State, Subset = Queue[index][0], Queue[index][1]
+        if Subset in Antichain[State][len(Subset)]:
+            Moves = left.get(State,{})
+            for j in sorted(Moves):
+                Next = set()
+                for k in Subset:
+                    Next.update(right.get(k,{}).get(j,()))
+                Next = frozenset(Next)
+                for k in sorted(Moves[j]):
+                    if insert(k,Next,index,chars[j]):
+                        return witness(len(Queue) - 1)
+        index = index + 1
+    return None
+
+def _canonicalComponents(states,alphabet,deltas,finals):
+    """
+    Builds the canonical member data of a DFA, which is the same for any two 
+    equivalent minimal DFAs.  States that are unreachable or cannot reach a 
+    final state (the NULL state among them) are dropped, with their 
+    transitions; 'q_0' is always kept, but without its transitions if it 
+    cannot reach a final state.  Symbols that label the same transitions are merged into 
+    one, unused symbols are dropped, and the symbols are sorted by their 
+    lowest character.  The states are then renamed 'q_0', 'q_1', ... in 
+    breadth-first order from 'q_0', following the symbols in order.  Runs 
+    in O(states + transitions).
+
+    Parameters
+    ----------
+    states : List
+        The states of the DFA.
+    alphabet : List
+        The Alphabet of the DFA.
+    deltas : List (2D)
+        The Delta-transitions of the DFA.
+    finals : List
+        The final states of the DFA.
+
+    Returns
+    -------
+    tuple
+        The States, Alphabet, Deltas and Finals of the canonical DFA.
+
+    """
+    Backward = {}
+    for i in deltas:
+        Backward.setdefault(i[2],[]).append(i[0])
+    Final = set(finals)
+    Useful = set(i for i in Final if i != '\u2205')
+    Stack = list(Useful)
+    while Stack:
+        for j in Backward.get(Stack.pop(),[]):
+            if j not in Useful:
+                Useful.add(j)
+                Stack.append(j)
+    Edges = {}
+    for i in deltas:
+        if i[0] in Useful and i[2] in Useful:
+            Edges.setdefault(i[1],[]).append((i[0],i[2]))
+    Groups = {}
+    for i in Edges:
+        Groups.setdefault(frozenset(Edges[i]),[]).extend(_symbolRanges(i))
+    Symbols = sorted((_mergeRanges(Groups[i]),i) for i in Groups)
+    Alphabet = [_rangesLabel(i[0]) for i in Symbols]
+    Out = {}
+    for j in range(len(Symbols)):
+        for i in Symbols[j][1]:
+            Out.setdefault(i[0],[]).append((j,i[1]))
+    Rename = {'q_0':'q_0'}
+    Order = ['q_0']
+    Deltas = []
+    index = 0
+    #each state's transitions are listed in symbol order already.
+    while index < len(Order):
+        Name = Rename[Order[index]]
+        for j in Out.get(Order[index],()):
+            if j[1] not in Rename:
+                Rename[j[1]] = 'q_' + str(len(Rename))
+                Order.append(j[1])
+            Deltas.append([Name,Alphabet[j[0]],Rename[j[1]]])
+        index = index + 1
+    Finals = [Rename[i] for i in Order if i in Final]
+    return [Rename[i] for i in Order], Alphabet, Deltas, Finals
+
+def _reversedComponents(states,alphabet,deltas,finals,loop=False):
+    """
+    Builds the member data of an NFA for the reverse of an automaton's 
+    language: every Delta-transition is turned around, and a new start state 
+    'q_0' has lambda transitions to the old final states.  The old states are 
+    renamed 'q_1', 'q_2', ... in order, and the old 'q_0' is the only final 
+    state.  NULL state transitions are dropped.
+
+    Parameters
+    ----------
+    states : List
+        The states of the automaton.
+    alphabet : List
+        The Alphabet of the automaton.
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    finals : List
+        The final states of the automaton.
+    loop : bool, optional
+        If True, the new start state also loops on every character, so the 
+        NFA accepts every string with a suffix in the reversed language.  The 
+        default is False.
+
+    Returns
+    -------
+    tuple
+        The States, Alphabet, Deltas and Finals of the reversed NFA.
+
+    """
+    Rename = {}
+    for i in states:
+        if i != '\u2205':
+            Rename[i] = 'q_' + str(len(Rename) + 1)
+    Deltas = [['q_0','\u03BB',Rename[i]] for i in finals if i in Rename]
+    if loop:
+        Deltas.append(['q_0',_rangesLabel([(0,MAX_CODE_POINT)]),'q_0'])
+    Reversed = [[Rename[i[2]],i[1],Rename[i[0]]] for i in deltas if i[0] in Rename and i[2] in Rename]
+    Order = {}
+    for i in Rename.values():
+        Order[i] = len(Order)
+    Reversed.sort(key=lambda i: Order[i[0]])
+    Deltas.extend(Reversed)
+    Alphabet = sorted(set([i[1] for i in Deltas] + [i for i in alphabet if i != '\u2205']))
+    return ['q_0'] + list(Rename.values()), Alphabet, Deltas, [Rename['q_0']]
+
+def _wordAutomaton(words):
+    """
+    Builds the minimal acyclic DFA accepting exactly the given words, by the 
+    incremental algorithm of Daciuk, Mihov, Watson and Watson for sorted 
+    input.  The words are added one at a time.  When a word is added, the 
+    states of the previous word beyond the common prefix can no longer 
+    change, so they are minimized at once: each is replaced by an equivalent 
+    state from the register (keyed by finality and transitions) if there is 
+    one, or else added to it.  Replaced states are reused, so memory stays 
+    proportional to the minimal automaton plus the longest word.
+
+    Parameters
+    ----------
+    words : iterable
+        The words, in sorted order (duplicates are ignored).
+
+    Returns
+    -------
+    tuple
+        The States, Alphabet, Deltas and Finals of the DFA, with states named 
+        in breadth-first order from 'q_0'.
+
+    Raises
+    ------
+    ValueError
+        If the words are not sorted.
+
+    """
+    Edges = [{}]
+    Final = [False]
+    Free = []
+    Register = {}
+    Path = [0]
+    Previous = ''
+    
+    def register(depth):
+        #minimize the states of the previous word deeper than depth.
+        while len(Path) > depth + 1:
+            Child = Path.pop()
+            Key = (Final[Child],tuple(sorted(Edges[Child].items())))
+            Same = Register.setdefault(Key,Child)
+            if Same != Child:
+                Edges[Path[-1]][Previous[len(Path)-1]] = Same
+                Edges[Child] = None
+                Free.append(Child)
+    
+    for Word in words:
+        if Word < Previous:
+            raise ValueError('words must be sorted: %r after %r' % (Word,Previous))
+        Common = 0
+        Limit = min(len(Word),len(Previous))
+        while Common < Limit and Word[Common] == Previous[Common]:
+            Common = Common + 1
+        register(Common)
+        for c in Word[Common:]:
+            if Free:
+                State = Free.pop()
+                Edges[State] = {}
+                Final[State] = False
+            else:
+                State = len(Edges)
+                Edges.append({})
+                Final.append(False)
+            Edges[Path[-1]][c] = State
+            Path.append(State)
+        Final[Path[-1]] = True
+        Previous = Word
+    register(0)
+    Names = {0:'q_0'}
+    Queue = [0]
+    index = 0
+    Deltas = []
+    Chars = set()
+    while index < len(Queue):
+        State = Queue[index]
+        index = index + 1
+        for c in sorted(Edges[State]):
+            Next = Edges[State][c]
+            if Next not in Names:
+                Names[Next] = 'q_' + str(len(Names))
+                Queue.append(Next)
+            Deltas.append([Names[State],c,Names[Next]])
+            Chars.add(c)
+    Labels = {}
+    for c in Chars:
+        Labels[c] = _rangesLabel([(ord(c),ord(c))])
+    for i in Deltas:
+        i[1] = Labels[i[1]]
+    return [Names[i] for i in Queue], [Labels[c] for c in sorted(Chars)], Deltas, [Names[i] for i in Queue if Final[i]]
+
+def _dotID(name):
+    """
+    Quotes a state name or edge label for the DOT language.
+
+    Parameters
+    ----------
+    name : str
+        The state name or edge label.
+
+    Returns
+    -------
+    str
+        The double-quoted DOT string.
+
+    """
+    return '"' + name.replace('\\','\\\\').replace('"','\\"') + '"'
+
+def _dotText(text):
+    """
+    Undoes the backslash escaping of _dotID() in a state name or edge label 
+    read from a DOT file.  The Graphviz parser only unescapes '\\"', and leaves 
+    an escaped backslash doubled (Graphviz itself shows it as one backslash).
+
+    Parameters
+    ----------
+    text : str
+        The state name or edge label, as read.
+
+    Returns
+    -------
+    str
+        The state name or edge label.
+
+    """
+    return text.replace('\\\\','\\')
+
+def _writeDot(file,name,states,deltas,finals,start='q_0'):
+    """
+    Writes an automaton in the DOT language.  The symbols of parallel 
+    Delta-transitions are grouped into one comma-separated edge label (see 
+    _splitLabel()), and the start state is marked by an edge from 'q_i'.
+
+    Parameters
+    ----------
+    file : str or file object
+        The .gv file name (with path), or an open text file object.
+    name : str
+        The name of the graph.
+    states : List
+        The states of the automaton.
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    finals : List
+        The final states of the automaton.
+    start : str, optional
+        The start state.  The default is 'q_0'.
+
+    Returns
+    -------
+    None.
+
+    """
+    if isinstance(file,str):
+        with open(file,'w',encoding='utf-8') as f:
+            _writeDot(f,name,states,deltas,finals,start)
+        return
+    Groups = {}
+    for i in deltas:
+        Groups.setdefault((i[0],i[2]),[]).append(i[1])
+    Finals = set(finals)
+    file.write('digraph ' + name + ' {\n\trankdir=LR;\n')
+    file.write('\tnode [shape=point]; q_i\n')
+    file.write('\tnode [shape=doublecircle];\n')
+    for i in finals:
+        file.write('\t' + _dotID(i) + '\n')
+    file.write('\tnode [shape=circle];\n')
+    for i in states:
+        if i not in Finals:
+            file.write('\t' + _dotID(i) + '\n')
+    if start in states:
+        file.write('\tq_i -> ' + _dotID(start) + '\n')
+    for i in Groups:
+        file.write('\t' + _dotID(i[0]) + ' -> ' + _dotID(i[1]) + ' [label=' + _dotID(','.join(Groups[i])) + '];\n')
+    file.write('}\n')
+
+def _collapseComponents(states,deltas,finals,start):
+    """
+    Collapses every strongly-connected component of more than one state into 
+    a single summary state (Tarjan's algorithm, iterative).
+
+    Parameters
+    ----------
+    states : List
+        The states of the automaton.
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    finals : List
+        The final states of the automaton.
+    start : str
+        The start state.
+
+    Returns
+    -------
+    tuple
+        The (states, deltas, finals, start) of the collapsed graph.
+    dict
+        The summary state (or the state itself) of each state.
+
+    """
+    Edges = {}
+    for i in deltas:
+        Edges.setdefault(i[0],[]).append(i[2])
+    Index = {}
+    Low = {}
+    Stack = []
+    OnStack = set()
+    Component = {}
+    Members = []
+    for Root in states:
+        if Root in Index:
+            continue
+        Work = [(Root,0)]
+        while Work:
+            Node, Next = Work.pop()
+            if Next == 0:
+                Index[Node] = Low[Node] = len(Index)
+                Stack.append(Node)
+                OnStack.add(Node)
+            Out = Edges.get(Node,[])
+            while Next < len(Out):
+                Succ = Out[Next]
+                Next = Next + 1
+                if Succ not in Index:
+                    Work.append((Node,Next))
+                    Work.append((Succ,0))
+                    break
+                elif Succ in OnStack:
+                    Low[Node] = min(Low[Node],Index[Succ])
+            else:
+                if Low[Node] == Index[Node]:
+                    Group = []
+                    while True:
+                        Member = Stack.pop()
+                        OnStack.discard(Member)
+                        Group.append(Member)
+                        if Member == Node:
+                            break
+                    Members.append(Group)
+                if Work:
+                    Low[Work[-1][0]] = min(Low[Work[-1][0]],Low[Node])
+    Position = {}
+    for i in range(len(states)):
+        Position[states[i]] = i
+    for Group in Members:
+        if len(Group) == 1:
+            Name = Group[0]
+        else:
+            Group.sort(key=Position.get)
+            Name = '{' + ','.join(Group[:3]) + (',...' if len(Group) > 3 else '') + '} (' + str(len(Group)) + ' states)'
+        for i in Group:
+            Component[i] = Name
+    NewStates = []
+    for i in states:
+        if Component[i] not in NewStates:
+            NewStates.append(Component[i])
+    NewDeltas = []
+    Seen = set()
+    for i in deltas:
+        Entry = (Component[i[0]],i[1],Component[i[2]])
+        if Entry not in Seen:
+            Seen.add(Entry)
+            NewDeltas.append(list(Entry))
+    NewFinals = []
+    for i in finals:
+        if Component[i] not in NewFinals:
+            NewFinals.append(Component[i])
+    return (NewStates, NewDeltas, NewFinals, Component.get(start,start)), Component
+
+def _subgraph(states,deltas,finals,start,keep):
+    """
+    Restricts an automaton to the given states.
+
+    Parameters
+    ----------
+    states : List
+        The states of the automaton.
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    finals : List
+        The final states of the automaton.
+    start : str
+        The start state.
+    keep : set
+        The states to keep.
+
+    Returns
+    -------
+    tuple
+        The (states, deltas, finals, start) of the induced subgraph.
+
+    """
+    return ([i for i in states if i in keep],
+            [i for i in deltas if i[0] in keep and i[2] in keep],
+            [i for i in finals if i in keep],
+            start)
+
+def _nearbyStates(deltas,focus,hops):
+    """
+    Returns the states at most the given number of edges away from the focus 
+    states, following edges in either direction.
+
+    Parameters
+    ----------
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    focus : List
+        The states to centre on.
+    hops : int
+        The number of edges to follow.
+
+    Returns
+    -------
+    Seen : set
+        The states within reach.
+
+    """
+    Edges = {}
+    for i in deltas:
+        Edges.setdefault(i[0],[]).append(i[2])
+        Edges.setdefault(i[2],[]).append(i[0])
+    Seen = set(focus)
+    Frontier = list(focus)
+    for Hop in range(hops):
+        Next = []
+        for i in Frontier:
+            for j in Edges.get(i,()):
+                if j not in Seen:
+                    Seen.add(j)
+                    Next.append(j)
+        Frontier = Next
+    return Seen
+
+def _firstStates(deltas,starts,limit):
+    """
+    Samples a connected part of an automaton: the first states found by a 
+    breadth-first search from the given states.
+
+    Parameters
+    ----------
+    deltas : List (2D)
+        The Delta-transitions of the automaton.
+    starts : List
+        The states to search from.
+    limit : int
+        The number of states to keep.
+
+    Returns
+    -------
+    set
+        The sampled states.
+
+    """
+    Edges = {}
+    for i in deltas:
+        Edges.setdefault(i[0],[]).append(i[2])
+    Queue = list(starts[:limit])
+    Seen = set(Queue)
+    index = 0
+    while index < len(Queue) and len(Queue) < limit:
+        for i in Edges.get(Queue[index],()):
+            if i not in Seen and len(Queue) < limit:
+                Seen.add(i)
+                Queue.append(i)
+        index = index + 1
+    return Seen
+
+def _sharedLayout(rows,columns,spans):
+    """
+    Returns where each array of a SharedDFA lies in its shared memory block 
+    (see SharedDFA).  Every array starts on an 8-byte boundary.
+
+    Parameters
+    ----------
+    rows : int
+        The number of table rows (states, plus the dead state).
+    columns : int
+        The number of table columns (symbols, plus one for other characters).
+    spans : int
+        The number of character ranges.
+
+    Returns
+    -------
+    dict
+        The (offset, dtype, shape) of each array, and the total 'Size'.
+
+    """
+    Layout = {}
+    Offset = 0
+    for Name, Type, Shape in [('Header',np.int64,(len(_SHARED_HEADER),)),
+                              ('Table',np.int32,(rows,columns)),
+                              ('Finals',np.uint8,((rows + 7) // 8,)),
+                              ('Starts',np.int64,(spans,)),
+                              ('Ends',np.int64,(spans,)),
+                              ('Symbols',np.int64,(spans,))]:
+        Layout[Name] = (Offset,Type,Shape)
+        Size = int(np.prod(Shape)) * np.dtype(Type).itemsize
+        Offset = Offset + (Size + 7) // 8 * 8
+    Layout['Size'] = max(Offset,8)
+    return Layout
+
+def _trackerID():
+    """
+    Identifies this process's resource tracker by the inode of the pipe to 
+    it.  Processes started through multiprocessing share the tracker (and 
+    the pipe) of the process that started them.
+
+    Returns
+    -------
+    int
+        The inode, or 0 if there is no resource tracker.
+
+    """
+    if os.name != 'posix':
+        return 0
+    Tracker = multiprocessing.resource_tracker._resource_tracker
+    Tracker.ensure_running()
+    try:
+        return os.fstat(Tracker._fd).st_ino
+    except (OSError,TypeError):
+        return 0
+
+def _sharedOpen(name):
+    """
+    Attaches to an existing shared memory block, leaving it registered only 
+    with the creating process's resource tracker.  Before Python 3.13, 
+    attaching registers the block with this process's tracker, and a 
+    process with its own tracker (one not started by the creating process) 
+    would then destroy the block when it exits; such a process unregisters 
+    the block again.  The creating process stores its tracker in the block 
+    header (see _trackerID()).
+
+    Parameters
+    ----------
+    name : str
+        The name of the shared memory block.
+
+    Returns
+    -------
+    multiprocessing.shared_memory.SharedMemory
+        The attached block.
+
+    """
+    if sys.version_info >= (3,13):
+        return multiprocessing.shared_memory.SharedMemory(name=name,track=False)
+    Memory = multiprocessing.shared_memory.SharedMemory(name=name)
+    Field = 8*_SHARED_HEADER.index('Tracker')
+    if os.name == 'posix' and Memory.size >= 8*len(_SHARED_HEADER):
+        Owner = int.from_bytes(Memory.buf[Field:Field+8],sys.byteorder,signed=True)
+        if Owner != _trackerID():
+            multiprocessing.resource_tracker.unregister(Memory._name,'shared_memory')
+    return Memory
+
+def _sharedAttach(name):
+    """
+    Pool initializer for SharedDFA.acceptsMany(): attaches the worker process 
+    to the shared table.
+
+    Parameters
+    ----------
+    name : str
+        The name of the shared memory block.
+
+    Returns
+    -------
+    None.
+
+    """
+    global _SHARED
+    _SHARED = SharedDFA(_sharedOpen(name))
+
+def _sharedAcceptsMany(strings):
+    """
+    Pool task for SharedDFA.acceptsMany(): matches one chunk of strings 
+    against the table attached by _sharedAttach().
+
+    Parameters
+    ----------
+    strings : List
+        The input strings.
+
+    Returns
+    -------
+    List
+        True for each accepted string.  False otherwise.
+
+    """
+    return _SHARED.acceptsMany(strings)
+
+def _sharedScan(task):
+    """
+    Pool task for SharedDFA.scan(): runs speculate() on a chunk when no start 
+    state is given, and follow() otherwise.
+
+    Parameters
+    ----------
+    task : tuple
+        The chunk source, the start state number (or None) and the limit.
+
+    Returns
+    -------
+    tuple
+        The result of speculate() or follow().
+
+    """
+    if task[1] is None:
+        return _SHARED.speculate(task[0])
+    return _SHARED.follow(task[0],task[1],task[2])
+
+_COMPILED_MATCHER = '''
+def _miss(state,char):
+    if state is DEAD:
+        return None
+    code = ord(char)
+    i = bisect.bisect_right(STARTS,code) - 1
+    succ = DEAD
+    if i >= 0 and code <= ENDS[i]:
+        target = ROWS[state[0]].get(COLUMNS[i])
+        if target is not None:
+            succ = S[target]
+    if len(state) < %d:
+        state[char] = succ
+    return None if succ is DEAD else succ
+
+def accepts(string):
+    state = S[%d]
+    chars = iter(string)
+    while True:
+        try:
+            for char in chars:
+                state = state[char]
+            return 1 in state
+        except KeyError:
+            state = _miss(state,char)
+            if state is None:
+                return False
+'''
+
+def _compiledSource(states,alphabet,deltas,finals):
+    """
+    Generates the Python source of a matcher for a DFA (see DFA.compile()).  
+    Each state becomes a dict from characters to successor dicts, so reading 
+    a character is a single dict subscript.  The state number is kept under 
+    the key 0 and final states have the key 1.  Characters of symbols larger 
+    than COMPILE_EXPAND are added on first use by a binary search over the 
+    symbol ranges; characters that lead nowhere go to the empty DEAD dict.
+
+    Parameters
+    ----------
+    states : List
+        The states of the DFA.
+    alphabet : List
+        The Alphabet of the DFA.
+    deltas : List (2D)
+        The Delta-transitions of the DFA.
+    finals : List
+        The final states of the DFA.
+
+    Returns
+    -------
+    str
+        The source, defining accepts(string).
+
+    """
+    Number = {}
+    for i in range(len(states)):
+        Number[states[i]] = i
+    Column = {}
+    Expanded = {}
+    Spans = []
+    for j in range(len(alphabet)):
+        Column[alphabet[j]] = j
+        Ranges = _symbolRanges(alphabet[j])
+        if sum(k[1] - k[0] + 1 for k in Ranges) <= COMPILE_EXPAND:
+            Expanded[j] = [chr(c) for k in Ranges for c in range(k[0],k[1]+1)]
+        for k in Ranges:
+            Spans.append((k[0],k[1],j))
+    Spans.sort()
+    Rows = [{} for i in states]
+    for i in deltas:
+        if i[0] != '\u2205' and i[2] != '\u2205':
+            Rows[Number[i[0]]][Column[i[1]]] = Number[i[2]]
+    Lines = ['import bisect','DEAD = {0: -1}']
+    Lines.append('S = [{0: i} for i in range(%d)]' % len(states))
+    for i in finals:
+        Lines.append('S[%d][1] = True' % Number[i])
+    Largest = 0
+    for i in range(len(states)):
+        Items = []
+        for j in sorted(Rows[i]):
+            for c in Expanded.get(j,()):
+                Items.append('%r: S[%d]' % (c,Rows[i][j]))
+        if Items:
+            Lines.append('S[%d].update({%s})' % (i,', '.join(Items)))
+        Largest = max(Largest,len(Items))
+    Lines.append('STARTS = %r' % (tuple(i[0] for i in Spans),))
+    Lines.append('ENDS = %r' % (tuple(i[1] for i in Spans),))
+    Lines.append('COLUMNS = %r' % (tuple(i[2] for i in Spans),))
+    Lines.append('ROWS = %r' % (tuple(Rows),))
+    #at most 4096 characters are added to a state on first use.
+    return '\n'.join(Lines) + '\n' + _COMPILED_MATCHER % (Largest+4098,Number['q_0'])
+
+def _canView():
+    """
+    Declares if a PDF viewer can be opened; i.e. not on a headless server.
+
+    Returns
+    -------
+    bool
+        True on Windows and macOS, or if a display is available.  False 
+        otherwise.
+
+    """
+    if sys.platform in ['win32','darwin']:
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def _writeView(file,name,states,deltas,finals,collapse,focus,hops,limit):
+    """
+    Writes a cut down view of an automaton in the DOT language.  See 
+    NFA.writeDot() for the parameters.
+
+    Returns
+    -------
+    None.
+
+    """
+    Start = 'q_0'
+    #the limit keeps the states nearest the focus, or else 'q_0'.
+    Roots = [Start]
+    if focus:
+        Keep = _nearbyStates(deltas,focus,hops)
+        states, deltas, finals, Start = _subgraph(states,deltas,finals,Start,Keep)
+        Roots = [i for i in focus if i in Keep]
+    if collapse:
+        (states, deltas, finals, Start), Names = _collapseComponents(states,deltas,finals,Start)
+        Roots = list(dict.fromkeys(Names[i] for i in Roots if i in Names))
+    if limit and len(states) > limit:
+        Keep = _firstStates(deltas,Roots,limit)
+        states, deltas, finals, Start = _subgraph(states,deltas,finals,Start,Keep)
+    _writeDot(file,name,states,deltas,finals,Start)
+
+def _render(name,view,background):
+    """
+    Renders a .gv file as PDF and (optionally) opens it for viewing.
+
+    Parameters
+    ----------
+    name : str
+        The .gv file name (with path).
+    view : bool
+        If True, the PDF is opened when a display is available.
+    background : bool
+        If True, the PDF is rendered by a separate process and is not opened.
+
+    Returns
+    -------
+    multiprocessing.Process or None
+        The rendering process when rendering in the background.
+
+    """
+    if background:
+        Render = multiprocessing.Process(target=gv.render,args=('dot','pdf',name))
+        Render.start()
+        return Render
+    gv.render('dot','pdf',name)
+    if view and _canView():
+        gv.view(name + '.pdf')
+    return None
 
 class NFA:
     """Class representing an NFA."""    
-    __NFA = ()
-    __States = []
-    __Alphabet = []
-    __Deltas = []
-    __Finals = []
+    __slots__ = ('__NFA','__States','__Alphabet','__Deltas','__Finals','__Simulator')
     
     def __init__(self, file):
         """
@@ -49,25 +1332,139 @@ class NFA:
         None.
 
         """
-        self.__NFA = nx.DiGraph(nx.drawing.nx_agraph.read_dot(file))
+        with _READ_LOCK:
+            self.__NFA = nx.DiGraph(nx.drawing.nx_agraph.read_dot(file))
+        Names = {i:_dotText(i) for i in self.__NFA if '\\' in i}
+        if Names:
+            nx.relabel_nodes(self.__NFA,Names,copy=False)
+        for i in self.__NFA.edges(data=True):
+            if '\\' in i[2].get('label',''):
+                i[2]['label'] = _dotText(i[2]['label'])
+        self.__States = []
+        self.__Alphabet = []
+        self.__Deltas = []
+        self.__Finals = []
+        self.__Simulator = None
         self.__populateStates()
         self.__populateFinalStates()
         self.__populateDeltas()
         self.__populateAlphabet()
         
-    def __del__(self):
+    def accepts(self,string):
         """
-        Destructor for the DFA.  Clears private member lists.
+        Declares if the NFA accepts the given string, by simulating the NFA 
+        directly (see NFASimulator).
+
+        Parameters
+        ----------
+        string : str
+            The input string.
 
         Returns
         -------
-        None.
+        bool
+            True if some path on the string ends in a final state.  False 
+            otherwise.
 
         """
-        self.__Alphabet.clear()
-        self.__States.clear()
-        self.__Deltas.clear()
-        self.__Finals.clear()
+        return self.simulator().acceptsMany([string])[0]
+    
+    def acceptsMany(self,strings):
+        """
+        Declares, for each given string, if the NFA accepts it.  The strings are 
+        simulated in lock-step (see NFASimulator).
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+
+        Returns
+        -------
+        List
+            True for each accepted string.  False otherwise.
+
+        """
+        return self.simulator().acceptsMany(strings)
+    
+    def findCounterexample(self,other=None):
+        """
+        Finds a shortest string that shows this NFA's language is not included 
+        in other's (a string this NFA accepts and other rejects), or, without 
+        other, that this NFA is not universal (a string it rejects).  Neither 
+        NFA is determinized: the subsets of other's states are explored 
+        alongside this NFA's states, keeping only the minimal ones (see 
+        _antichainSearch()).  Universality is over all characters.
+
+        Parameters
+        ----------
+        other : NFA, optional
+            The NFA (or DFA) whose language should include this one's.  The 
+            default is None (check universality).
+
+        Returns
+        -------
+        str
+            The counterexample, or None if there is none.
+
+        """
+        Symbols = [i for i in self.__Alphabet if i != '\u03BB']
+        if other is not None:
+            Symbols = Symbols + [i for i in set(other.getAlphabet()) - set(Symbols) if i != '\u03BB']
+        Minterms, Covers = _minterms(Symbols)
+        Index = {}
+        for i in range(len(Minterms)):
+            Index[Minterms[i]] = i
+        Chars = [chr(_symbolRanges(i)[0][0]) for i in Minterms]
+        Moves, Start = _subsetMoves(self.__Deltas,Covers,Index)
+        if other is not None:
+            Others, OtherStart = _subsetMoves(other.getDeltas(),Covers,Index)
+            return _antichainSearch(Moves,Start,set(self.__Finals),Others,OtherStart,set(other.getFinalStates()),Chars)
+        #the universal automaton also reads the characters in no symbol.
+        Next = 0
+        for i in _mergeRanges([j for i in Minterms for j in _symbolRanges(i)]):
+            if i[0] > Next:
+                break
+            Next = i[1] + 1
+        if Next <= MAX_CODE_POINT:
+            Chars.append(chr(Next))
+        Universal = {0:{}}
+        for i in range(len(Chars)):
+            Universal[0][i] = {0}
+        return _antichainSearch(Universal,[0],{0},Moves,Start,set(self.__Finals),Chars)
+    
+    @staticmethod
+    def fromComponents(states,alphabet,deltas,finals):
+        """
+        Constructs an NFA directly from its member data, instead of a .gv file.  
+        The start state must be 'q_0'.  Called on the class, as 
+        NFA.fromComponents(...).
+
+        Parameters
+        ----------
+        states : List
+            The states.
+        alphabet : List
+            The Alphabet (lambda included, if used).
+        deltas : List (2D)
+            The Delta-transitions, as [state, symbol, state] rows.
+        finals : List
+            The final states.
+
+        Returns
+        -------
+        NFA
+            A new NFA class instantiation.
+
+        """
+        N = NFA.__new__(NFA)
+        N.__NFA = None
+        N.__States = list(states)
+        N.__Alphabet = list(alphabet)
+        N.__Deltas = [list(i) for i in deltas]
+        N.__Finals = list(finals)
+        N.__Simulator = None
+        return N
         
     def getAlphabet(self):
         """
@@ -91,7 +1488,7 @@ class NFA:
             Copy of the Deltas list.
 
         """
-        return self.__Deltas.copy()
+        return [i.copy() for i in self.__Deltas]
     
     def getEdgeLabel(self,stateA,stateB):
         """
@@ -140,6 +1537,25 @@ class NFA:
         """
         return self.__States.copy()
     
+    def includedIn(self,other):
+        """
+        Declares if every string this NFA accepts is accepted by other, without 
+        determinizing either (see findCounterexample()).
+
+        Parameters
+        ----------
+        other : NFA
+            The NFA (or DFA) to compare with.
+
+        Returns
+        -------
+        bool
+            True if this NFA's language is included in other's.  False 
+            otherwise.
+
+        """
+        return self.findCounterexample(other) is None
+    
     def isFinalState(self,state):
         """
         Declares if given state is a final state (true or false).
@@ -160,59 +1576,219 @@ class NFA:
                 return True
         return False
 
-    def saveAndView(self,name='./myNFA.gv'):
+    def isUniversal(self):
+        """
+        Declares if this NFA accepts every string, without determinizing it 
+        (see findCounterexample()).
+
+        Returns
+        -------
+        bool
+            True if every string is accepted.  False otherwise.
+
+        """
+        return self.findCounterexample() is None
+    
+    def memoryReport(self):
+        """
+        Reports the approximate memory held by this NFA, for sizing.  Each 
+        object is counted once, in the first group that holds it: state names 
+        go to 'states', so 'transitions' counts only the Delta-transition 
+        tuples and the Alphabet.  The 'indexes' are the graph read from the 
+        DOT file, and the 'caches' the simulator (if built; see simulator()).
+
+        Returns
+        -------
+        dict
+            The size in bytes of the 'states', 'transitions', 'indexes' and 
+            'caches', and their 'total'.
+
+        """
+        Seen = set()
+        Report = {'states':_deepSize([self.__States,self.__Finals],Seen),
+                  'transitions':_deepSize([self.__Deltas,self.__Alphabet],Seen),
+                  'indexes':_deepSize([self.__NFA],Seen),
+                  'caches':_deepSize([self.__Simulator],Seen)}
+        Report['total'] = sum(Report.values())
+        return Report
+    
+    def reduce(self):
+        """
+        Reduces the number of states without changing the language, so that 
+        later conversions (see toDFA()) have less to do.  Useless states 
+        (unreachable, or with no path to a final state) are removed; then 
+        forward and backward bisimilar states are merged in turn until neither 
+        merges anything (see __bisimulation()).  The result is usually, but not 
+        always, the smallest NFA for the language.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__trim()
+        #a pass that merges nothing leaves the other direction stable too.
+        Backward = False
+        Stable = 0
+        while Stable < 2:
+            Count = len(self.__States)
+            self.__quotient(self.__bisimulation(Backward))
+            Stable = Stable + 1 if len(self.__States) == Count else 1
+            Backward = not Backward
+        self.__Simulator = None
+        
+    def removeLambdas(self):
+        """
+        Replaces the lambda transitions with equivalent symbol transitions.  The 
+        lambda closure of every state is computed once; each state then gets 
+        every symbol transition leaving its closure, and is final if its 
+        closure holds a final state.  States that were only reachable through 
+        lambda transitions are removed.  Runs in O(states x closure size + 
+        transitions).
+
+        Returns
+        -------
+        None.
+
+        """
+        Lambdas = {}
+        Moves = {}
+        for i in self.__Deltas:
+            if i[1] == '\u03BB':
+                Lambdas.setdefault(i[0],[]).append(i[2])
+            else:
+                Moves.setdefault(i[0],[]).append(i)
+        Finals = set(self.__Finals)
+        NewFinals = []
+        Deltas = {}
+        for i in self.__States:
+            Closure = [i]
+            Seen = {i}
+            index = 0
+            while index < len(Closure):
+                for j in Lambdas.get(Closure[index],()):
+                    if j not in Seen:
+                        Seen.add(j)
+                        Closure.append(j)
+                index = index + 1
+            if not Finals.isdisjoint(Seen):
+                NewFinals.append(i)
+            for j in Closure:
+                for k in Moves.get(j,()):
+                    Deltas.setdefault((i,k[1],k[2]),None)
+        self.__Deltas = [list(i) for i in Deltas]
+        self.__Finals = NewFinals
+        self.__Alphabet = [i for i in self.__Alphabet if i != '\u03BB']
+        self.__trim()
+        self.__Simulator = None
+        
+    def reverse(self):
+        """
+        Constructs an NFA for the reverse of this NFA's language (every string 
+        spelled backwards); see _reversedComponents().
+
+        Returns
+        -------
+        NFA
+            A new NFA class instantiation.
+
+        """
+        return NFA.fromComponents(*_reversedComponents(self.__States,self.__Alphabet,self.__Deltas,self.__Finals))
+        
+    def saveAndView(self,name='./myNFA.gv',view=True,background=False,collapse=False,focus=None,hops=1,limit=RENDER_LIMIT):
         """
         Saves a copy of the constructed NFA and opens a PDF version for viewing.
+        Large automata can be cut down before rendering (see writeDot()); by 
+        default only the first RENDER_LIMIT states are drawn.
 
         Parameters
         ----------
         name : str, optional
             The name AND relative (or absolute) path for your saved NFA copy.
             The default is './myNFA.gv'.
+        view : bool, optional
+            If False, the PDF is rendered but not opened.  It is never opened 
+            without a display.  The default is True.
+        background : bool, optional
+            If True, the PDF is rendered by a separate process and is not 
+            opened.  The default is False.
+        collapse, focus, hops, limit : optional
+            See writeDot().
 
         Returns
         -------
-        None.
+        multiprocessing.Process or None
+            The rendering process when rendering in the background.
+
+        """
+        self.writeDot(name,collapse,focus,hops,limit)
+        return _render(name,view,background)
+        
+    def simulator(self):
+        """
+        Returns the bit-parallel simulator for this NFA, building it on first 
+        use.
+
+        Returns
+        -------
+        NFASimulator
+            The simulator.
 
         """
-        nx.drawing.nx_agraph.write_dot(self.__NFA,name)
-        gv.render('dot','pdf',name)
-        ViewName = name + '.pdf'
-        gv.view(ViewName)
+        if self.__Simulator is None:
+            self.__Simulator = NFASimulator(self.__Alphabet,self.__States,self.__Deltas,self.__Finals)
+        return self.__Simulator
         
-    def toDFA(self):
+    def toDFA(self,sparse=False):
         """
         Uses the data from this NFA to construct a new DFA class object.
 
+        Parameters
+        ----------
+        sparse : bool, optional
+            If True, transitions to the NULL state are left implicit instead of 
+            being added to the DFA.  The default is False.
+
         Returns
         -------
         D : DFA
             A new DFA class instantiation.
 
         """
-        #self.__reduce()
-        D = DFA(self)
+        D = DFA(self,sparse)
         return D
     
-    def __build(self):
+    def writeDot(self,file,collapse=False,focus=None,hops=1,limit=None):
         """
-        Constructs the Networkx NFA object using the wrapper class characteristics.
+        Writes the NFA in the DOT language.  Edge labels are grouped in a single 
+        pass and written out as they are produced, without building a Networkx 
+        graph.  Large automata can be cut down first, which is done in the 
+        order: focus, collapse, limit.
+
+        Parameters
+        ----------
+        file : str or file object
+            The name AND relative (or absolute) path of the .gv file to write, 
+            or an open text file object to write to.
+        collapse : bool, optional
+            If True, each strongly-connected component is written as one summary 
+            state.  The default is False.
+        focus : List, optional
+            If given, only the states within 'hops' edges of these states are 
+            written.  The default is None.
+        hops : int, optional
+            The neighbourhood size for focus.  The default is 1.
+        limit : int, optional
+            If there are more states than this, only the first 'limit' states 
+            reached from 'q_0' (or from the focus states) are written.  The 
+            default is None (no limit).
 
         Returns
         -------
         None.
 
         """
-        self.__NFA = nx.DiGraph(rankdir='LR')
-        for i in self.__Deltas:
-            self.__NFA.add_node(i[0],shape='circle')
-            self.__NFA.add_node(i[2],shape='circle')
-            Label = self.getEdgeLabel(i[0],i[2])
-            self.__NFA.add_edge(i[0],i[2],label=Label)
-        for j in self.__Finals:
-            nx.set_node_attributes(self.__NFA,{j:{'shape':'doublecircle'}})
-        self.__NFA.add_node('q_i',shape='point')
-        self.__NFA.add_edge('q_i','q_0')
+        _writeView(file,'nfa',self.__States,self.__Deltas,self.__Finals,collapse,focus,hops,limit)
     
     def __aggregateCSEdges(self):
         """
@@ -228,23 +1804,21 @@ class NFA:
         ListLen = len(self.__Deltas)
         while index < ListLen:
             Edge = self.__Deltas[index][1]
-            if len(Edge) > 1:
-                indey = 0
-                while indey < len(Edge):
+            Symbols = _splitLabel(Edge)
+            if Symbols != [Edge]:
+                for i in Symbols:
                     Entry = []
-                    if indey%2 == 0:
-                        Entry.append(self.__Deltas[index][0])
-                        Entry.append(Edge[indey])
-                        Entry.append(self.__Deltas[index][2])
-                        self.__Deltas.append(Entry.copy())
-                        Entry.clear()
-                    indey = indey + 1
+                    Entry.append(self.__Deltas[index][0])
+                    Entry.append(i)
+                    Entry.append(self.__Deltas[index][2])
+                    self.__Deltas.append(Entry.copy())
+                    Entry.clear()
             index = index + 1
         #Remove any copies that may have shown up.
         indez = 0
         while indez < len(self.__Deltas):
             Edge = self.__Deltas[indez][1]
-            if len(Edge) > 1:
+            if _splitLabel(Edge) != [Edge]:
                 self.__Deltas.remove(self.__Deltas[indez])
                 indez = indez - 1
             indez = indez + 1
@@ -256,63 +1830,6 @@ class NFA:
         self.__Deltas.clear()
         self.__Deltas = TempDelta.copy()
         
-    def __findMatchedPairFrom(self,state,symbol,rev=""):
-        """
-        Determines if two states are indistinguishable relative to the given state 
-        on the given symbol.
-
-        Parameters
-        ----------
-        state : str
-            The name of the state.
-        symbol : str
-            The symbol/edge on which to transition.
-
-        Returns
-        -------
-        List
-            Returns a pair of states that are considered indistinguishable.
-
-        """
-        Match = []
-        for i in self.__Deltas:
-            if (rev == "") and (state == i[0]) and (symbol == i[1]) and (state != i[2]):
-                Match.append(i[2])
-            elif (rev != "") and (state == i[2]) and (symbol == i[1]) and (state != i[0]):
-                Match.append(i[0])
-        if len(Match) == 2:
-            return Match
-        else:
-            return []
-        
-    def __mergeStates(self,keepState,mergeState):
-        """
-        Merges two states.
-
-        Parameters
-        ----------
-        keepState : str
-            The name of the state which will remain and inherit edges from mergeState.
-        mergeState : str
-            The name of the state which will disappear.
-
-        Returns
-        -------
-        None.
-
-        """
-        #Never phase out the q_0 state      
-        if mergeState == 'q_0':
-            return
-        i = 0
-        while i < len(self.__Deltas):
-            if self.__Deltas[i][0] == mergeState:
-                self.__Deltas[i][0] = keepState
-            if self.__Deltas[i][2] == mergeState:
-                self.__Deltas[i][2] = keepState
-            i = i + 1
-        self.__pruneDeltaCopies()
-        
     def __groupedSymbols(self,symSet):
         """
         Creates labels for combined symbol transitions.  On the form "a,b,c", etc.
@@ -351,14 +1868,9 @@ class NFA:
         Deltas = nx.get_edge_attributes(self.__NFA,'label')
         for i in Deltas:
             value = Deltas[i]
-            #if edge is made up of more than one character...
-            if len(value) > 1:
-                for j in range(len(value)):
-                    S = value[j]
-                    if j % 2 == 0:
-                        self.__Alphabet.append(S)
-            else:
-                self.__Alphabet.append(value)
+            #if edge is made up of more than one symbol...
+            for S in _splitLabel(value):
+                self.__Alphabet.append(S)
         #"Prune" and sort the Alphabet
         Pruned = set(self.__Alphabet)
         self.__Alphabet.clear()
@@ -423,107 +1935,142 @@ class NFA:
 
         """
         for i in nx.nodes(self.__NFA):
-            if i != 'qi':
+            if i != 'qi' and i != 'q_i':
                 self.__States.append(i)
         self.__States.sort()
         
-    def __pruneDeltaCopies(self):
+    def __bisimulation(self,backward=False):
         """
-        Removes duplicated Delta-transitions from Deltas member.
+        Computes the coarsest forward (or backward) bisimulation by partition 
+        refinement, treating lambda as an ordinary symbol.  Forward bisimilar 
+        states have the same finality and, on every symbol, successors in the 
+        same blocks; backward bisimilar states are both 'q_0' or both not, and 
+        have predecessors in the same blocks.  Either way, merging the states 
+        of a block does not change the language.
+
+        Parameters
+        ----------
+        backward : bool, optional
+            If True, compute the backward bisimulation.  The default is False.
 
         Returns
         -------
-        None.
+        List
+            The block id of each state, in States order.
 
         """
-        index = 0
-        while index < (len(self.__Deltas)-1):
-            indey = index + 1
-            First = self.__Deltas[index].copy()
-            while indey < len(self.__Deltas):
-                Second = self.__Deltas[indey].copy()
-                if (First[0]==Second[0]) and (First[1]==Second[1]) and (First[2]==Second[2]):
-                    self.__Deltas.remove(self.__Deltas[indey])
-                    indey = indey - 1
-                indey = indey + 1
-            index = index + 1
+        Number = {}
+        for i in range(len(self.__States)):
+            Number[self.__States[i]] = i
+        Edges = [[] for i in self.__States]
+        for i in self.__Deltas:
+            if backward:
+                Edges[Number[i[2]]].append((i[1],Number[i[0]]))
+            else:
+                Edges[Number[i[0]]].append((i[1],Number[i[2]]))
+        if backward:
+            Block = [1 if i == 'q_0' else 0 for i in self.__States]
+        else:
+            Finals = set(self.__Finals)
+            Block = [1 if i in Finals else 0 for i in self.__States]
+        Size = len(set(Block))
+        while True:
+            Signatures = {}
+            New = []
+            for i in range(len(self.__States)):
+                Key = (Block[i],frozenset((j[0],Block[j[1]]) for j in Edges[i]))
+                New.append(Signatures.setdefault(Key,len(Signatures)))
+            Block = New
+            if len(Signatures) == Size:
+                return Block
+            Size = len(Signatures)
             
-    def __pruneStates(self):
+    def __quotient(self,blocks):
         """
-        Removes states from States list if they are no longer found in the Deltas 
-        member list.
+        Merges the states that share a block id into one state, named after the 
+        block's first state in the States list ('q_0' for the start block).  
+        The merged state is final if any of its states is.
+
+        Parameters
+        ----------
+        blocks : List
+            The block id of each state, in States order.
 
         Returns
         -------
         None.
 
         """
-        index = 0
-        while index < len(self.__States):
-            Defunct = True
-            for j in self.__Deltas:
-                if (self.__States[index] == j[0]) or (self.__States[index] == j[2]):
-                    Defunct = False
-            if Defunct:
-                self.__States.remove(self.__States[index])
-                index = index - 1
-            index = index + 1
+        Keep = {}
+        for i in range(len(self.__States)):
+            if self.__States[i] == 'q_0':
+                Keep[blocks[i]] = 'q_0'
+            Keep.setdefault(blocks[i],self.__States[i])
+        Rename = {}
+        for i in range(len(self.__States)):
+            Rename[self.__States[i]] = Keep[blocks[i]]
+        Finals = set(Rename[i] for i in self.__Finals)
+        Deltas = {}
+        for i in self.__Deltas:
+            Deltas.setdefault((Rename[i[0]],i[1],Rename[i[2]]),None)
+        self.__States = [i for i in self.__States if Rename[i] == i]
+        self.__Finals = [i for i in self.__States if i in Finals]
+        self.__Deltas = [list(i) for i in Deltas]
+        self.__sortDeltas()
         
-    def __reduce(self):
+    def __sortDeltas(self):
         """
-        Reduces the NFA to the extent possible.
+        Orders the Deltas member by starting state, in States order.
 
         Returns
         -------
         None.
 
         """
-        #Merge identical successors
-        for i in self.__States:
-            for j in self.__Alphabet:
-                Match = self.__findMatchedPairFrom(i,j)
-                if Match and self.isFinalState(Match[0]):
-                    self.__mergeStates(Match[0],Match[1])
-                elif Match and self.isFinalState(Match[1]):
-                    self.__mergeStates(Match[1],Match[0]) 
-                elif Match and not self.isFinalState(Match[0]) and not self.isFinalState(Match[1]):
-                    self.__mergeStates(Match[0],Match[1])
-        #Merge identical predecessors
-        for k in self.__Finals:
-            for l in self.__Alphabet:
-                Match = self.__findMatchedPairFrom(k,l,'r')
-                if Match and self.isFinalState(Match[0]):
-                    self.__mergeStates(Match[0],Match[1])
-                elif Match and self.isFinalState(Match[1]):
-                    self.__mergeStates(Match[1],Match[0]) 
-                elif Match and not self.isFinalState(Match[0]) and not self.isFinalState(Match[1]):
-                    self.__mergeStates(Match[0],Match[1]) 
-        #self.__removeLambdaTransitions()
-        self.__pruneStates()
-        self.__build()
+        Order = {}
+        for i in range(len(self.__States)):
+            Order[self.__States[i]] = i
+        self.__Deltas.sort(key=lambda i: Order[i[0]])
         
-    def __removeLambdaTransitions(self):
-        i = 0
-        while i < len(self.__Deltas):
-            if self.__Deltas[i][1] == '\u03BB':
-                if self.isFinalState(self.__Deltas[i][0]):
-                    self.__mergeStates(self.__Deltas[i][0],self.__Deltas[i][2])
-                elif self.isFinalState(self.__Deltas[i][1]):
-                    self.__mergeStates(self.__Deltas[i][1],self.__Deltas[i][0]) 
-                elif not self.isFinalState(self.__Deltas[i][0]) and not self.isFinalState(self.__Deltas[i][1]):
-                    self.__mergeStates(self.__Deltas[i][0],self.__Deltas[i][1])  
-                i = -1
-            i = i + 1
+    def __trim(self):
+        """
+        Removes the states that cannot be reached from 'q_0' or from which no 
+        final state can be reached, with every Delta-transition in or out of 
+        them, and the symbols no longer used.
+
+        Returns
+        -------
+        None.
+
+        """
+        Forward = {}
+        Backward = {}
+        for i in self.__Deltas:
+            Forward.setdefault(i[0],[]).append(i[2])
+            Backward.setdefault(i[2],[]).append(i[0])
+        Reached = []
+        for Edges, Starts in [(Forward,['q_0']),(Backward,self.__Finals)]:
+            Seen = set(Starts)
+            Stack = list(Starts)
+            while Stack:
+                for j in Edges.get(Stack.pop(),()):
+                    if j not in Seen:
+                        Seen.add(j)
+                        Stack.append(j)
+            Reached.append(Seen)
+        Useful = Reached[0] & Reached[1]
+        Useful.add('q_0')
+        self.__Deltas = [i for i in self.__Deltas if i[0] in Useful and i[2] in Useful]
+        self.__States = [i for i in self.__States if i in Useful]
+        self.__Finals = [i for i in self.__Finals if i in Useful]
+        Used = set(i[1] for i in self.__Deltas)
+        self.__Alphabet = [i for i in self.__Alphabet if i in Used]
             
 class DFA:
     """Class representing a DFA."""
-    __DFA = ()
-    __States = []
-    __Alphabet = []
-    __Deltas = []
-    __Finals = []
+    __slots__ = ('__States','__Alphabet','__Deltas','__Finals','__Sparse','__Storage','__Frozen','__Reverse','__Index')
     
-    def __init__(self,NFAObj=()):  
+    def __init__(self,NFAObj=(),sparse=False):  
         """
         Constructor for the DFA.
 
@@ -531,18 +2078,23 @@ class DFA:
         ----------
         NFAObj : NFA, optional
             An NFA class object. The default is ().
+        sparse : bool, optional
+            If True, missing transitions go to an implicit dead state and the 
+            NULL state is never built.  The default is False.
 
         Returns
         -------
         None.
 
         """
+        self.__Sparse = sparse
+        self.__Storage = 'auto'
         #if no NFA provided, construct a simple one-state DFA.
         if NFAObj == ():
-            self.__DFA = nx.DiGraph(rankdir='LR')
-            self.__DFA.add_node('q_i',shape='point')
-            self.__DFA.add_node('q_0',shape='doublecircle')
-            self.__DFA.add_edge('q_i','q_0')
+            self.__States = ['q_0']
+            self.__Finals = ['q_0']
+            self.__Alphabet = []
+            self.__Deltas = []
         else:
             self.__Alphabet = NFAObj.getAlphabet()
             self.__trimInheritedAlphabet()
@@ -550,97 +2102,389 @@ class DFA:
             self.__Finals = NFAObj.getFinalStates()
             self.__States = NFAObj.getStates()
             self.__buildDeltasFromInherited()
-            self.__build()
+        self.__buildTable()
       
-    def __del__(self):
+    def accepts(self,string):
         """
-        Destructor for the DFA.  Clears private member lists.
+        Declares if the DFA accepts the given string (see FrozenDFA.accepts()).
+
+        Parameters
+        ----------
+        string : str
+            The input string.
 
         Returns
         -------
-        None.
+        bool
+            True if the DFA ends in a final state on the string.  False otherwise.
 
         """
-        self.__Alphabet.clear()
-        self.__States.clear()
-        self.__Deltas.clear()
-        self.__Finals.clear()
-        
-    def getAlphabet(self):
+        return self.__Frozen.accepts(string)
+    
+    def acceptsMany(self,strings,workers=1):
         """
-        Standard getter for the private Alphabet member.
+        Declares, for each given string, if the DFA accepts it.  With more than 
+        one worker, the table is placed in shared memory (see toSharedMemory()) 
+        and the strings are shared out over a pool of worker processes, which 
+        all read the same copy of the table.
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
 
         Returns
         -------
         List
-            Copy of the Alphabet list.
+            True for each accepted string.  False otherwise.
 
         """
-        return self.__Alphabet.copy()
-        
-    def getDeltas(self):
+        if workers <= 1:
+            return [self.__Frozen.accepts(i) for i in strings]
+        Shared = self.toSharedMemory()
+        try:
+            return Shared.acceptsMany(strings,workers)
+        finally:
+            Shared.close()
+            Shared.unlink()
+    
+    def addWords(self,words):
         """
-        Standard getter for the private Deltas member.
+        Adds the given words to the language of the DFA, in place and without 
+        a rebuild (see __updateWord()).  Only the states on each word's path 
+        are cloned and re-minimized, so a minimal DFA (e.g. from fromWords() 
+        or reduce()) stays minimal.  The NULL state, if any, is dropped.
+
+        Parameters
+        ----------
+        words : iterable
+            The words to add, in any order.
 
         Returns
         -------
-        List (2D)
-            Copy of the Deltas list.
+        None.
 
         """
-        return self.__Deltas.copy()
+        self.__update(words,True)
     
-    def getEdgeLabel(self,stateA,stateB):
+    def canonicalize(self):
         """
-        Standard getter for an edge label between two nodes/states.
+        Puts the DFA in canonical form (see _canonicalComponents()): useless 
+        states are dropped, symbols with the same transitions are merged, and 
+        the states are renamed in breadth-first order from 'q_0' over the 
+        sorted symbols.  Equivalent minimal DFAs (e.g. after reduce()) have 
+        identical canonical forms.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__States, self.__Alphabet, self.__Deltas, self.__Finals = _canonicalComponents(self.__States,self.__Alphabet,self.__Deltas,self.__Finals)
+        self.__Sparse = True
+        self.__buildTable()
+    
+    def compile(self,cache=COMPILE_CACHE):
+        """
+        Generates, compiles and loads Python code specialized to this DFA, for 
+        the fastest matching in pure Python (one dict subscript per character; 
+        see _compiledSource()).  Meant for small to medium DFAs: the code holds 
+        every transition.  The code object is cached on disk under a hash of 
+        the DFA and the Python version, and later calls for the same DFA load 
+        it from there.  The returned function is unaffected by later changes 
+        to this DFA.
 
         Parameters
         ----------
-        stateA : str
-            The stored name of the first node/state.  On the form 'q_0','q_1',etc.
-        stateB : str
-            The stored name of the second node/state.  On the form 'q_0','q_1',etc.
+        cache : str, optional
+            The cache directory, or None to not cache.  The default is 
+            COMPILE_CACHE.
 
         Returns
         -------
-        str
-            The edge label (all symbols, separated by commas if needed).
+        function
+            accepts(string), returning True if the DFA accepts the string.
 
         """
-        SymSet = []
-        for i in self.__Deltas:
-            if i[0] == stateA and i[2] == stateB:
-                SymSet.append(i[1])
-        return self.__groupedSymbols(SymSet)
-        
-    def getFinalStates(self):
+        Key = hashlib.sha256(repr((sys.implementation.cache_tag,COMPILE_EXPAND,self.__States,self.__Alphabet,
+                                   self.__Deltas,self.__Finals)).encode('utf-8')).hexdigest()
+        Path = None if cache is None else os.path.join(cache,Key + '.marshal')
+        Code = None
+        if Path is not None and os.path.exists(Path):
+            try:
+                with open(Path,'rb') as f:
+                    Code = marshal.load(f)
+            except (OSError,EOFError,ValueError,TypeError):
+                Code = None
+        if Code is None:
+            Source = _compiledSource(self.__States,self.__Alphabet,self.__Deltas,self.__Finals)
+            Code = compile(Source,'<DFA %s>' % Key[:12],'exec')
+            if Path is not None:
+                try:
+                    os.makedirs(cache,exist_ok=True)
+                    Temp = '%s.%d.tmp' % (Path,os.getpid())
+                    with open(Temp,'wb') as f:
+                        marshal.dump(Code,f)
+                    os.replace(Temp,Path)
+                except OSError:
+                    pass
+        Namespace = {}
+        exec(Code,Namespace)
+        return Namespace['accepts']
+    
+    def countAccepted(self,n,modulus=None):
         """
-        Standard getter for the private Finals member.
+        Counts the strings of length n that the DFA accepts (characters, not 
+        symbols: a symbol standing for k characters counts k times).  Uses 
+        dynamic programming over the transition count matrix (see __count()).
+
+        Parameters
+        ----------
+        n : int
+            The string length.
+        modulus : int, optional
+            If given, the count is taken modulo this number, which keeps the 
+            arithmetic in fixed-size integers for large n.  The default is None 
+            (the exact count).
 
         Returns
         -------
-        List
-            Copy of the Finals list.
+        int
+            The number of accepted strings of length n.
 
         """
-        return self.__Finals.copy()
+        return self.__count(n,modulus,False)
     
-    def getNextStateOn(self,initState,symbol):
+    def countAcceptedUpTo(self,n,modulus=None):
         """
-        Getter that returns the succeeding state on a given edge (symbol).
+        Counts the strings of length 0 to n that the DFA accepts (see 
+        countAccepted()).
 
         Parameters
         ----------
-        initState : str
-            The starting node/state.  On the form 'q_0','q_1',etc.
-        symbol : str
-            The outgoing symbol/edge.
+        n : int
+            The largest string length.
+        modulus : int, optional
+            If given, the count is taken modulo this number.  The default is 
+            None (the exact count).
 
         Returns
         -------
-        str
-            The name of the destination node/state.  Returns empty string if 
-            invalid.
+        int
+            The number of accepted strings of length at most n.
+
+        """
+        return self.__count(n,modulus,True)
+    
+    def enumerate(self,maxLength=None):
+        """
+        Generates the accepted strings in shortlex order (shorter strings 
+        first, strings of the same length in code point order), one at a 
+        time, without building the list.  The search for strings of length n 
+        only enters states from which a final state can be reached in 
+        exactly the remaining number of characters, so every step leads to 
+        an output.  For an infinite language the generator never ends unless 
+        maxLength is given.
+
+        Parameters
+        ----------
+        maxLength : int, optional
+            The length of the longest strings to generate.  The default is 
+            None (no limit).
+
+        Yields
+        ------
+        str
+            The accepted strings.
+
+        """
+        Useful = self.__usefulStates()
+        if not Useful:
+            return
+        Edges = self.__rangeEdges(Useful)
+        Backward = {}
+        for i in Edges:
+            for j in Edges[i]:
+                Backward.setdefault(j[2],set()).add(i)
+        Live = [set(i for i in self.__Finals if i in Useful)]
+        Length = 0
+        #once no state has an accepted suffix of some length, none has a longer one.
+        while (maxLength is None or Length <= maxLength) and Live[Length]:
+            if 'q_0' in Live[Length]:
+                yield from self.__enumerateLength(Edges,Live,Length)
+            Live.append(set(j for i in Live[Length] for j in Backward.get(i,())))
+            Length = Length + 1
+    
+    def fingerprint(self):
+        """
+        Returns a hash of the canonical transition table (see canonicalize()), 
+        without changing the DFA.  Equivalent minimal DFAs get the same 
+        fingerprint, so it can serve as a key for deduplication and caches 
+        in place of pairwise comparison.  Runs in linear time.
+
+        Returns
+        -------
+        str
+            The SHA-256 hex digest of the canonical table.
+
+        """
+        States, Alphabet, Deltas, Finals = _canonicalComponents(self.__States,self.__Alphabet,self.__Deltas,self.__Finals)
+        return hashlib.sha256(repr((len(States),Alphabet,Deltas,Finals)).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def fromComponents(states,alphabet,deltas,finals):
+        """
+        Constructs a DFA directly from its member data.  The start state must 
+        be 'q_0' and the Alphabet symbols must not overlap; transitions that 
+        are not given go to the (implicit) NULL state.  Called on the class, 
+        as DFA.fromComponents(...).
+
+        Parameters
+        ----------
+        states : List
+            The states.
+        alphabet : List
+            The Alphabet.
+        deltas : List (2D)
+            The Delta-transitions, as [state, symbol, state] rows.
+        finals : List
+            The final states.
+
+        Returns
+        -------
+        DFA
+            A new DFA class instantiation.
+
+        """
+        D = DFA.__new__(DFA)
+        D.__States = list(states)
+        D.__Alphabet = list(alphabet)
+        D.__Deltas = [list(i) for i in deltas]
+        D.__Finals = list(finals)
+        D.__Sparse = '\u2205' not in D.__States
+        D.__Storage = 'auto'
+        D.__buildTable()
+        return D
+    
+    @staticmethod
+    def fromWords(words):
+        """
+        Constructs the minimal DFA accepting exactly the given words, directly 
+        from the sorted word list (see _wordAutomaton()) and without an NFA.
+
+        Parameters
+        ----------
+        words : iterable
+            The words, in sorted order; e.g. the lines of a sorted dictionary 
+            file, without line endings.
+
+        Returns
+        -------
+        DFA
+            A new DFA class instantiation, with implicit NULL transitions.
+
+        """
+        return DFA.fromComponents(*_wordAutomaton(words))
+    
+    @staticmethod
+    def fromSharedMemory(name):
+        """
+        Attaches to a DFA table placed in shared memory by toSharedMemory(), 
+        possibly in another process.  Nothing is copied: the returned object 
+        reads the shared pages directly.  Called on the class, as 
+        DFA.fromSharedMemory(name).
+
+        Parameters
+        ----------
+        name : str
+            The name of the shared memory block (see SharedDFA.getName()).
+
+        Returns
+        -------
+        SharedDFA
+            The attached table.  Call its close() method when done.
+
+        """
+        return SharedDFA(_sharedOpen(name))
+        
+    def getAlphabet(self):
+        """
+        Standard getter for the private Alphabet member.
+
+        Returns
+        -------
+        List
+            Copy of the Alphabet list.
+
+        """
+        return self.__Alphabet.copy()
+        
+    def getDeltas(self):
+        """
+        Standard getter for the private Deltas member.
+
+        Returns
+        -------
+        List (2D)
+            Copy of the Deltas list.
+
+        """
+        return [i.copy() for i in self.__Deltas]
+    
+    def getEdgeLabel(self,stateA,stateB):
+        """
+        Standard getter for an edge label between two nodes/states.
+
+        Parameters
+        ----------
+        stateA : str
+            The stored name of the first node/state.  On the form 'q_0','q_1',etc.
+        stateB : str
+            The stored name of the second node/state.  On the form 'q_0','q_1',etc.
+
+        Returns
+        -------
+        str
+            The edge label (all symbols, separated by commas if needed).
+
+        """
+        SymSet = []
+        for i in self.__Deltas:
+            if i[0] == stateA and i[2] == stateB:
+                SymSet.append(i[1])
+        return self.__groupedSymbols(SymSet)
+        
+    def getFinalStates(self):
+        """
+        Standard getter for the private Finals member.
+
+        Returns
+        -------
+        List
+            Copy of the Finals list.
+
+        """
+        return self.__Finals.copy()
+    
+    def getNextStateOn(self,initState,symbol):
+        """
+        Getter that returns the succeeding state on a given edge (symbol).
+
+        Parameters
+        ----------
+        initState : str
+            The starting node/state.  On the form 'q_0','q_1',etc.
+        symbol : str
+            The outgoing symbol/edge.
+
+        Returns
+        -------
+        str
+            The name of the destination node/state.  Returns empty string if 
+            invalid.
 
         """
         for i in self.__Deltas:
@@ -659,6 +2503,18 @@ class DFA:
 
         """
         return self.__States.copy()  
+    
+    def getStorage(self):
+        """
+        Reports how the transition table rows are stored.
+
+        Returns
+        -------
+        dict
+            The number of states stored as 'dense' and as 'sparse' rows.
+
+        """
+        return self.__Frozen.getStorage()
 
     def inDegreeOn(self,state):
         """
@@ -681,6 +2537,51 @@ class DFA:
                 Degree = Degree + 1
         return Degree
     
+    def isEmpty(self):
+        """
+        Declares if the DFA accepts no string at all, by a search for a final 
+        state reachable from 'q_0'.  Runs in linear time.
+
+        Returns
+        -------
+        bool
+            True if the language of the DFA is empty.  False otherwise.
+
+        """
+        return 'q_0' not in self.__usefulStates()
+    
+    def isFinite(self):
+        """
+        Declares if the DFA accepts finitely many strings: true if no cycle 
+        runs through states that are both reachable from 'q_0' and able to 
+        reach a final state.  Runs in linear time.
+
+        Returns
+        -------
+        bool
+            True if the language of the DFA is finite.  False otherwise.
+
+        """
+        Useful = self.__usefulStates()
+        Count = {}
+        for i in Useful:
+            Count[i] = 0
+        Out = {}
+        for i in self.__Deltas:
+            if i[0] in Useful and i[2] in Useful:
+                Out.setdefault(i[0],[]).append(i[2])
+                Count[i[2]] = Count[i[2]] + 1
+        #remove states without incoming transitions until none are left.
+        Stack = [i for i in Count if Count[i] == 0]
+        Removed = 0
+        while Stack:
+            Removed = Removed + 1
+            for j in Out.get(Stack.pop(),()):
+                Count[j] = Count[j] - 1
+                if Count[j] == 0:
+                    Stack.append(j)
+        return Removed == len(Useful)
+    
     def isFinalState(self,state):
         """
         Declares if given state is a final state (true or false).
@@ -743,27 +2644,78 @@ class DFA:
                 return True
         return False
     
-    def reduce(self):
+    def memoryReport(self):
         """
-        Reduces the DFA to the extent possible.
+        Reports the approximate memory held by this DFA, for sizing.  Each 
+        object is counted once, in the first group that holds it: state names 
+        go to 'states', so 'transitions' counts only the Delta-transition 
+        tuples and the Alphabet.  The 'indexes' are the matching table (see 
+        snapshot()) and the index kept by addWords() and removeWords(), and 
+        the 'caches' the reversed table kept by search().
+
+        Returns
+        -------
+        dict
+            The size in bytes of the 'states', 'transitions', 'indexes' and 
+            'caches', and their 'total'.
+
+        """
+        Seen = set()
+        Report = {'states':_deepSize([self.__States,self.__Finals],Seen),
+                  'transitions':_deepSize([self.__Deltas,self.__Alphabet],Seen),
+                  'indexes':_deepSize([self.__Frozen,self.__Index],Seen),
+                  'caches':_deepSize([self.__Reverse],Seen)}
+        Report['total'] = sum(Report.values())
+        return Report
+    
+    def reduce(self,backend='auto'):
+        """
+        Reduces the DFA to the minimal DFA for its language: useless states are 
+        trimmed (see trim()) and indistinguishable states are merged by Moore's 
+        partition refinement.
+
+        Parameters
+        ----------
+        backend : str, optional
+            'numpy' to run each refinement round as array operations, 'python' 
+            for plain Python, or 'auto' to use NumPy when it is installed.
+            The default is 'auto'.
 
         Returns
         -------
         None.
 
         """
-        self.__removeNullStates()
-        #self.__removeTrapStates()
-        for i in self.__States:
-            for j in self.__Alphabet:
-                Match = self.__findMatchedPairFrom(i,j)
-                if Match and self.isFinalState(Match[0]):
-                    self.__mergeStates(Match[0],Match[1])
-                elif Match and self.isFinalState(Match[1]):
-                    self.__mergeStates(Match[1],Match[0]) 
-        self.__pruneStates()
-        self.__build()
+        if backend not in ['auto','numpy','python']:
+            raise ValueError('unknown reduce() backend %r' % backend)
+        if backend == 'numpy' and np is None:
+            raise ImportError("DFA.reduce(backend='numpy') needs NumPy")
+        self.__trim()
+        if backend == 'numpy' or (backend == 'auto' and np is not None):
+            Blocks = self.__refineWithNumpy()
+        else:
+            Blocks = self.__refine()
+        self.__mergeBlocks(Blocks)
+        self.__buildTable()
           
+    def removeWords(self,words):
+        """
+        Removes the given words from the language of the DFA, in place and 
+        without a rebuild (see addWords()).  Words it does not accept are 
+        ignored.
+
+        Parameters
+        ----------
+        words : iterable
+            The words to remove, in any order.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__update(words,False)
+    
     def numberOfSelfLoopsOn(self,state):
         """
         Returns the number of self-loops on the given state.
@@ -806,337 +2758,1045 @@ class DFA:
                 Degree = Degree + 1
         return Degree
 
-    def saveAndView(self,name='./myDFA.gv'):
+    def sample(self,n,length,rng=None):
         """
-        Saves a copy of the constructed DFA and opens a PDF version for viewing.
+        Draws accepted strings of the given length uniformly at random (with 
+        replacement).  The number of accepted suffixes of each length is 
+        counted once, for the states at the matching distance from 'q_0'; 
+        each character is then drawn with the weight of the strings through 
+        it, by a binary search over the cumulative counts of the state's 
+        character ranges.  The counts are exact, so the draws are uniform.
 
         Parameters
         ----------
-        name : str, optional
-            The name AND relative (or absolute) path for your saved DFA.
-            The default is './myDFA.gv'.
+        n : int
+            The number of strings.
+        length : int
+            The length of the strings.
+        rng : random.Random, optional
+            The random number generator.  The default is None (a new, randomly 
+            seeded one).
+
+        Raises
+        ------
+        ValueError
+            If the DFA accepts no string of the given length.
 
         Returns
         -------
-        None.
+        List
+            The strings.
 
         """
-        nx.drawing.nx_agraph.write_dot(self.__DFA,name)
-        gv.render('dot','pdf',name)
-        ViewName = name + '.pdf'
-        gv.view(ViewName)
-        
-    def __allPairsFinalAndNon(self):
+        if rng is None:
+            rng = random.Random()
+        Useful = self.__usefulStates()
+        Edges = self.__rangeEdges(Useful)
+        #only the states k characters from 'q_0' need counts for length - k.
+        Reach = [{'q_0'} & Useful]
+        for k in range(length):
+            Reach.append(set(j[2] for i in Reach[-1] for j in Edges.get(i,())))
+        Finals = set(self.__Finals)
+        Count = [{}]
+        for i in Reach[length]:
+            Count[0][i] = 1 if i in Finals else 0
+        #the cumulative counts and ranges of each state for each suffix length.
+        Tables = [None]
+        for k in range(1,length + 1):
+            Count.append({})
+            Tables.append({})
+            for i in Reach[length - k]:
+                Total = 0
+                Cumulative = []
+                Steps = []
+                for j in Edges.get(i,()):
+                    if Count[k - 1][j[2]]:
+                        Total = Total + (j[1] - j[0] + 1)*Count[k - 1][j[2]]
+                        Cumulative.append(Total)
+                        Steps.append((j[0],Count[k - 1][j[2]],j[2]))
+                Count[k][i] = Total
+                if Total:
+                    Tables[k][i] = (Cumulative,Steps)
+        if not Count[length].get('q_0'):
+            raise ValueError('the DFA accepts no string of length %d' % length)
+        Strings = []
+        for i in range(n):
+            State = 'q_0'
+            Chars = []
+            for k in range(length,0,-1):
+                Cumulative, Steps = Tables[k][State]
+                Pick = rng.randrange(Cumulative[-1])
+                j = bisect.bisect_right(Cumulative,Pick)
+                Step = Steps[j]
+                if j:
+                    Pick = Pick - Cumulative[j - 1]
+                Chars.append(chr(Step[0] + Pick//Step[1]))
+                State = Step[2]
+            Strings.append(''.join(Chars))
+        return Strings
+    
+    def scan(self,string,workers=1,chunk=1<<22):
         """
-        Returns all pairs of Final and Non-Final states (unordered).
+        Runs the DFA over one (large) string and reports where it accepts; see 
+        SharedDFA.scan() for how the string is split between worker processes.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
+        chunk : int, optional
+            The number of characters per chunk.  The default is 1<<22.
 
         Returns
         -------
-        AllPairs : List (2D)
-            All pairs of non-final and final state.
+        str
+            The state reached at the end of the string, or None for the dead 
+            (or NULL) state.
+        List
+            Every position i such that string[:i] is accepted, in order.
 
         """
-        NonFinals = []
-        AllPairs = []
-        for i in self.__States:
-            if not self.isFinalState(i):
-                NonFinals.append(i)
-        for i in self.__Finals:
-            for j in NonFinals:
-                AllPairs.append([i,j])
-                AllPairs.append([j,i])
-        return AllPairs
-                
-    def __build(self):
+        return self.__sharedScan('scan',string,workers,chunk)
+    
+    def scanFile(self,file,workers=1,chunk=1<<24):
         """
-        Constructs the Networkx DFA object using the wrapper class characteristics.
+        Runs the DFA over the text of a UTF-8 file and reports where it accepts 
+        (see scan()).  Each worker reads its own chunk of the file.
+
+        Parameters
+        ----------
+        file : str
+            The name of the file.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
+        chunk : int, optional
+            The number of bytes per chunk.  The default is 1<<24.
 
         Returns
         -------
-        None.
+        str
+            The state reached at the end of the file, or None for the dead (or 
+            NULL) state.
+        List
+            The byte offset just after every accepted prefix, in order.
 
         """
-        self.__DFA = nx.DiGraph(rankdir='LR')
-        for i in self.__Deltas:
-            self.__DFA.add_node(i[0],shape='circle')
-            self.__DFA.add_node(i[2],shape='circle')
-            Label = self.getEdgeLabel(i[0],i[2])
-            self.__DFA.add_edge(i[0],i[2],label=Label)
-        for j in self.__Finals:
-            nx.set_node_attributes(self.__DFA,{j:{'shape':'doublecircle'}})
-        self.__DFA.add_node('q_i',shape='point')
-        self.__DFA.add_edge('q_i','q_0')
+        return self.__sharedScan('scanFile',file,workers,chunk)
     
-    def __buildDeltasFromInherited(self):
+    def setStorage(self,mode):
         """
-        Constructs the 2-D list of delta-transitions from the incoming NFA class 
-        object.
+        Selects how the transition table rows are stored.  Dense rows hold a 
+        slot for every Alphabet symbol; sparse rows hold sorted symbol/target 
+        arrays for the live transitions only, with the NULL state implied for 
+        the others.
+
+        Parameters
+        ----------
+        mode : str
+            'dense', 'sparse', or 'auto' (choose per state from its fan-out; see 
+            DENSE_FANOUT).
 
         Returns
         -------
         None.
 
         """
-        NewDeltas = []
-        NullState = False
-        for i in self.__States:
-            for j in self.__Alphabet:
-                Grouped = self.__groupWalksFromStateOnSymbol(i,j)
-                #if returns group is an empty list, edges transition to NULL state.
-                if not Grouped:
-                    NewDeltas.append([i,j,'\u2205'])
-                    NullState = True  #flag means add NULL state to States member.
-                else:
-                    for k in Grouped:
-                        NewDeltas.append([i,j,k])
-        if NullState:
-            self.__States.append('\u2205')
-            Label = self.__groupedSymbols(self.__Alphabet.copy())
-            NewDeltas.append(['\u2205',Label,'\u2205'])
-        self.__Deltas.clear()
-        self.__Deltas = NewDeltas.copy()
-        self.__pruneDeltaCopies()
+        if mode not in ['dense','sparse','auto']:
+            raise ValueError('unknown storage mode %r' % mode)
+        self.__Storage = mode
+        self.__buildTable()
         
-    def __findMatchedPairFrom(self,state,symbol):
+    def snapshot(self):
         """
-        Determines if two states are indistinguishable relative to the given state 
-        on the given symbol.
-
-        Parameters
-        ----------
-        state : str
-            The name of the state.
-        symbol : str
-            The symbol/edge on which to transition.
+        Returns an immutable snapshot of the DFA for read-only matching.  The 
+        snapshot may be shared between threads, and is unaffected by later 
+        changes to this DFA.
 
         Returns
         -------
-        List
-            Returns a pair of states that are considered indistinguishable.
+        FrozenDFA
+            The snapshot.
 
         """
-        Match = []
-        for i in self.__Deltas:
-            if (state == i[0]) and (symbol == i[1]) and (state != i[2]):
-                Match.append(i[2])
-        if len(Match) == 2:
-            return Match
-        else:
-            return []
-        
-    def __groupedSymbols(self,symSet):
-        """
-        Creates labels for combined symbol transitions.  On the form "a,b,c", etc.
+        return self.__Frozen
 
-        Parameters
-        ----------
-        symSet : List
-            The symbols to combine.
+    def tableSize(self):
+        """
+        Returns the approximate memory used by the transition table rows.
 
         Returns
         -------
-        str
-            The comma-separated symbol/edge label.
+        int
+            Size of the table rows, in bytes.
 
         """
-        if not symSet:
-            return ""
-        Group = symSet[0]
-        index = 1
-        while index < len(symSet):
-            Group = Group + ","
-            Group = Group + symSet[index]
-            index = index + 1
-        return Group
+        return self.__Frozen.tableSize()
     
-    def __groupWalksFromStateOnSymbol(self,initState,symbol):
+    def toSharedMemory(self,name=None):
         """
-        Given a symbol in the alphabet and an initial state, determines a destination 
-        state when empty-strings (lambdas) are removed from the DFA.
+        Copies the transition table into a new shared memory block, from which 
+        any number of processes can match without their own copy (see 
+        fromSharedMemory()).  The block holds a dense int32 table with a row 
+        per state (plus the dead state) and a column per Alphabet symbol (plus 
+        one for other characters), the bitmap of final states, and the 
+        character ranges of the symbols.  Later changes to this DFA do not 
+        affect the block.  Needs NumPy.
 
         Parameters
         ----------
-        initState : str
-            The name of the state to start 'walking' from.
-        symbol : str
-            The alphabet symbol/edge.
+        name : str, optional
+            The name of the block.  The default is None (a unique name).
 
         Returns
         -------
-        List
-            States reached after removal of lambda edges.
+        SharedDFA
+            The table, owning the block.  Call its close() and then unlink() 
+            methods when no process needs the block anymore.
 
         """
-        Group = []
-        state = initState
-        #Case:  No edge on symbol from initial state; follow the lambdas first.
-        if not self.hasOutEdgeOn(state,symbol):
-            index = 0
-            while index < len(self.__Deltas):
-                if (self.__Deltas[index][0] == state) and (self.__Deltas[index][1] == '\u03BB') and not (self.__Deltas[index][2] == state):
-                    state = self.__Deltas[index][2]
-                    index = -1
-                index = index + 1
-            initState = state
-            if self.isFinalState(initState):
-                Group.append(initState)
-            for j in self.__Deltas:
-                if (j[0] == initState) and (j[1] == symbol):
-                    state = j[2]
-                    Group.append(state)
-        #Case:  Follow alphabet symbol first, then follow lambdas.
-        else:
-            for i in self.__Deltas:
-                if (i[0] == initState) and (i[1] == symbol):
-                    state = i[2]
-                    Group.append(state)
-            index = 0
-            while index < len(self.__Deltas):
-                if (self.__Deltas[index][0] == state) and (self.__Deltas[index][1] == '\u03BB') and not (self.__Deltas[index][2] == state):
-                    state = self.__Deltas[index][2]
-                    Group.append(state)
-                    index = -1
-                index = index + 1
-        return Group.copy()
-    
-    def __mark(self):
+        if np is None:
+            raise ImportError('DFA.toSharedMemory() needs NumPy')
+        Table = self.__transitionArray()
+        Dead = len(self.__States)
+        #the NULL state is the dead state; give it the dead row's number.
+        if '\u2205' in self.__States:
+            Null = self.__States.index('\u2205')
+            Table = [[Dead if j == Null else j for j in i] for i in Table]
+        Spans = []
+        for j in range(len(self.__Alphabet)):
+            for k in _symbolRanges(self.__Alphabet[j]):
+                Spans.append((k[0],k[1],j))
+        Spans.sort()
+        Layout = _sharedLayout(Dead+1,len(self.__Alphabet)+1,len(Spans))
+        Memory = multiprocessing.shared_memory.SharedMemory(name=name,create=True,size=Layout['Size'])
+        try:
+            Views = {}
+            for i in ['Header','Table','Finals','Starts','Ends','Symbols']:
+                Offset, Type, Shape = Layout[i]
+                Views[i] = np.ndarray(Shape,dtype=Type,buffer=Memory.buf,offset=Offset)
+            Views['Header'][:] = [_SHARED_MAGIC,Dead+1,len(self.__Alphabet)+1,len(Spans),self.__States.index('q_0'),_trackerID()]
+            Views['Table'][:,:-1] = np.array(Table,dtype=np.int32).reshape(Dead+1,len(self.__Alphabet))
+            Views['Table'][:,-1] = Dead
+            Finals = set(self.__Finals)
+            Views['Finals'][:] = np.packbits(np.array([i in Finals for i in self.__States] + [False],dtype=bool))
+            for i in ['Starts','Ends','Symbols']:
+                Views[i][:] = [j[['Starts','Ends','Symbols'].index(i)] for j in Spans]
+            del Views
+        except BaseException:
+            Memory.close()
+            Memory.unlink()
+            raise
+        return SharedDFA(Memory,True)
+
+    def trim(self,removeDead=True):
         """
-        Marks all non-final and final state pairs as distinguishable or indistinguishable.
+        Removes useless states: those unreachable from 'q_0' and, unless 
+        removeDead is False, the NULL and trap states that cannot reach a final 
+        state.
+
+        Parameters
+        ----------
+        removeDead : bool, optional
+            If False, NULL and trap states are kept (for a fully connected DFA).
+            The default is True.
 
         Returns
         -------
-        Distinguishable : List (2D)
-            All pairs of distinguishable states (unordered pairs).
+        None.
 
         """
-        Distinguishable = []
-        Marked = self.__allPairsFinalAndNon()
-        for i in Marked:
-            for j in self.__Alphabet:
-                State1 = self.getNextStateOn(i[0],j)
-                State2 = self.getNextStateOn(i[1],j)
-                for k in Marked:
-                    if State1==k[0] and State2==k[1]:
-                        Distinguishable.append(k)
-        return Distinguishable      
+        self.__trim(removeDead)
+        self.__buildTable()
 
-    def __mergeStates(self,keepState,mergeState):
+    def reverse(self):
         """
-        Merges two states.
+        Constructs a DFA for the reverse of this DFA's language (every string 
+        spelled backwards), by subset construction on the reversed automaton 
+        (see _reversedComponents()).
+
+        Returns
+        -------
+        DFA
+            A new DFA class instantiation, with implicit NULL transitions.
+
+        """
+        return NFA.fromComponents(*_reversedComponents(self.__States,self.__Alphabet,self.__Deltas,self.__Finals)).toDFA(True)
+    
+    def search(self,string):
+        """
+        Finds the leftmost-longest substring of the given string that the DFA 
+        accepts, in two linear passes.  A DFA for the reversed language, with 
+        any prefix allowed, is run backwards over the whole string; the last 
+        position at which it accepts is the leftmost position at which some 
+        match starts.  This DFA is then run forward from that position, and 
+        the last position at which it accepts is the longest match's end.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+
+        Returns
+        -------
+        tuple
+            (start, end) of the match, such that string[start:end] is 
+            accepted.  Returns None if no substring is accepted.
+
+        """
+        if self.__Reverse is None:
+            Reverse = NFA.fromComponents(*_reversedComponents(self.__States,self.__Alphabet,self.__Deltas,self.__Finals,True)).toDFA(True)
+            self.__Reverse = Reverse.snapshot()
+        Length = self.__Reverse.longestPrefix(string[::-1])
+        if Length is None:
+            return None
+        Start = len(string) - Length
+        return Start, self.__Frozen.longestPrefix(string,Start)
+        
+    def saveAndView(self,name='./myDFA.gv',view=True,background=False,collapse=False,focus=None,hops=1,limit=RENDER_LIMIT):
+        """
+        Saves a copy of the constructed DFA and opens a PDF version for viewing.
+        Large automata can be cut down before rendering (see writeDot()); by 
+        default only the first RENDER_LIMIT states are drawn.
+
+        Parameters
+        ----------
+        name : str, optional
+            The name AND relative (or absolute) path for your saved DFA.
+            The default is './myDFA.gv'.
+        view : bool, optional
+            If False, the PDF is rendered but not opened.  It is never opened 
+            without a display.  The default is True.
+        background : bool, optional
+            If True, the PDF is rendered by a separate process and is not 
+            opened.  The default is False.
+        collapse, focus, hops, limit : optional
+            See writeDot().
+
+        Returns
+        -------
+        multiprocessing.Process or None
+            The rendering process when rendering in the background.
+
+        """
+        self.writeDot(name,collapse,focus,hops,limit)
+        return _render(name,view,background)
+        
+    def writeDot(self,file,collapse=False,focus=None,hops=1,limit=None):
+        """
+        Writes the DFA in the DOT language.  Edge labels are grouped in a single 
+        pass and written out as they are produced, without building a Networkx 
+        graph.  Large automata can be cut down first, which is done in the 
+        order: focus, collapse, limit.
 
         Parameters
         ----------
-        keepState : str
-            The name of the state which will remain and inherit edges from mergeState.
-        mergeState : str
-            The name of the state which will disappear.
+        file : str or file object
+            The name AND relative (or absolute) path of the .gv file to write, 
+            or an open text file object to write to.
+        collapse : bool, optional
+            If True, each strongly-connected component is written as one summary 
+            state.  The default is False.
+        focus : List, optional
+            If given, only the states within 'hops' edges of these states are 
+            written.  The default is None.
+        hops : int, optional
+            The neighbourhood size for focus.  The default is 1.
+        limit : int, optional
+            If there are more states than this, only the first 'limit' states 
+            reached from 'q_0' (or from the focus states) are written.  The 
+            default is None (no limit).
 
         Returns
         -------
         None.
 
         """
-        #Never phase out the q_0 state      
-        if mergeState == 'q_0':
-            return
-        i = 0
-        while i < len(self.__Deltas):
-            if self.__Deltas[i][0] == mergeState:
-                self.__Deltas[i][0] = keepState
-            if self.__Deltas[i][2] == mergeState:
-                self.__Deltas[i][2] = keepState
-            i = i + 1
-        self.__pruneDeltaCopies()
+        _writeView(file,'dfa',self.__States,self.__Deltas,self.__Finals,collapse,focus,hops,limit)
     
-    def __pruneDeltaCopies(self):
+    def __buildTable(self):
         """
-        Removes duplicated Delta-transitions from Deltas member.
+        Replaces the matching snapshot with one built from the current Deltas, 
+        Alphabet and Finals members (see FrozenDFA), and drops the index kept 
+        by addWords() and removeWords().
 
         Returns
         -------
         None.
 
         """
+        self.__Frozen = FrozenDFA(self.__Alphabet,self.__Deltas,self.__Finals,self.__Storage)
+        self.__Reverse = None
+        self.__Index = None
+        
+    def __buildDeltasFromInherited(self):
+        """
+        Constructs the 2-D list of delta-transitions from the incoming NFA class 
+        object by subset construction.  The inherited symbols are first split 
+        into disjoint minterms, which become the DFA Alphabet; each DFA state 
+        'q_0','q_1',etc. stands for a lambda-closed set of NFA states, held as 
+        a bit mask (see __subsetTables()), and the empty set is the NULL state 
+        (left implicit when sparse).  NFA states that cannot reach a final 
+        state are left out of every subset, so no dead subset is ever built: 
+        a subset holding only such states is the NULL state.
+
+        Returns
+        -------
+        None.
+
+        """
+        Minterms, Rows, Start, FinalMask = self.__subsetTables()
+        Names = {Start:'q_0'}
+        Queue = [Start]
+        NewDeltas = []
+        NewFinals = []
+        NullState = False
         index = 0
-        while index < (len(self.__Deltas)-1):
-            indey = index + 1
-            First = self.__Deltas[index].copy()
-            while indey < len(self.__Deltas):
-                Second = self.__Deltas[indey].copy()
-                if (First[0]==Second[0]) and (First[1]==Second[1]) and (First[2]==Second[2]):
-                    self.__Deltas.remove(self.__Deltas[indey])
-                    indey = indey - 1
-                indey = indey + 1
+        while index < len(Queue):
+            Subset = Queue[index]
+            Name = Names[Subset]
+            if Subset & FinalMask:
+                NewFinals.append(Name)
+            Succ = [0]*len(Minterms)
+            Bits = Subset
+            while Bits:
+                Low = Bits & -Bits
+                for j in Rows[Low.bit_length() - 1]:
+                    Succ[j[0]] = Succ[j[0]] | j[1]
+                Bits = Bits ^ Low
+            for j in range(len(Minterms)):
+                #if no live state is reached, edge transitions to NULL state (or to 
+                #'q_0', if it is empty too).
+                if not Succ[j]:
+                    if not self.__Sparse and not Start:
+                        NewDeltas.append([Name,Minterms[j],'q_0'])
+                    elif not self.__Sparse:
+                        NewDeltas.append([Name,Minterms[j],'\u2205'])
+                        NullState = True  #flag means add NULL state to States member.
+                    continue
+                if Succ[j] not in Names:
+                    Names[Succ[j]] = 'q_' + str(len(Names))
+                    Queue.append(Succ[j])
+                NewDeltas.append([Name,Minterms[j],Names[Succ[j]]])
             index = index + 1
-            
+        self.__States = [Names[i] for i in Queue]
+        if NullState:
+            self.__States.append('\u2205')
+            for j in Minterms:
+                NewDeltas.append(['\u2205',j,'\u2205'])
+        self.__Alphabet = Minterms
+        self.__Finals = NewFinals
+        self.__Deltas = NewDeltas
+        
+    def __subsetTables(self):
+        """
+        Prepares the subset construction (see __buildDeltasFromInherited()).  
+        The NFA states that can reach a final state (the live states) are 
+        found by a backward search, and each is given a bit; subsets of NFA 
+        states are bit masks over the live states only, and are interned by 
+        the masks themselves (Python hashes an int over its machine words).  
+        For each live state and minterm, the mask of live states in the lambda 
+        closure of its targets is precomputed, so the successor of a subset 
+        is the union of its states' masks.
+
+        Returns
+        -------
+        Minterms : List
+            The minterms of the inherited symbols (see _minterms()).
+        Rows : List
+            For each live state bit, the sorted (minterm index, mask) pairs of 
+            its non-empty moves.
+        Start : int
+            The mask of the lambda closure of 'q_0'.
+        FinalMask : int
+            The mask of the final states.
+
+        """
+        Minterms, Covers = _minterms(self.__Alphabet)
+        Lambdas = {}
+        Backward = {}
+        for i in self.__Deltas:
+            Backward.setdefault(i[2],[]).append(i[0])
+            if i[1] == '\u03BB':
+                Lambdas.setdefault(i[0],[]).append(i[2])
+        Live = self.__search(self.__Finals,Backward)
+        Bit = {}
+        for i in self.__States:
+            if i in Live:
+                Bit[i] = len(Bit)
+        Closures = {}
+        def closure(state):
+            if state not in Closures:
+                Mask = 0
+                for j in self.__lambdaClosure({state},Lambdas):
+                    if j in Bit:
+                        Mask = Mask | (1 << Bit[j])
+                Closures[state] = Mask
+            return Closures[state]
+        Column = {}
+        for j in range(len(Minterms)):
+            Column[Minterms[j]] = j
+        Moves = [{} for i in Bit]
+        for i in self.__Deltas:
+            if i[1] != '\u03BB' and i[0] in Bit and i[2] in Bit:
+                Row = Moves[Bit[i[0]]]
+                for j in Covers[i[1]]:
+                    Row[Column[j]] = Row.get(Column[j],0) | closure(i[2])
+        FinalMask = 0
+        for i in self.__Finals:
+            if i in Bit:
+                FinalMask = FinalMask | (1 << Bit[i])
+        return Minterms, [tuple(sorted(i.items())) for i in Moves], closure('q_0'), FinalMask
+    
+    def __groupedSymbols(self,symSet):
+        """
+        Creates labels for combined symbol transitions.  On the form "a,b,c", etc.
+
+        Parameters
+        ----------
+        symSet : List
+            The symbols to combine.
+
+        Returns
+        -------
+        str
+            The comma-separated symbol/edge label.
+
+        """
+        if not symSet:
+            return ""
+        Group = symSet[0]
+        index = 1
+        while index < len(symSet):
+            Group = Group + ","
+            Group = Group + symSet[index]
+            index = index + 1
+        return Group
+    
+    def __lambdaClosure(self,states,lambdas):
+        """
+        Returns the given states together with every state reachable from them 
+        on lambda edges alone.
+
+        Parameters
+        ----------
+        states : set
+            The NFA states to start 'walking' from.
+        lambdas : dict
+            Maps each NFA state to the destinations of its lambda edges.
+
+        Returns
+        -------
+        frozenset
+            The lambda-closure of the given states.
+
+        """
+        Closure = set(states)
+        Stack = list(states)
+        while Stack:
+            for i in lambdas.get(Stack.pop(),()):
+                if i not in Closure:
+                    Closure.add(i)
+                    Stack.append(i)
+        return frozenset(Closure)
+    
+    def __mergeBlocks(self,blocks):
+        """
+        Merges the states that share a block id into one state, named after the 
+        block's first state in the States list ('q_0' for the start block).
+
+        Parameters
+        ----------
+        blocks : List
+            The block id of each state, in States order.
+
+        Returns
+        -------
+        None.
+
+        """
+        Keep = {}
+        for i in range(len(self.__States)):
+            if self.__States[i] == 'q_0':
+                Keep[blocks[i]] = 'q_0'
+            Keep.setdefault(blocks[i],self.__States[i])
+        Rename = {}
+        for i in range(len(self.__States)):
+            Rename[self.__States[i]] = Keep[blocks[i]]
+        NewDeltas = []
+        for i in self.__Deltas:
+            if Rename[i[0]] == i[0]:
+                NewDeltas.append([i[0],i[1],Rename[i[2]]])
+        self.__Deltas = NewDeltas
+        self.__States = [i for i in self.__States if Rename[i] == i]
+        self.__Finals = [i for i in self.__Finals if Rename[i] == i]
+        
     def __pruneStates(self):
         """
         Removes states from States list if they are no longer found in the Deltas 
-        member list.
+        member list.  The 'q_0' state is never removed.
 
         Returns
         -------
         None.
 
         """
-        index = 0
-        while index < len(self.__States):
-            Defunct = True
-            for j in self.__Deltas:
-                if (self.__States[index] == j[0]) or (self.__States[index] == j[2]):
-                    Defunct = False
-            if Defunct:
-                self.__States.remove(self.__States[index])
-                index = index - 1
-            index = index + 1
-            
-    def __removeNullStates(self):
+        Used = {'q_0'}
+        for j in self.__Deltas:
+            Used.add(j[0])
+            Used.add(j[2])
+        self.__States = [i for i in self.__States if i in Used]
+        self.__Finals = [i for i in self.__Finals if i in Used]
+        
+    def __trim(self,removeDead=True):
         """
-        Removes all Delta-Transitions with NULL states in them.  Also removes the 
-        NULL state from the States list (see pruneStates() method)
+        Removes the states that cannot be reached from 'q_0' and, if requested, 
+        the (NULL and trap) states from which no final state can be reached; 
+        along with every Delta-transition in or out of them.  Runs a forward 
+        search from 'q_0' and a backward search from the final states over an 
+        inverse index, in O(states + transitions).
+
+        Parameters
+        ----------
+        removeDead : bool, optional
+            If False, only unreachable states are removed.  The default is True.
 
         Returns
         -------
         None.
 
         """
-        index = 0
-        while index < len(self.__Deltas):
-            if self.__Deltas[index][2] == '\u2205':
-                self.__Deltas.remove(self.__Deltas[index])
-                index = index - 1
-            index = index + 1
-        index = 0
-        while index < len(self.__Deltas):
-            if not self.isFinalState(self.__Deltas[index][0]) and (self.inDegreeOn(self.__Deltas[index][0]) == self.numberOfSelfLoopsOn(self.__Deltas[index][0])) and (self.__Deltas[index][0] != 'q_0'):
-                self.__Deltas.remove(self.__Deltas[index])
-                index = index - 1
-            index = index + 1
-        self.__pruneStates()
+        Forward = {}
+        Backward = {}
+        for i in self.__Deltas:
+            Forward.setdefault(i[0],[]).append(i[2])
+            Backward.setdefault(i[2],[]).append(i[0])
+        Useful = self.__search(['q_0'],Forward)
+        if removeDead:
+            Useful = Useful & self.__search(self.__Finals,Backward)
+        self.__Deltas = [i for i in self.__Deltas if i[0] in Useful and i[2] in Useful]
+        #'q_0' is kept even if it cannot reach a final state, without its transitions.
+        Useful.add('q_0')
+        self.__States = [i for i in self.__States if i in Useful]
+        self.__Finals = [i for i in self.__Finals if i in Useful]
         
-    def __removeTrapStates(self):
+    def __refine(self):
         """
-        Removes all Delta-transitions with trap states in them.  Also removes the 
-        trap state from the States list (see pruneStates() method).
+        Moore's partition refinement in plain Python.  States start in two 
+        blocks (final and non-final) and are split by the blocks of their 
+        successors until no block splits.  Missing transitions lead to an 
+        implicit dead state.
 
         Returns
         -------
-        None.
+        List
+            The block id of each state, in States order.
+
+        """
+        Table = self.__transitionArray()
+        Count = len(self.__States) + 1
+        Finals = set(self.__Finals)
+        Block = [1 if i in Finals else 0 for i in self.__States] + [0]
+        Size = len(set(Block))
+        while True:
+            Signatures = {}
+            New = []
+            for i in range(Count):
+                Key = (Block[i],) + tuple(Block[j] for j in Table[i])
+                New.append(Signatures.setdefault(Key,len(Signatures)))
+            Block = New
+            if len(Signatures) == Size:
+                return Block[:-1]
+            Size = len(Signatures)
+            
+    def __refineWithNumpy(self):
+        """
+        Moore's partition refinement with NumPy (see __refine()).  The partition 
+        is an int array; each round gathers the block ids of all successors 
+        through the transition table at once, lexsorts the (block, successor 
+        blocks) signature rows and relabels the blocks by distinct row.
+
+        Returns
+        -------
+        List
+            The block id of each state, in States order.
+
+        """
+        Table = np.array(self.__transitionArray(),dtype=np.int64).reshape(len(self.__States)+1,len(self.__Alphabet))
+        Finals = set(self.__Finals)
+        Block = np.array([1 if i in Finals else 0 for i in self.__States] + [0],dtype=np.int64)
+        Size = len(np.unique(Block))
+        while True:
+            Signature = np.column_stack((Block,Block[Table]))
+            Order = np.lexsort(Signature.T[::-1])
+            Sorted = Signature[Order]
+            Split = np.any(Sorted[1:] != Sorted[:-1],axis=1)
+            New = np.empty_like(Block)
+            New[Order] = np.concatenate(([0],np.cumsum(Split)))
+            Block = New
+            if int(Block.max()) + 1 == Size:
+                return Block[:-1].tolist()
+            Size = int(Block.max()) + 1
+            
+    def __transitionArray(self):
+        """
+        Numbers the states in States order and returns the transition table as 
+        rows of successor numbers, one column per Alphabet symbol.  An extra 
+        last row stands for the implicit dead state, which every missing (or 
+        NULL state) transition leads to.
+
+        Returns
+        -------
+        List (2D)
+            The successor number of each state on each symbol.
+
+        """
+        Number = {}
+        for i in range(len(self.__States)):
+            Number[self.__States[i]] = i
+        Dead = len(self.__States)
+        Number['\u2205'] = Number.get('\u2205',Dead)
+        Column = {}
+        for j in range(len(self.__Alphabet)):
+            Column[self.__Alphabet[j]] = j
+        Table = [[Dead]*len(self.__Alphabet) for i in range(Dead+1)]
+        for i in self.__Deltas:
+            Table[Number[i[0]]][Column[i[1]]] = Number[i[2]]
+        return Table
+            
+    def __sharedScan(self,method,source,workers,chunk):
+        """
+        Runs a SharedDFA scan method on a temporary shared copy of the table, 
+        and names the state it ends in.
+
+        Parameters
+        ----------
+        method : str
+            'scan' or 'scanFile'.
+        source : str
+            The string or file name.
+        workers : int
+            The number of worker processes.
+        chunk : int
+            The chunk size.
+
+        Returns
+        -------
+        str
+            The state reached, or None for the dead state.
+        List
+            The accepted positions.
+
+        """
+        Shared = self.toSharedMemory()
+        try:
+            State, Positions = getattr(Shared,method)(source,workers,chunk)
+        finally:
+            Shared.close()
+            Shared.unlink()
+        if State < len(self.__States) and self.__States[State] != '\u2205':
+            return self.__States[State], Positions
+        return None, Positions
+            
+    def __count(self,n,modulus,upTo):
+        """
+        Counts the accepted strings of length n (or of length 0 to n).  The 
+        transition count matrix holds, for each pair of useful states, the 
+        number of characters leading from one to the other; the count is the 
+        start row of its n-th power, summed over the final states.  For the 
+        counts up to n, an extra state that every final state enters on one 
+        (virtual) character and that loops on one character sums the counts 
+        over the lengths, after n + 1 steps.
+
+        Parameters
+        ----------
+        n : int
+            The string length.
+        modulus : int
+            The modulus, or None for the exact count.
+        upTo : bool
+            If True, count the strings of length 0 to n.
+
+        Raises
+        ------
+        ValueError
+            If the modulus is not positive.
+
+        Returns
+        -------
+        int
+            The count.
+
+        """
+        if modulus is not None and modulus < 1:
+            raise ValueError('the modulus must be positive')
+        Useful = self.__usefulStates()
+        if n < 0 or not Useful:
+            return 0
+        Number = {}
+        for i in self.__States:
+            if i in Useful:
+                Number[i] = len(Number)
+        Width = {}
+        for i in self.__Alphabet:
+            Width[i] = sum(j[1] - j[0] + 1 for j in _symbolRanges(i))
+        Rows = [{} for i in Number]
+        for i in self.__Deltas:
+            if i[0] in Number and i[2] in Number:
+                Row = Rows[Number[i[0]]]
+                Row[Number[i[2]]] = Row.get(Number[i[2]],0) + Width[i[1]]
+        Targets = set(Number[i] for i in self.__Finals if i in Number)
+        Steps = n
+        if upTo:
+            Rows.append({len(Rows):1})
+            for i in Targets:
+                Rows[i][len(Rows) - 1] = 1
+            Targets = {len(Rows) - 1}
+            Steps = n + 1
+        Vector = self.__countVector(Rows,Number['q_0'],Steps,modulus)
+        Total = sum(int(Vector[i]) for i in Targets)
+        return Total if modulus is None else Total % modulus
+    
+    def __countVector(self,rows,start,steps,modulus):
+        """
+        Computes the start row of a power of a count matrix.  Small matrices 
+        raised to high powers are squared repeatedly (O(states^3 log steps)); 
+        otherwise the row vector is multiplied by the matrix step by step, as 
+        one NumPy gather and segmented sum over the transitions per step.  
+        Fixed-size int64 arithmetic is used when the counts cannot overflow 
+        (bounded by the largest row sum to the power of steps, or by the 
+        modulus); Python integers otherwise, or without NumPy.
+
+        Parameters
+        ----------
+        rows : List
+            For each state, a dict mapping target states to counts.
+        start : int
+            The start state.
+        steps : int
+            The power.
+        modulus : int
+            The modulus, or None for exact counts.
+
+        Returns
+        -------
+        List
+            The count of each state.
+
+        """
+        Size = len(rows)
+        Edges = sum(len(i) for i in rows)
+        Largest = max(max(sum(i.values()) for i in rows),1)
+        if modulus is None:
+            Fits = Largest == 1 or steps*Largest.bit_length() < 62
+        if Size**3*steps.bit_length() < steps*max(Edges,1):
+            if modulus is not None:
+                Fits = modulus*modulus*Size < 1 << 62
+            if np is not None:
+                Matrix = np.zeros((Size,Size),dtype=np.int64 if Fits else object)
+                Vector = np.zeros((1,Size),dtype=Matrix.dtype)
+                multiply = np.dot
+            else:
+                Matrix = [[0]*Size for i in rows]
+                Vector = [[0]*Size]
+                def multiply(a,b):
+                    return [[sum(x*y for x,y in zip(i,j)) for j in zip(*b)] for i in a]
+            for i in range(Size):
+                for j in rows[i]:
+                    Matrix[i][j] = rows[i][j]
+            Vector[0][start] = 1
+            while steps:
+                if steps & 1:
+                    Vector = multiply(Vector,Matrix)
+                    if modulus is not None:
+                        Vector = [[j % modulus for j in i] for i in Vector] if np is None else Vector % modulus
+                steps = steps >> 1
+                if steps:
+                    Matrix = multiply(Matrix,Matrix)
+                    if modulus is not None:
+                        Matrix = [[j % modulus for j in i] for i in Matrix] if np is None else Matrix % modulus
+            return list(Vector[0])
+        if modulus is not None:
+            Fits = modulus*max(Largest,Size) < 1 << 62
+        if np is not None and Fits and Edges:
+            Sources = np.array([i for i in range(Size) for j in rows[i]],dtype=np.int64)
+            Targets = np.array([j for i in range(Size) for j in rows[i]],dtype=np.int64)
+            Weights = np.array([rows[i][j] for i in range(Size) for j in rows[i]],dtype=np.int64)
+            Order = np.argsort(Targets,kind='stable')
+            Sources, Targets, Weights = Sources[Order], Targets[Order], Weights[Order]
+            Bounds = np.flatnonzero(np.concatenate(([True],Targets[1:] != Targets[:-1])))
+            Heads = Targets[Bounds]
+            Vector = np.zeros(Size,dtype=np.int64)
+            Vector[start] = 1
+            for i in range(steps):
+                if not Vector.any():
+                    break
+                Terms = Vector[Sources]*Weights
+                Vector = np.zeros(Size,dtype=np.int64)
+                if len(Terms):
+                    if modulus is not None:
+                        Terms = Terms % modulus
+                    Vector[Heads] = np.add.reduceat(Terms,Bounds)
+                if modulus is not None:
+                    Vector = Vector % modulus
+            return Vector.tolist()
+        Vector = {start:1}
+        for i in range(steps):
+            if not Vector:
+                break
+            New = {}
+            for j in Vector:
+                for k in rows[j]:
+                    New[k] = New.get(k,0) + Vector[j]*rows[j][k]
+            if modulus is not None:
+                New = {j: New[j] % modulus for j in New if New[j] % modulus}
+            Vector = New
+        return [Vector.get(i,0) for i in range(Size)]
+    
+    def __enumerateLength(self,edges,live,length):
+        """
+        Generates the accepted strings of one length in code point order, by a 
+        depth-first search that keeps a stack of character generators (see 
+        __liveSteps()).
+
+        Parameters
+        ----------
+        edges : dict
+            The character ranges out of each state (see __rangeEdges()).
+        live : List
+            The states with an accepted suffix of each length, up to length.
+        length : int
+            The length of the strings.
+
+        Yields
+        ------
+        str
+            The accepted strings of the given length.
+
+        """
+        if length == 0:
+            yield ''
+            return
+        Prefix = []
+        Stack = [self.__liveSteps(edges,live,'q_0',length)]
+        while Stack:
+            Step = next(Stack[-1],None)
+            if Step is None:
+                Stack.pop()
+                if Prefix:
+                    Prefix.pop()
+            elif len(Prefix) + 1 == length:
+                Prefix.append(Step[0])
+                yield ''.join(Prefix)
+                Prefix.pop()
+            else:
+                Prefix.append(Step[0])
+                Stack.append(self.__liveSteps(edges,live,Step[1],length - len(Prefix)))
+    
+    def __liveSteps(self,edges,live,state,remaining):
+        """
+        Generates, in code point order, the characters out of a state that 
+        lead to a state with an accepted suffix of the remaining length less 
+        one.
+
+        Parameters
+        ----------
+        edges : dict
+            The character ranges out of each state (see __rangeEdges()).
+        live : List
+            The states with an accepted suffix of each length.
+        state : str
+            The state.
+        remaining : int
+            The number of characters still to read, including this one.
+
+        Yields
+        ------
+        tuple
+            The character and the state it leads to.
+
+        """
+        for i in edges.get(state,()):
+            if i[2] in live[remaining - 1]:
+                for j in range(i[0],i[1] + 1):
+                    yield chr(j), i[2]
+    
+    def __rangeEdges(self,useful):
+        """
+        Lists the character ranges out of each state, between useful states 
+        only (see __usefulStates()).
+
+        Parameters
+        ----------
+        useful : set
+            The useful states.
+
+        Returns
+        -------
+        dict
+            Maps each state to its sorted (low, high, target) ranges.
+
+        """
+        Ranges = {}
+        for i in self.__Alphabet:
+            Ranges[i] = _symbolRanges(i)
+        Edges = {}
+        for i in self.__Deltas:
+            if i[0] in useful and i[2] in useful:
+                for j in Ranges[i[1]]:
+                    Edges.setdefault(i[0],[]).append((j[0],j[1],i[2]))
+        for i in Edges:
+            Edges[i].sort()
+        return Edges
+    
+    def __usefulStates(self):
+        """
+        Finds the states that are reachable from 'q_0' and can reach a final 
+        state.
+
+        Returns
+        -------
+        set
+            The useful states (empty if the language is empty).
+
+        """
+        Forward = {}
+        Backward = {}
+        for i in self.__Deltas:
+            Forward.setdefault(i[0],[]).append(i[2])
+            Backward.setdefault(i[2],[]).append(i[0])
+        return self.__search(['q_0'],Forward) & self.__search(self.__Finals,Backward)
+    
+    def __search(self,starts,edges):
+        """
+        Breadth-first search over an adjacency index.
+
+        Parameters
+        ----------
+        starts : List
+            The states to start from.
+        edges : dict
+            Maps each state to the list of its neighbouring states.
+
+        Returns
+        -------
+        Seen : set
+            Every state reachable from the starting states (inclusive).
 
         """
+        Seen = set(starts)
+        Queue = list(starts)
         index = 0
-        while index < len(self.__Deltas):
-            if not self.isFinalState(self.__Deltas[index][2]) and (self.outDegreeOn(self.__Deltas[index][2]) == 0):
-                self.__Deltas.remove(self.__Deltas[index])
-                index = index - 1
+        while index < len(Queue):
+            for i in edges.get(Queue[index],()):
+                if i not in Seen:
+                    Seen.add(i)
+                    Queue.append(i)
             index = index + 1
-        index = 0
-        while index < len(self.__Deltas):
-            if not self.isFinalState(self.__Deltas[index][2]) and (self.outDegreeOn(self.__Deltas[index][2]) == self.numberOfSelfLoopsOn(self.__Deltas[index][2])) and (self.__Deltas[index][2] != 'q_0'):
-                self.__Deltas.remove(self.__Deltas[index])
-                index = index - 1
-            index = index + 1   
-        self.__pruneStates()
+        return Seen
             
     def __trimInheritedAlphabet(self):
         """
@@ -1155,4 +3815,1596 @@ class DFA:
                 self.__Alphabet.remove(self.__Alphabet[index])
                 index = index - 1
                 AlphaLen = AlphaLen - 1
-            index = index + 1
\ No newline at end of file
+            index = index + 1
+    
+    def __update(self,words,add):
+        """
+        Adds the words to, or removes them from, the language of the DFA by the 
+        incremental algorithm of Carrasco and Forcada for minimal DFAs (see 
+        __updateWord()), then brings the member lists and the matching 
+        snapshot up to date.  The index used by the updates (see 
+        __updateIndex()) is built on the first call and kept for the next 
+        ones; any other change to the DFA drops it.  Only the rows of the 
+        new and deleted states are rebuilt, unless the start state was 
+        renamed or the Alphabet changed, in which case all of them are.
+
+        Parameters
+        ----------
+        words : iterable
+            The words.
+        add : bool
+            True to add the words, False to remove them.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__Index is None:
+            self.__Index = self.__updateIndex()
+        Index = self.__Index
+        Names = Index['Names']
+        Edges = Index['Edges']
+        Added = {}
+        Gone = {'\u2205'}
+        for i in words:
+            Columns = self.__wordColumns(Index,i,add)
+            if Columns is not None:
+                self.__updateWord(Index,Columns,add,Added,Gone)
+        if Index['Rebuild']:
+            Added = {}
+            for i in range(len(Edges)):
+                if Edges[i] is not None:
+                    Added[Names[i]] = i
+            self.__States = []
+            self.__Deltas = []
+            self.__Finals = []
+        else:
+            Added = {i: Added[i] for i in Added if Edges[Added[i]] is not None and Names[Added[i]] == i}
+            self.__States = [i for i in self.__States if i not in Gone]
+            if self.__Sparse:
+                self.__Deltas = [i for i in self.__Deltas if i[0] not in Gone]
+            else:
+                self.__Deltas = [i for i in self.__Deltas if i[0] not in Gone and i[2] != '\u2205']
+            self.__Finals = [i for i in self.__Finals if i not in Gone]
+        if 'q_0' in Added:
+            self.__States.insert(0,'q_0')
+        Deltas = []
+        for i in Added:
+            if i != 'q_0':
+                self.__States.append(i)
+            for j in sorted(Edges[Added[i]].items()):
+                Deltas.append([i,self.__Alphabet[j[0]],Names[j[1]]])
+            if Index['Final'][Added[i]]:
+                self.__Finals.append(i)
+        self.__Deltas.extend(Deltas)
+        self.__Sparse = True
+        if Index['Rebuild']:
+            self.__buildTable()
+            Index['Rebuild'] = False
+            self.__Index = Index
+        else:
+            self.__Frozen = self.__Frozen.withRows(self.__Alphabet,Deltas,self.__Finals,Gone,self.__Storage)
+            self.__Reverse = None
+        
+    def __updateIndex(self):
+        """
+        Builds the index used by addWords() and removeWords(): the states 
+        numbered in States order (without the NULL state), their transitions 
+        as symbol-index/state-number dicts, their finality and in-degree, the 
+        register of states by finality and transitions, and the character 
+        ranges of the Alphabet symbols.
+
+        Returns
+        -------
+        dict
+            The index.
+
+        """
+        Names = [i for i in self.__States if i != '\u2205']
+        Ids = {}
+        for i in range(len(Names)):
+            Ids[Names[i]] = i
+        Columns = {}
+        for i in range(len(self.__Alphabet)):
+            Columns[self.__Alphabet[i]] = i
+        Edges = [{} for i in Names]
+        InDeg = [0]*len(Names)
+        for i in self.__Deltas:
+            if i[0] in Ids and i[2] in Ids:
+                Edges[Ids[i[0]]][Columns[i[1]]] = Ids[i[2]]
+                InDeg[Ids[i[2]]] = InDeg[Ids[i[2]]] + 1
+        Finals = set(self.__Finals)
+        Final = [i in Finals for i in Names]
+        Register = {}
+        for i in range(len(Names)):
+            Register.setdefault((Final[i],tuple(sorted(Edges[i].items()))),i)
+        Next = 0
+        for i in Names:
+            if i[:2] == 'q_' and i[2:].isdigit():
+                Next = max(Next,int(i[2:]) + 1)
+        Index = {'Names':Names,'Edges':Edges,'Final':Final,'InDeg':InDeg,'Register':Register,
+                 'Free':[],'Next':Next,'Start':Ids['q_0'],'Rebuild':False}
+        self.__updateSpans(Index)
+        return Index
+    
+    def __updateSpans(self,index):
+        """
+        Stores the sorted character ranges of the Alphabet symbols in the 
+        update index, along with the symbols that hold more than one character.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+
+        Returns
+        -------
+        None.
+
+        """
+        Spans = []
+        Wide = set()
+        for j in range(len(self.__Alphabet)):
+            Ranges = _symbolRanges(self.__Alphabet[j])
+            if len(Ranges) > 1 or Ranges[0][0] != Ranges[0][1]:
+                Wide.add(j)
+            for k in Ranges:
+                Spans.append((k[0],k[1],j))
+        Spans.sort()
+        index['Spans'] = Spans
+        index['Starts'] = [i[0] for i in Spans]
+        index['Wide'] = Wide
+    
+    def __wordColumns(self,index,word,add):
+        """
+        Maps the characters of a word to Alphabet symbol indices for an update.  
+        A character found in no symbol is given a new symbol of its own when 
+        adding; a character inside a wider symbol is split out of it into a 
+        new symbol, with a copy of every transition on the old one, so that 
+        the word can be told apart from its neighbours.  Either change to the 
+        Alphabet marks the member lists for a full rebuild.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+        word : str
+            The word.
+        add : bool
+            True if the word is added, False if it is removed.
+
+        Returns
+        -------
+        List
+            The symbol index of each character, or None if the word is removed 
+            and has a character in no symbol (so it is not accepted).
+
+        """
+        Columns = []
+        for Char in word:
+            Code = ord(Char)
+            k = bisect.bisect_right(index['Starts'],Code) - 1
+            if k < 0 or index['Spans'][k][1] < Code:
+                if not add:
+                    return None
+                self.__Alphabet = self.__Alphabet + [_rangesLabel([(Code,Code)])]
+                index['Rebuild'] = True
+                self.__updateSpans(index)
+                Columns.append(len(self.__Alphabet) - 1)
+            elif index['Spans'][k][2] in index['Wide']:
+                Columns.append(self.__splitSymbol(index,index['Spans'][k][2],Code))
+            else:
+                Columns.append(index['Spans'][k][2])
+        return Columns
+    
+    def __splitSymbol(self,index,symbol,code):
+        """
+        Splits one character out of an Alphabet symbol into a new symbol, 
+        copying every transition on the old symbol to the new one.  The 
+        language does not change, and equivalent states stay equivalent.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+        symbol : int
+            The index of the symbol holding the character.
+        code : int
+            The code point of the character.
+
+        Returns
+        -------
+        int
+            The index of the new symbol.
+
+        """
+        Rest = []
+        for i in _symbolRanges(self.__Alphabet[symbol]):
+            if i[0] <= code <= i[1]:
+                if i[0] < code:
+                    Rest.append((i[0],code - 1))
+                if code < i[1]:
+                    Rest.append((code + 1,i[1]))
+            else:
+                Rest.append(i)
+        Alphabet = self.__Alphabet.copy()
+        Alphabet[symbol] = _rangesLabel(sorted(Rest))
+        Alphabet.append(_rangesLabel([(code,code)]))
+        self.__Alphabet = Alphabet
+        New = len(Alphabet) - 1
+        Edges = index['Edges']
+        for i in range(len(Edges)):
+            if Edges[i] is not None and symbol in Edges[i]:
+                Edges[i][New] = Edges[i][symbol]
+                index['InDeg'][Edges[i][New]] = index['InDeg'][Edges[i][New]] + 1
+        index['Register'] = {}
+        for i in range(len(Edges)):
+            if Edges[i] is not None:
+                index['Register'].setdefault((index['Final'][i],tuple(sorted(Edges[i].items()))),i)
+        index['Rebuild'] = True
+        self.__updateSpans(index)
+        return New
+    
+    def __updateWord(self,index,columns,add,added,gone):
+        """
+        Adds one word to, or removes it from, the language, keeping a minimal 
+        DFA minimal (Carrasco and Forcada).  The states on the word's path 
+        from the start are cloned, so that the other words through them are 
+        unaffected, and the clone of the last one is made final or not final 
+        (adding states for the part of the word off the DFA).  The old path 
+        states that can no longer be reached are deleted.  Then, from the 
+        last clone back to the start, each clone is replaced by an equivalent 
+        state from the register if there is one, dropped if it is a dead end, 
+        or else registered.  The work is proportional to the word's length 
+        times the fan-out of its states.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+        columns : List
+            The symbol index of each character of the word.
+        add : bool
+            True to add the word, False to remove it.
+        added : dict
+            Collects the registered new states, by name.
+        gone : set
+            Collects the names of the deleted states.
+
+        Returns
+        -------
+        None.
+
+        """
+        Edges = index['Edges']
+        Final = index['Final']
+        InDeg = index['InDeg']
+        Names = index['Names']
+        Register = index['Register']
+        Path = [index['Start']]
+        while len(Path) <= len(columns):
+            Next = Edges[Path[-1]].get(columns[len(Path) - 1])
+            if Next is None:
+                break
+            Path.append(Next)
+        Complete = len(Path) == len(columns) + 1
+        if (Complete and Final[Path[-1]] == add) or not (add or Complete):
+            return
+        Clones = [self.__newState(index,dict(Edges[i]),Final[i]) for i in Path]
+        for i in range(1,len(Clones)):
+            Edges[Clones[i - 1]][columns[i - 1]] = Clones[i]
+            InDeg[Path[i]] = InDeg[Path[i]] - 1
+            InDeg[Clones[i]] = InDeg[Clones[i]] + 1
+        while len(Clones) <= len(columns):
+            State = self.__newState(index,{},False)
+            Edges[Clones[-1]][columns[len(Clones) - 1]] = State
+            InDeg[State] = 1
+            Clones.append(State)
+        Final[Clones[-1]] = add
+        Start = index['Start']
+        index['Start'] = Clones[0]
+        #delete the old path states that are only reached from the path itself.
+        Inner = {}
+        for i in Path:
+            Inner[i] = 0
+        for i in Inner:
+            for j in Edges[i].values():
+                if j in Inner:
+                    Inner[j] = Inner[j] + 1
+        Stack = [i for i in Inner if InDeg[i] > Inner[i]]
+        Reached = set(Stack)
+        while Stack:
+            for j in Edges[Stack.pop()].values():
+                if j in Inner and j not in Reached:
+                    Reached.add(j)
+                    Stack.append(j)
+        for i in Inner:
+            if i not in Reached:
+                self.__deleteState(index,i,gone)
+        #replace or register the clones, from the last one back to the start.
+        k = len(Clones) - 1
+        while k >= 0:
+            State = Clones[k]
+            if k > 0 and not Final[State] and not Edges[State]:
+                del Edges[Clones[k - 1]][columns[k - 1]]
+                InDeg[State] = 0
+                self.__deleteState(index,State,gone)
+            else:
+                Key = (Final[State],tuple(sorted(Edges[State].items())))
+                Same = Register.get(Key)
+                if Same is None:
+                    Register[Key] = State
+                    added[Names[State]] = State
+                else:
+                    if k > 0:
+                        Edges[Clones[k - 1]][columns[k - 1]] = Same
+                        InDeg[Same] = InDeg[Same] + 1
+                    else:
+                        index['Start'] = Same
+                    InDeg[State] = 0
+                    self.__deleteState(index,State,gone)
+            k = k - 1
+        #the start state keeps the name 'q_0'.
+        New = index['Start']
+        if New != Start:
+            if Edges[Start] is not None:
+                Names[Start] = Names[New]
+                index['Rebuild'] = True
+            elif added.get(Names[New]) == New:
+                del added[Names[New]]
+                added['q_0'] = New
+            else:
+                index['Rebuild'] = True
+            Names[New] = 'q_0'
+    
+    def __newState(self,index,edges,final):
+        """
+        Adds a state to the update index, reusing the number of a deleted 
+        state if there is one, and gives it a new name.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+        edges : dict
+            The transitions of the state.
+        final : bool
+            True if the state is final.
+
+        Returns
+        -------
+        int
+            The number of the state.
+
+        """
+        if index['Free']:
+            State = index['Free'].pop()
+        else:
+            State = len(index['Edges'])
+            index['Edges'].append(None)
+            index['Final'].append(False)
+            index['InDeg'].append(0)
+            index['Names'].append(None)
+        index['Edges'][State] = edges
+        index['Final'][State] = final
+        index['InDeg'][State] = 0
+        index['Names'][State] = 'q_%d' % index['Next']
+        index['Next'] = index['Next'] + 1
+        for i in edges.values():
+            index['InDeg'][i] = index['InDeg'][i] + 1
+        return State
+    
+    def __deleteState(self,index,state,gone):
+        """
+        Deletes a state from the update index and the register, along with its 
+        transitions, and frees its number for reuse.
+
+        Parameters
+        ----------
+        index : dict
+            The update index (see __updateIndex()).
+        state : int
+            The number of the state.
+        gone : set
+            Collects the names of the deleted states.
+
+        Returns
+        -------
+        None.
+
+        """
+        Edges = index['Edges'][state]
+        Key = (index['Final'][state],tuple(sorted(Edges.items())))
+        if index['Register'].get(Key) == state:
+            del index['Register'][Key]
+        for i in Edges.values():
+            index['InDeg'][i] = index['InDeg'][i] - 1
+        gone.add(index['Names'][state])
+        index['Edges'][state] = None
+        index['Names'][state] = None
+        index['Free'].append(state)
+
+class FrozenDFA:
+    """
+    Class representing an immutable DFA transition table, for read-only 
+    matching.  A FrozenDFA is never changed after construction, so it may be 
+    shared freely between threads.
+    """
+    __slots__ = ('__Table','__Finals','__Starts','__Spans')
+    
+    def __init__(self,alphabet,deltas,finals,storage='auto'):
+        """
+        Constructor for the FrozenDFA.  Each state with live transitions gets a 
+        dense row (one slot per Alphabet symbol) or a sparse row (sorted 
+        symbol/target tuples) according to the storage mode; transitions to the 
+        NULL state are left implicit.
+
+        Parameters
+        ----------
+        alphabet : List
+            The Alphabet of the DFA.
+        deltas : List (2D)
+            The Delta-transitions of the DFA.
+        finals : List
+            The final states of the DFA.
+        storage : str, optional
+            'dense', 'sparse', or 'auto' (choose per state from its fan-out; see 
+            DENSE_FANOUT).  The default is 'auto'.
+
+        Returns
+        -------
+        None.
+
+        """
+        Table = _tableRows(alphabet,deltas,storage)
+        Spans = []
+        for j in range(len(alphabet)):
+            for k in _symbolRanges(alphabet[j]):
+                Spans.append((k[0],k[1],j))
+        Spans.sort()
+        object.__setattr__(self,'_FrozenDFA__Table',types.MappingProxyType(Table))
+        object.__setattr__(self,'_FrozenDFA__Finals',frozenset(finals))
+        object.__setattr__(self,'_FrozenDFA__Starts',tuple(i[0] for i in Spans))
+        object.__setattr__(self,'_FrozenDFA__Spans',tuple(Spans))
+        
+    def __setattr__(self,name,value):
+        raise AttributeError('FrozenDFA objects are immutable')
+        
+    def __delattr__(self,name):
+        raise AttributeError('FrozenDFA objects are immutable')
+    
+    def accepts(self,string):
+        """
+        Declares if the DFA accepts the given string.  Each character is mapped 
+        to its Alphabet symbol by binary search over the symbol ranges.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+
+        Returns
+        -------
+        bool
+            True if the DFA ends in a final state on the string.  False otherwise.
+
+        """
+        Table = self.__Table
+        State = 'q_0'
+        for Char in string:
+            Symbol = self.__symbolOf(Char)
+            Row = Table.get(State)
+            if Symbol is None or Row is None:
+                return False
+            if type(Row[0]) is not tuple:
+                State = Row[Symbol]
+            else:
+                index = bisect.bisect_left(Row[0],Symbol)
+                if index < len(Row[0]) and Row[0][index] == Symbol:
+                    State = Row[1][index]
+                else:
+                    State = None
+            if State is None:
+                return False
+        return State in self.__Finals
+    
+    def getStorage(self):
+        """
+        Reports how the transition table rows are stored.
+
+        Returns
+        -------
+        dict
+            The number of states stored as 'dense' and as 'sparse' rows.
+
+        """
+        Count = {'dense':0,'sparse':0}
+        for i in self.__Table.values():
+            if type(i[0]) is not tuple:
+                Count['dense'] = Count['dense'] + 1
+            else:
+                Count['sparse'] = Count['sparse'] + 1
+        return Count
+    
+    def longestPrefix(self,string,begin=0):
+        """
+        Finds the longest prefix of string[begin:] that the DFA accepts.  The 
+        run stops as soon as the DFA reaches the NULL state.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+        begin : int, optional
+            The position to start from.  The default is 0.
+
+        Returns
+        -------
+        int
+            The end of the longest accepted prefix (in string), or None if no 
+            prefix is accepted.
+
+        """
+        Table = self.__Table
+        State = 'q_0'
+        Last = begin if State in self.__Finals else None
+        index = begin
+        while index < len(string):
+            Symbol = self.__symbolOf(string[index])
+            Row = Table.get(State)
+            if Symbol is None or Row is None:
+                break
+            if type(Row[0]) is not tuple:
+                State = Row[Symbol]
+            else:
+                indey = bisect.bisect_left(Row[0],Symbol)
+                if indey < len(Row[0]) and Row[0][indey] == Symbol:
+                    State = Row[1][indey]
+                else:
+                    State = None
+            if State is None:
+                break
+            index = index + 1
+            if State in self.__Finals:
+                Last = index
+        return Last
+    
+    def tableSize(self):
+        """
+        Returns the approximate memory used by the transition table rows.
+
+        Returns
+        -------
+        int
+            Size of the table rows, in bytes.
+
+        """
+        Size = sys.getsizeof(dict(self.__Table))
+        for i in self.__Table.values():
+            Size = Size + sys.getsizeof(i)
+            if type(i[0]) is tuple:
+                Size = Size + sys.getsizeof(i[0]) + sys.getsizeof(i[1])
+        return Size
+    
+    def withRows(self,alphabet,deltas,finals,removed,storage='auto'):
+        """
+        Creates a copy of this table with some rows replaced: the rows of the
+        removed states are dropped and rows are built for the states of the
+        given Delta-transitions.  The other rows are shared with this table.
+        The Alphabet must be the one this table was built with.
+    
+        Parameters
+        ----------
+        alphabet : List
+            The Alphabet of the DFA.
+        deltas : List (2D)
+            The Delta-transitions of the replaced and new states.
+        finals : List
+            All final states of the DFA.
+        removed : iterable
+            The states whose rows are dropped.
+        storage : str, optional
+            'dense', 'sparse', or 'auto' (see DENSE_FANOUT).  The default is
+            'auto'.
+    
+        Returns
+        -------
+        FrozenDFA
+            The new table.
+    
+        """
+        Table = self.__Table.copy()
+        for i in removed:
+            Table.pop(i,None)
+        Table.update(_tableRows(alphabet,deltas,storage))
+        Frozen = FrozenDFA.__new__(FrozenDFA)
+        object.__setattr__(Frozen,'_FrozenDFA__Table',types.MappingProxyType(Table))
+        object.__setattr__(Frozen,'_FrozenDFA__Finals',frozenset(finals))
+        object.__setattr__(Frozen,'_FrozenDFA__Starts',self.__Starts)
+        object.__setattr__(Frozen,'_FrozenDFA__Spans',self.__Spans)
+        return Frozen
+    
+    def __symbolOf(self,char):
+        """
+        Returns the index of the Alphabet symbol whose character ranges contain 
+        the given character.
+
+        Parameters
+        ----------
+        char : str
+            A single input character.
+
+        Returns
+        -------
+        int
+            The index of the matching symbol.  Returns None if no symbol matches.
+
+        """
+        CodePoint = ord(char)
+        index = bisect.bisect_right(self.__Starts,CodePoint) - 1
+        if index >= 0 and CodePoint <= self.__Spans[index][1]:
+            return self.__Spans[index][2]
+        return None
+
+class NFASimulator:
+    """
+    Class representing a bit-parallel NFA simulator.  Sets of NFA states are 
+    packed into bit vectors (NumPy uint64 words) and each Alphabet minterm has 
+    a precomputed transition matrix, whose row i is the lambda-closed set of 
+    states reached from state i.  A step ORs together the rows of the active 
+    states; the matrices are stored as tables of the OR of every combination 
+    of 8 consecutive rows, so a step is one lookup per byte of the active set 
+    and costs the same regardless of how many states are active.  Without 
+    NumPy, the same sets are held as Python ints.  A simulator is never 
+    changed after construction.  Above SIMULATOR_TABLE_BYTES of tables, the 
+    Python int sets are used as well.
+    """
+    __slots__ = ('__Matrices','__Rows','__Start','__Finals','__Starts','__Ends','__Symbols','__Count','__Width')
+    
+    def __init__(self,alphabet,states,deltas,finals):
+        """
+        Constructor for the NFASimulator.
+
+        Parameters
+        ----------
+        alphabet : List
+            The Alphabet of the NFA (may include lambda).
+        states : List
+            The states of the NFA.
+        deltas : List (2D)
+            The Delta-transitions of the NFA.
+        finals : List
+            The final states of the NFA.
+
+        Returns
+        -------
+        None.
+
+        """
+        Minterms, Covers = _minterms([i for i in alphabet if i != '\u03BB'])
+        Bit = {}
+        for i in range(len(states)):
+            Bit[states[i]] = i
+        Lambdas = {}
+        for i in deltas:
+            if i[1] == '\u03BB':
+                Lambdas.setdefault(Bit[i[0]],[]).append(Bit[i[2]])
+        Closure = []
+        for i in range(len(states)):
+            Seen = {i}
+            Stack = [i]
+            while Stack:
+                for j in Lambdas.get(Stack.pop(),()):
+                    if j not in Seen:
+                        Seen.add(j)
+                        Stack.append(j)
+            Closure.append(sum(1 << j for j in Seen))
+        Column = {}
+        for j in range(len(Minterms)):
+            Column[Minterms[j]] = j
+        #one row per minterm, plus an all-empty row for characters outside the Alphabet.
+        Rows = [[0]*len(states) for j in range(len(Minterms)+1)]
+        for i in deltas:
+            if i[1] != '\u03BB':
+                for j in Covers[i[1]]:
+                    Rows[Column[j]][Bit[i[0]]] |= Closure[Bit[i[2]]]
+        Spans = []
+        for j in range(len(Minterms)):
+            for k in _symbolRanges(Minterms[j]):
+                Spans.append((k[0],k[1],j))
+        Spans.sort()
+        Width = max(1,(len(states) + 63) // 64)
+        Values = {}
+        Values['Rows'] = tuple(tuple(j) for j in Rows)
+        Values['Start'] = Closure[Bit['q_0']] if 'q_0' in Bit else 0
+        Values['Finals'] = sum(1 << Bit[i] for i in finals)
+        Values['Starts'] = tuple(i[0] for i in Spans)
+        Values['Ends'] = tuple(i[1] for i in Spans)
+        Values['Symbols'] = tuple(i[2] for i in Spans)
+        Values['Count'] = len(states)
+        Values['Width'] = Width
+        Values['Matrices'] = None
+        Positions = (len(states) + 7) // 8 or 1
+        if np is not None and len(Rows)*Positions*256*Width*8 <= SIMULATOR_TABLE_BYTES:
+            Values['Matrices'] = self.__byteTables(Rows,Width)
+            Values['Matrices'].setflags(write=False)
+        for i in Values:
+            object.__setattr__(self,'_NFASimulator__' + i,Values[i])
+            
+    def __setattr__(self,name,value):
+        raise AttributeError('NFASimulator objects are immutable')
+        
+    def __delattr__(self,name):
+        raise AttributeError('NFASimulator objects are immutable')
+    
+    def acceptsMany(self,strings,batch=256):
+        """
+        Declares, for each given string, if the NFA accepts it.  With NumPy, up 
+        to 'batch' strings are advanced together, one character position at a 
+        time.
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+        batch : int, optional
+            The number of strings simulated together.  The default is 256.
+
+        Returns
+        -------
+        List
+            True for each accepted string.  False otherwise.
+
+        """
+        if self.__Matrices is None:
+            return [self.__acceptsOne(i) for i in strings]
+        Result = []
+        for i in range(0,len(strings),batch):
+            Result.extend(self.__acceptsBatch(strings[i:i+batch]))
+        return Result
+    
+    def __acceptsBatch(self,strings):
+        """
+        Simulates a batch of strings in lock-step with NumPy.
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+
+        Returns
+        -------
+        List
+            True for each accepted string.  False otherwise.
+
+        """
+        Count = len(strings)
+        Lengths = np.array([len(i) for i in strings],dtype=np.int64)
+        Longest = int(Lengths.max()) if Count else 0
+        Codes = np.zeros((Count,Longest),dtype=np.int64)
+        for i in range(Count):
+            Codes[i,:len(strings[i])] = [ord(c) for c in strings[i]]
+        Columns = self.__columnsOf(Codes)
+        Active = np.tile(np.array(self.__words(self.__Start,self.__Width),dtype=np.uint64),(Count,1))
+        Finals = np.array(self.__words(self.__Finals,self.__Width),dtype=np.uint64)
+        Accepted = np.zeros(Count,dtype=bool)
+        Accepted[Lengths == 0] = np.any(Active[Lengths == 0] & Finals,axis=1)
+        Positions = self.__Matrices.shape[1]
+        Bytes = np.arange(Positions)[None,:]
+        #cap the size of the (strings x bytes x words) temporary per step.
+        Chunk = max(1,(1 << 22) // (Positions*self.__Width))
+        for t in range(Longest):
+            Live = np.nonzero(Lengths > t)[0]
+            for j in np.unique(Columns[Live,t]):
+                Rows = Live[Columns[Live,t] == j]
+                for k in range(0,len(Rows),Chunk):
+                    Part = Rows[k:k+Chunk]
+                    Keys = Active[Part].astype('<u8').view(np.uint8)[:,:Positions]
+                    Active[Part] = np.bitwise_or.reduce(self.__Matrices[j][Bytes,Keys],axis=1)
+            Ended = Live[Lengths[Live] == t + 1]
+            Accepted[Ended] = np.any(Active[Ended] & Finals,axis=1)
+        return Accepted.tolist()
+    
+    def __acceptsOne(self,string):
+        """
+        Simulates one string with Python int bit sets.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+
+        Returns
+        -------
+        bool
+            True if the string is accepted.  False otherwise.
+
+        """
+        Active = self.__Start
+        for Char in string:
+            CodePoint = ord(Char)
+            index = bisect.bisect_right(self.__Starts,CodePoint) - 1
+            if index < 0 or CodePoint > self.__Ends[index]:
+                return False
+            Row = self.__Rows[self.__Symbols[index]]
+            Next = 0
+            while Active:
+                Low = Active & -Active
+                Next = Next | Row[Low.bit_length()-1]
+                Active = Active ^ Low
+            Active = Next
+            if not Active:
+                return False
+        return bool(Active & self.__Finals)
+    
+    def __columnsOf(self,codes):
+        """
+        Maps an array of code points to minterm numbers by binary search; code 
+        points outside the Alphabet map to the extra all-empty matrix.
+
+        Parameters
+        ----------
+        codes : numpy.ndarray
+            Code points.
+
+        Returns
+        -------
+        numpy.ndarray
+            The minterm number of each code point.
+
+        """
+        Starts = np.array(self.__Starts,dtype=np.int64)
+        Ends = np.array(self.__Ends,dtype=np.int64)
+        Symbols = np.array(self.__Symbols + (len(self.__Rows)-1,),dtype=np.int64)
+        Index = np.searchsorted(Starts,codes,side='right') - 1
+        Valid = (Index >= 0) & (codes <= Ends[np.maximum(Index,0)]) if len(Starts) else np.zeros(codes.shape,dtype=bool)
+        return np.where(Valid,Symbols[np.maximum(Index,0)],len(self.__Rows)-1)
+    
+    def __byteTables(self,rows,width):
+        """
+        Builds the transition tables: for each minterm, byte position p of the 
+        active set and byte value v, the OR of the rows of states 8p+i for 
+        every bit i set in v.
+
+        Parameters
+        ----------
+        rows : List (2D)
+            For each minterm, the successor bit set (as int) of each state.
+        width : int
+            The number of 64-bit words per bit set.
+
+        Returns
+        -------
+        numpy.ndarray
+            The tables, of shape (minterms, bytes, 256, words).
+
+        """
+        Positions = (len(rows[0]) + 7) // 8 or 1
+        Matrix = np.zeros((len(rows),Positions*8,width),dtype=np.uint64)
+        for j in range(len(rows)):
+            for i in range(len(rows[j])):
+                if rows[j][i]:
+                    Matrix[j,i] = self.__words(rows[j][i],width)
+        Matrix = Matrix.reshape(len(rows),Positions,8,width)
+        Tables = np.zeros((len(rows),Positions,256,width),dtype=np.uint64)
+        Values = np.arange(256)
+        for i in range(8):
+            Set = ((Values >> i) & 1).astype(bool)
+            Tables[:,:,Set,:] |= Matrix[:,:,i,None,:]
+        return Tables
+    
+    def __words(self,mask,width):
+        """
+        Splits a Python int bit set into 64-bit words, lowest first.
+
+        Parameters
+        ----------
+        mask : int
+            The bit set.
+        width : int
+            The number of words.
+
+        Returns
+        -------
+        List
+            The words.
+
+        """
+        return [(mask >> (64*i)) & 0xFFFFFFFFFFFFFFFF for i in range(width)]
+
+class SharedDFA:
+    """
+    Class representing a DFA transition table held in a shared memory block, 
+    for read-only matching from several processes.  The arrays are NumPy views 
+    of the block (see DFA.toSharedMemory()), so every attached process reads 
+    the same physical pages.  Strings are matched in lock-step batches: each 
+    character position is one gather over the table for the whole batch.  One 
+    large input can be scanned in parallel chunks (see scan()).
+    """
+    __slots__ = ('__Memory','__Owner','__Table','__Finals','__Starts','__Ends','__Symbols','__Start','__Lists')
+    
+    def __init__(self,memory,owner=False):
+        """
+        Constructor for the SharedDFA.  Use DFA.toSharedMemory() or 
+        DFA.fromSharedMemory() instead.
+
+        Parameters
+        ----------
+        memory : multiprocessing.shared_memory.SharedMemory
+            The shared memory block.
+        owner : bool, optional
+            True if this object created the block.  The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        if np is None:
+            raise ImportError('SharedDFA needs NumPy')
+        Header = np.ndarray((len(_SHARED_HEADER),),dtype=np.int64,buffer=memory.buf)
+        if memory.size < Header.nbytes or Header[0] != _SHARED_MAGIC:
+            del Header
+            memory.close()
+            raise ValueError('shared memory block %s does not hold a DFA' % memory.name)
+        Fields = dict(zip(_SHARED_HEADER,Header.tolist()))
+        del Header
+        Layout = _sharedLayout(Fields['Rows'],Fields['Columns'],Fields['Spans'])
+        self.__Memory = memory
+        self.__Owner = owner
+        self.__Start = Fields['Start']
+        self.__Lists = None
+        for i in ['Table','Finals','Starts','Ends','Symbols']:
+            Offset, Type, Shape = Layout[i]
+            View = np.ndarray(Shape,dtype=Type,buffer=memory.buf,offset=Offset)
+            View.setflags(write=False)
+            setattr(self,'_SharedDFA__' + i,View)
+            
+    def accepts(self,string):
+        """
+        Declares if the DFA accepts the given string.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+
+        Returns
+        -------
+        bool
+            True if the DFA ends in a final state on the string.  False otherwise.
+
+        """
+        return self.acceptsMany([string])[0]
+    
+    def acceptsMany(self,strings,workers=1,batch=4096):
+        """
+        Declares, for each given string, if the DFA accepts it.  With more than 
+        one worker, the strings are split into chunks for a pool of worker 
+        processes that attach to the same block.
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
+        batch : int, optional
+            The number of strings matched together.  The default is 4096.
+
+        Returns
+        -------
+        List
+            True for each accepted string.  False otherwise.
+
+        """
+        Chunks = [strings[i:i+batch] for i in range(0,len(strings),batch)]
+        Result = []
+        if workers <= 1:
+            for i in Chunks:
+                Result.extend(self.__acceptsBatch(i))
+            return Result
+        with multiprocessing.Pool(workers,_sharedAttach,(self.__Memory.name,)) as Pool:
+            for i in Pool.imap(_sharedAcceptsMany,Chunks):
+                Result.extend(i)
+        return Result
+    
+    def close(self):
+        """
+        Detaches this process from the shared memory block.  The object cannot 
+        be used afterwards.
+
+        Returns
+        -------
+        None.
+
+        """
+        for i in ['Table','Finals','Starts','Ends','Symbols','Lists']:
+            setattr(self,'_SharedDFA__' + i,None)
+        self.__Memory.close()
+        
+    def follow(self,source,state,limit=None):
+        """
+        Runs the DFA over one chunk from a known state (a step of scan()).
+
+        Parameters
+        ----------
+        source : str or tuple
+            The chunk: a string, or a (file name, first byte, end byte) tuple.
+        state : int
+            The state number to start from.
+        limit : int, optional
+            Only the first 'limit' characters are read.  The default is None 
+            (the whole chunk).
+
+        Returns
+        -------
+        int
+            The state number reached.
+        List
+            The positions in the chunk (characters, or bytes for a file) just 
+            after each accepted prefix of the chunk; 0 is not included.
+
+        """
+        Columns, Units = self.__chunkColumns(source)
+        End = len(Columns) if limit is None else limit
+        State, Positions = self.__follow(Columns.tolist(),state,0,End)
+        return State, self.__units(Positions,Units)
+    
+    def getName(self):
+        """
+        Standard getter for the name of the shared memory block, which other 
+        processes pass to DFA.fromSharedMemory().
+
+        Returns
+        -------
+        str
+            The block name.
+
+        """
+        return self.__Memory.name
+    
+    def scan(self,string,workers=1,chunk=1<<22):
+        """
+        Runs the DFA over one string and reports where it accepts.  The string 
+        is split into chunks.  The first chunk is run from the start state; 
+        every other chunk is run speculatively from all states at once (see 
+        speculate()), with the chunks shared between worker processes.  The 
+        chunk-to-state mappings are then composed in order to give each chunk's 
+        true start state, and the short chunk prefixes read before the 
+        speculative runs converged are run again from those states (see 
+        follow()).  The result is exactly that of a sequential run.
+
+        Parameters
+        ----------
+        string : str
+            The input string.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
+        chunk : int, optional
+            The number of characters per chunk.  The default is 1<<22.
+
+        Returns
+        -------
+        int
+            The state number reached at the end of the string.
+        List
+            Every position i such that string[:i] is accepted, in order.
+
+        """
+        Offsets = list(range(0,len(string),chunk)) or [0]
+        Sources = [string[i:i+chunk] for i in Offsets]
+        return self.__scan(Sources,Offsets,workers)
+    
+    def scanFile(self,file,workers=1,chunk=1<<24):
+        """
+        Runs the DFA over the text of a UTF-8 file (see scan()).  Chunk borders 
+        are moved forward to the next character boundary, and every worker 
+        reads and decodes its own chunk.
+
+        Parameters
+        ----------
+        file : str
+            The name of the file.
+        workers : int, optional
+            The number of worker processes.  The default is 1 (no worker 
+            processes).
+        chunk : int, optional
+            The number of bytes per chunk.  The default is 1<<24.
+
+        Returns
+        -------
+        int
+            The state number reached at the end of the file.
+        List
+            The byte offset just after every accepted prefix, in order.
+
+        """
+        Size = os.path.getsize(file)
+        Offsets = [0]
+        with open(file,'rb') as f:
+            for i in range(chunk,Size,chunk):
+                f.seek(i)
+                #skip UTF-8 continuation bytes (0b10xxxxxx).
+                Skip = 0
+                for b in f.read(3):
+                    if b & 0xC0 != 0x80:
+                        break
+                    Skip = Skip + 1
+                if i + Skip > Offsets[-1] and i + Skip < Size:
+                    Offsets.append(i + Skip)
+        Sources = [(file,Offsets[i],Offsets[i+1] if i + 1 < len(Offsets) else Size) for i in range(len(Offsets))]
+        return self.__scan(Sources,Offsets,workers)
+    
+    def speculate(self,source):
+        """
+        Runs the DFA over one chunk from every state at once (a step of scan()). 
+        Runs that reach the same state are merged as they go, and the dead 
+        state is never left, so the runs usually converge on one live run 
+        after a few characters; from there the one run is followed alone.
+
+        Parameters
+        ----------
+        source : str or tuple
+            The chunk: a string, or a (file name, first byte, end byte) tuple.
+
+        Returns
+        -------
+        numpy.ndarray
+            The state number reached from each state.
+        int
+            The number of characters read before the runs converged.
+        List
+            The positions (characters, or bytes for a file) after the 
+            convergence point at which the live run accepts.
+
+        """
+        Columns, Units = self.__chunkColumns(source)
+        Dead = self.__Table.shape[0] - 1
+        Lanes = np.arange(Dead,dtype=np.int64)
+        Inverse = np.arange(Dead,dtype=np.int64)
+        Converged = 0
+        while Converged < len(Columns) and np.count_nonzero(Lanes != Dead) > 1:
+            Lanes, Back = np.unique(self.__Table[Lanes,Columns[Converged]],return_inverse=True)
+            Inverse = Back.reshape(-1)[Inverse]
+            Converged = Converged + 1
+        Mapping = np.append(Lanes[Inverse],Dead)
+        Live = Lanes[Lanes != Dead]
+        if len(Live) == 0:
+            return Mapping, Converged, []
+        State, Positions = self.__follow(Columns.tolist(),int(Live[0]),Converged,len(Columns))
+        Mapping[Mapping == Live[0]] = State
+        return Mapping, Converged, self.__units(Positions,Units)
+    
+    def unlink(self):
+        """
+        Destroys the shared memory block once every process has closed it.  
+        Only the creating SharedDFA (see DFA.toSharedMemory()) may unlink.
+
+        Returns
+        -------
+        None.
+
+        """
+        if not self.__Owner:
+            raise ValueError('only the SharedDFA that created the block may unlink it')
+        self.__Memory.unlink()
+    
+    def __acceptsBatch(self,strings):
+        """
+        Matches a batch of strings in lock-step: the batch's states advance one 
+        character position at a time by a single gather over the table.
+
+        Parameters
+        ----------
+        strings : List
+            The input strings.
+
+        Returns
+        -------
+        List
+            True for each accepted string.  False otherwise.
+
+        """
+        Count = len(strings)
+        if Count == 0:
+            return []
+        Lengths = np.array([len(i) for i in strings],dtype=np.int64)
+        Longest = int(Lengths.max())
+        Codes = np.full((Count,Longest),-1,dtype=np.int64)
+        for i in range(Count):
+            Codes[i,:len(strings[i])] = [ord(c) for c in strings[i]]
+        Columns = self.__columnsOf(Codes)
+        State = np.full(Count,self.__Start,dtype=np.int64)
+        Final = np.empty(Count,dtype=np.int64)
+        for t in range(Longest + 1):
+            Ended = Lengths == t
+            Final[Ended] = State[Ended]
+            if t < Longest:
+                State = self.__Table[State,Columns[:,t]]
+        Accepted = (self.__Finals[Final >> 3] >> (7 - (Final & 7))) & 1
+        return Accepted.astype(bool).tolist()
+    
+    def __chunkColumns(self,source):
+        """
+        Reads a chunk and maps its characters to table columns.
+
+        Parameters
+        ----------
+        source : str or tuple
+            The chunk: a string, or a (file name, first byte, end byte) tuple.
+
+        Returns
+        -------
+        numpy.ndarray
+            The column of each character.
+        numpy.ndarray
+            For a file, the byte offset (in the chunk) after each character.  
+            None for a string.
+
+        """
+        Units = None
+        if type(source) is tuple:
+            with open(source[0],'rb') as f:
+                f.seek(source[1])
+                source = f.read(source[2] - source[1]).decode('utf-8')
+            Codes = np.frombuffer(source.encode('utf-32-le'),dtype='<u4').astype(np.int64)
+            Units = np.cumsum(1 + (Codes >= 0x80) + (Codes >= 0x800) + (Codes >= 0x10000))
+        else:
+            Codes = np.frombuffer(source.encode('utf-32-le'),dtype='<u4').astype(np.int64)
+        return self.__columnsOf(Codes), Units
+    
+    def __columnsOf(self,codes):
+        """
+        Maps code points to table columns by binary search over the character 
+        ranges; code points outside the Alphabet map to the last column.
+
+        Parameters
+        ----------
+        codes : numpy.ndarray
+            Code points (negative for padding).
+
+        Returns
+        -------
+        numpy.ndarray
+            The column of each code point.
+
+        """
+        Other = self.__Table.shape[1] - 1
+        if len(self.__Starts) == 0:
+            return np.full(codes.shape,Other,dtype=np.int64)
+        Index = np.searchsorted(self.__Starts,codes,side='right') - 1
+        Clipped = np.maximum(Index,0)
+        return np.where((Index >= 0) & (codes <= self.__Ends[Clipped]),self.__Symbols[Clipped],Other)
+    
+    def __follow(self,columns,state,begin,end):
+        """
+        Follows one run over columns[begin:end] with Python lists, which is 
+        faster than NumPy one character at a time.  Stops early in the dead 
+        state.
+
+        Parameters
+        ----------
+        columns : List
+            The column of each character.
+        state : int
+            The state number to start from.
+        begin : int
+            The first character.
+        end : int
+            The end character.
+
+        Returns
+        -------
+        int
+            The state number reached.
+        List
+            The (1-based) positions after which the run is in a final state.
+
+        """
+        if self.__Lists is None:
+            Rows = self.__Table.shape[0]
+            self.__Lists = (self.__Table.tolist(),np.unpackbits(self.__Finals)[:Rows].astype(bool).tolist())
+        Table, Finals = self.__Lists
+        Dead = len(Table) - 1
+        Positions = []
+        t = begin
+        while t < end and state != Dead:
+            state = Table[state][columns[t]]
+            t = t + 1
+            if Finals[state]:
+                Positions.append(t)
+        return state, Positions
+    
+    def __isFinal(self,state):
+        """
+        Declares if a state number is a final state.
+
+        Parameters
+        ----------
+        state : int
+            The state number.
+
+        Returns
+        -------
+        bool
+            True if the state is final.  False otherwise.
+
+        """
+        return bool((self.__Finals[state >> 3] >> (7 - (state & 7))) & 1)
+    
+    def __scan(self,sources,offsets,workers):
+        """
+        Runs the chunks of one input in two rounds (see scan()), in a worker 
+        pool when workers is more than 1.
+
+        Parameters
+        ----------
+        sources : List
+            The chunks, as for follow().
+        offsets : List
+            The position of each chunk in the whole input.
+        workers : int
+            The number of worker processes.
+
+        Returns
+        -------
+        int
+            The state number reached.
+        List
+            The accepted positions in the whole input.
+
+        """
+        Tasks = [(sources[0],self.__Start,None)] + [(i,None,None) for i in sources[1:]]
+        Pool = None
+        if workers > 1:
+            Pool = multiprocessing.Pool(workers,_sharedAttach,(self.__Memory.name,))
+        try:
+            if Pool is None:
+                First = [self.follow(*Tasks[0])] + [self.speculate(i[0]) for i in Tasks[1:]]
+            else:
+                First = Pool.map(_sharedScan,Tasks)
+            #compose the chunk mappings to find each chunk's true start state.
+            Dead = self.__Table.shape[0] - 1
+            Entry = [self.__Start]
+            for i in range(1,len(sources)):
+                Prev = First[i-1][0]
+                Entry.append(Prev if i == 1 else int(First[i-1][0][Entry[i-1]]))
+            Last = First[-1][0] if len(sources) == 1 else int(First[-1][0][Entry[-1]])
+            Redo = [(sources[i],Entry[i],First[i][1]) for i in range(1,len(sources)) if Entry[i] != Dead]
+            if Pool is None:
+                Second = [self.follow(*i) for i in Redo]
+            else:
+                Second = Pool.map(_sharedScan,Redo)
+        finally:
+            if Pool is not None:
+                Pool.close()
+                Pool.join()
+        Positions = [0] if self.__isFinal(self.__Start) else []
+        Positions.extend(First[0][1])
+        k = 0
+        for i in range(1,len(sources)):
+            if Entry[i] == Dead:
+                continue
+            State, Prefix = Second[k]
+            k = k + 1
+            Positions.extend(offsets[i] + j for j in Prefix)
+            if State != Dead:
+                Positions.extend(offsets[i] + j for j in First[i][2])
+        return Last, Positions
+    
+    def __units(self,positions,units):
+        """
+        Converts character positions in a chunk to byte offsets for a file 
+        chunk.
+
+        Parameters
+        ----------
+        positions : List
+            The (1-based) character positions.
+        units : numpy.ndarray
+            The byte offset after each character, or None for a string chunk.
+
+        Returns
+        -------
+        List
+            The positions, in bytes for a file chunk.
+
+        """
+        if units is None:
+            return positions
+        return [int(units[i-1]) for i in positions]
+
+class Lexer:
+    """
+    Class representing a longest-match tokenizer built from a prioritized list 
+    of NFAs, one per token.  The NFAs are converted to minimal DFAs and 
+    combined by a product construction into one multi-pattern DFA, whose 
+    states are labelled with the first token (in list order) they accept.  
+    Tokenizing follows the maximal munch rule: the longest match wins, and 
+    the earlier token breaks ties.  A Lexer is never changed after 
+    construction.
+    """
+    __slots__ = ('__Rows','__Tokens','__Starts','__Spans')
+    
+    def __init__(self,nfas):
+        """
+        Constructor for the Lexer.
+
+        Parameters
+        ----------
+        nfas : List
+            NFA class objects; the token id of each is its index in the list.
+
+        Returns
+        -------
+        None.
+
+        """
+        DFAs = []
+        for i in nfas:
+            D = i.toDFA(True)
+            D.reduce()
+            DFAs.append(D)
+        Minterms, Covers = _minterms(list(dict.fromkeys(j for D in DFAs for j in D.getAlphabet())))
+        Column = {}
+        for j in range(len(Minterms)):
+            Column[Minterms[j]] = j
+        Moves = []
+        Finals = []
+        for D in DFAs:
+            Move = {}
+            for i in D.getDeltas():
+                for j in Covers[i[1]]:
+                    Move[(i[0],Column[j])] = i[2]
+            Moves.append(Move)
+            Finals.append(set(D.getFinalStates()))
+        #product states are tuples of component states (None once dead).
+        Start = tuple('q_0' for D in DFAs)
+        Number = {Start:0}
+        Queue = [Start]
+        Rows = []
+        Tokens = []
+        index = 0
+        while index < len(Queue):
+            S = Queue[index]
+            index = index + 1
+            Token = None
+            for k in range(len(S)):
+                if S[k] in Finals[k]:
+                    Token = k
+                    break
+            Tokens.append(Token)
+            Row = []
+            for j in range(len(Minterms)):
+                T = tuple(Moves[k].get((S[k],j)) for k in range(len(S)))
+                if T.count(None) == len(T):
+                    Row.append(-1)
+                    continue
+                if T not in Number:
+                    Number[T] = len(Queue)
+                    Queue.append(T)
+                Row.append(Number[T])
+            #the last column is for characters outside the Alphabet.
+            Row.append(-1)
+            Rows.append(tuple(Row))
+        Spans = []
+        for j in range(len(Minterms)):
+            for k in _symbolRanges(Minterms[j]):
+                Spans.append((k[0],k[1],j))
+        Spans.sort()
+        object.__setattr__(self,'_Lexer__Rows',tuple(Rows))
+        object.__setattr__(self,'_Lexer__Tokens',tuple(Tokens))
+        object.__setattr__(self,'_Lexer__Starts',tuple(i[0] for i in Spans))
+        object.__setattr__(self,'_Lexer__Spans',tuple(Spans))
+        
+    def __setattr__(self,name,value):
+        raise AttributeError('Lexer objects are immutable')
+        
+    def __delattr__(self,name):
+        raise AttributeError('Lexer objects are immutable')
+    
+    def tokenize(self,text):
+        """
+        Splits the input into tokens by maximal munch, as a generator.  Each 
+        scan remembers the last position at which it accepted, and the input 
+        read past that position is not scanned again from the same state: 
+        every (state, position) pair from which no token could be completed 
+        is recorded, and later scans stop on reaching one.  Every pair is 
+        thus stepped through at most once, and tokenizing takes time linear 
+        in the input.  The input may be given in chunks (e.g. the lines of a 
+        file), and tokens may cross chunk borders; only the text of the 
+        current, unfinished token is kept.
+
+        Parameters
+        ----------
+        text : str or iterable
+            The input string, or an iterable of input strings (chunks).
+
+        Yields
+        ------
+        tuple
+            (token id, start, end) for each token, where start and end are 
+            positions in the whole input.
+
+        Raises
+        ------
+        ValueError
+            If no token matches at some position.
+
+        """
+        Chunks = iter([text] if type(text) is str else text)
+        Rows = self.__Rows
+        Tokens = self.__Tokens
+        Cache = {}
+        Buffer = []
+        Base = 0
+        Start = 0
+        Failed = {}
+        Done = False
+        while True:
+            State = 0
+            index = Start
+            Last = None
+            Visited = []
+            while True:
+                if index - Base == len(Buffer):
+                    if Done:
+                        break
+                    Chunk = next(Chunks,None)
+                    if Chunk is None:
+                        Done = True
+                        break
+                    #keep only the current token's columns.
+                    Buffer = Buffer[Start-Base:]
+                    for i in [i for i in Failed if i < Start]:
+                        del Failed[i]
+                    Base = Start
+                    for Char in Chunk:
+                        if Char not in Cache:
+                            Cache[Char] = self.__columnOf(Char)
+                        Buffer.append(Cache[Char])
+                    continue
+                if State in Failed.get(index,()):
+                    break
+                Visited.append((State,index))
+                State = Rows[State][Buffer[index-Base]]
+                index = index + 1
+                if State < 0:
+                    break
+                if Tokens[State] is not None:
+                    Last = (Tokens[State],index)
+                    Visited = []
+            for i in Visited:
+                Failed.setdefault(i[1],set()).add(i[0])
+            if Last is None:
+                if Done and Start - Base == len(Buffer):
+                    return
+                raise ValueError('no token matches at position %d' % Start)
+            yield (Last[0],Start,Last[1])
+            Start = Last[1]
+    
+    def __columnOf(self,char):
+        """
+        Returns the table column of a character, by binary search over the 
+        minterm ranges.
+
+        Parameters
+        ----------
+        char : str
+            A single input character.
+
+        Returns
+        -------
+        int
+            The column.  The last column for characters outside the Alphabet.
+
+        """
+        CodePoint = ord(char)
+        index = bisect.bisect_right(self.__Starts,CodePoint) - 1
+        if index >= 0 and CodePoint <= self.__Spans[index][1]:
+            return self.__Spans[index][2]
+        return len(self.__Rows[0]) - 1
@@ -0,0 +1,718 @@
+"""
+    Program for converting NFAs to DFAs.
+    Copyright (C) 2021  Jim Leon
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#! /usr/bin/python3
+
+"""
+Benchmarks for the automata module.  Synthetic NFAs are written to temporary
+.gv (DOT) files, loaded and converted, and timings/sizes are printed to the
+console.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+import automata
+
+def randomWords(count,seed=0,letters=string.ascii_lowercase+string.digits):
+    """
+    Generates distinct random words.
+
+    Parameters
+    ----------
+    count : int
+        The number of words.
+    seed : int, optional
+        Seed for the random generator.  The default is 0.
+    letters : str, optional
+        The characters words are made of.
+
+    Returns
+    -------
+    List
+        The sorted words.
+
+    """
+    Rand = random.Random(seed)
+    Words = set()
+    while len(Words) < count:
+        Words.add(''.join(Rand.choice(letters) for i in range(Rand.randint(4,10))))
+    return sorted(Words)
+
+def writeKeywordNFA(path,words):
+    """
+    Writes an NFA accepting exactly the given words.  Every word is a separate
+    chain of states leaving 'q_0', so the NFA branches non-deterministically
+    on shared prefixes.
+
+    Parameters
+    ----------
+    path : str
+        The .gv file to write.
+    words : List
+        The words to accept.
+
+    Returns
+    -------
+    None.
+
+    """
+    Lines = []
+    Finals = []
+    Count = 1
+    for w in words:
+        Prev = 'q_0'
+        for c in w:
+            Next = 'q_' + str(Count)
+            Count = Count + 1
+            Lines.append('\t%s -> %s [label="%s"];' % (Prev,Next,c))
+            Prev = Next
+        Finals.append(Prev)
+    with open(path,'w') as f:
+        f.write('digraph keywords {\n\trankdir=LR;\n')
+        f.write('\tnode [shape=point]; qi\n')
+        f.write('\tnode [shape=doublecircle]; %s;\n' % ', '.join(Finals))
+        f.write('\tnode [shape=circle]\n\tqi -> q_0\n')
+        f.write('\n'.join(Lines))
+        f.write('\n}\n')
+
+def writeBlowupNFA(path,n):
+    """
+    Writes the NFA for "the n-th symbol from the end is an 'a'" over {a,b}, 
+    whose DFA has 2^n states.
+
+    Parameters
+    ----------
+    path : str
+        The .gv file to write.
+    n : int
+        The position of the 'a' from the end.
+
+    Returns
+    -------
+    None.
+
+    """
+    with open(path,'w') as f:
+        f.write('digraph blowup {\n\trankdir=LR;\n')
+        f.write('\tnode [shape=point]; qi\n')
+        f.write('\tnode [shape=doublecircle]; q_%d;\n' % n)
+        f.write('\tnode [shape=circle]\n\tqi -> q_0\n')
+        f.write('\tq_0 -> q_0 [label="a,b"];\n\tq_0 -> q_1 [label="a"];\n')
+        for i in range(1,n):
+            f.write('\tq_%d -> q_%d [label="a,b"];\n' % (i,i+1))
+        f.write('}\n')
+
+def benchStorage(args):
+    """
+    Compares dense and sparse DFA construction and storage on keyword NFAs,
+    whose DFAs are mostly transitions to the NULL state.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.sizes are the numbers of keywords.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== storage: keyword DFAs over [a-z0-9]')
+    Dir = tempfile.mkdtemp()
+    for n in args.sizes:
+        Words = randomWords(n)
+        Probes = Words + randomWords(n,seed=1)
+        Path = os.path.join(Dir,'keywords_%d.gv' % n)
+        writeKeywordNFA(Path,Words)
+        N = automata.NFA(Path)
+        for Sparse in [False,True]:
+            Start = time.perf_counter()
+            D = N.toDFA(Sparse)
+            Built = time.perf_counter() - Start
+            print('%6d words  construct %-6s %8.3f s  %7d deltas' % (n,'sparse' if Sparse else 'dense',Built,len(D.getDeltas())))
+            del D
+        D = N.toDFA(True)
+        for Mode in ['dense','sparse','auto']:
+            D.setStorage(Mode)
+            Start = time.perf_counter()
+            Chars = 0
+            for w in Probes:
+                D.accepts(w)
+                Chars = Chars + len(w)
+            Elapsed = time.perf_counter() - Start
+            print('%6d words  %-6s table %10d bytes  %8.2f Mchar/s  %s' % (n,Mode,D.tableSize(),Chars/Elapsed/1e6,D.getStorage()))
+        del D
+        del N
+        os.remove(Path)
+    os.rmdir(Dir)
+
+def benchCompile(args):
+    """
+    Compares matching with compiled DFAs (see DFA.compile()) against the 
+    table-driven DFA.accepts() on keyword DFAs and on the blow-up DFA for n=8 
+    (see writeBlowupNFA()), which never dies and so reads whole strings.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.sizes are the numbers of keywords.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== compile: generated Python matchers vs. table-driven accepts()')
+    Dir = tempfile.mkdtemp()
+    Rand = random.Random(0)
+    Cases = []
+    for n in args.sizes:
+        Words = randomWords(n)
+        Cases.append(('%d words' % n,writeKeywordNFA,Words,Words + randomWords(n,seed=1)))
+    Cases.append(('blow-up n=8',writeBlowupNFA,8,[''.join(Rand.choice('ab') for i in range(1000)) for j in range(200)]))
+    for Name, Write, Arg, Probes in Cases:
+        Path = os.path.join(Dir,'compile.gv')
+        Write(Path,Arg)
+        D = automata.NFA(Path).toDFA(True)
+        D.reduce()
+        Start = time.perf_counter()
+        Match = D.compile(os.path.join(Dir,'cache'))
+        Built = time.perf_counter() - Start
+        Start = time.perf_counter()
+        D.compile(os.path.join(Dir,'cache'))
+        Cached = time.perf_counter() - Start
+        Chars = sum(len(i) for i in Probes)
+        Rates = []
+        for Function in [D.accepts,Match]:
+            Start = time.perf_counter()
+            for r in range(5):
+                Result = [Function(i) for i in Probes]
+            Rates.append(5*Chars/(time.perf_counter() - Start)/1e6)
+        assert Result == [D.accepts(i) for i in Probes]
+        print('%-12s %6d states  compile %6.3f s (cached %6.3f s)  accepts %6.2f Mchar/s  compiled %6.2f Mchar/s' % (Name,len(D.getStates()),Built,Cached,Rates[0],Rates[1]))
+        os.remove(Path)
+        del D
+    for i in os.listdir(os.path.join(Dir,'cache')):
+        os.remove(os.path.join(Dir,'cache',i))
+    os.rmdir(os.path.join(Dir,'cache'))
+    os.rmdir(Dir)
+
+def benchDot(args):
+    """
+    Times the DOT writer on synthetic automata with size*1000 transitions 
+    spread over size*100 states, for each of args.sizes.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== dot: streaming DOT export')
+    Rand = random.Random(0)
+    for n in args.sizes:
+        States = ['q_' + str(i) for i in range(n*100)]
+        Deltas = [[Rand.choice(States),Rand.choice(string.ascii_lowercase),Rand.choice(States)] for i in range(n*1000)]
+        with open(os.devnull,'w') as f:
+            Start = time.perf_counter()
+            automata._writeDot(f,'bench',States,Deltas,States[:10])
+            Elapsed = time.perf_counter() - Start
+        print('%8d deltas  write %8.3f s' % (len(Deltas),Elapsed))
+
+def benchInclusion(args):
+    """
+    Times the antichain inclusion and universality checks (see 
+    NFA.findCounterexample()) against determinizing the NFAs, for each n of 
+    args.blowup (and twice the largest): "the n-th character from the end is 
+    an 'a'" is included in "an 'a' is among the last n characters" (but not 
+    the other way around), and adding "no 'a' among the last n characters" 
+    to the latter makes it universal.  
+    Determinization is skipped above n=16.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.blowup are the values of n.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== inclusion: antichain checks vs. determinization')
+    Other = '[\\u0000-`b-\\U0010FFFF]'
+    for n in args.blowup + [2*max(args.blowup)]:
+        States = ['q_%d' % i for i in range(n + 1)]
+        Deltas = [['q_0','a','q_0'],['q_0',Other,'q_0'],['q_0','a','q_1']]
+        for i in range(1,n):
+            Deltas = Deltas + [[States[i],'a',States[i + 1]],[States[i],Other,States[i + 1]]]
+        Blowup = automata.NFA.fromComponents(States,['a',Other],Deltas,[States[n]])
+        Window = automata.NFA.fromComponents(States,['a',Other],Deltas,States[1:])
+        #strings with no 'a' among the last n characters (w_, r_), or shorter 
+        #ones (s_), complete the window to every string.
+        Deltas = [[i[0].replace('q_','w_'),i[1],i[2].replace('q_','w_')] for i in Deltas]
+        Deltas = Deltas + [['q_0','\u03BB','w_0'],['q_0','\u03BB','s_0'],['w_0','\u03BB','r_0']]
+        for i in range(n):
+            Deltas = Deltas + [['r_%d' % i,Other,'r_%d' % (i + 1)],['s_%d' % i,Other,'s_%d' % (i + 1)]]
+        Union = automata.NFA.fromComponents(sorted(set(i[0] for i in Deltas) | set(i[2] for i in Deltas)),['a',Other,'\u03BB'],
+                                            Deltas,['w_%d' % i for i in range(1,n + 1)] + ['r_%d' % n] + ['s_%d' % i for i in range(n)])
+        Start = time.perf_counter()
+        Included = Blowup.includedIn(Window)
+        Inclusion = time.perf_counter() - Start
+        Start = time.perf_counter()
+        Counterexample = Window.findCounterexample(Blowup)
+        Search = time.perf_counter() - Start
+        Start = time.perf_counter()
+        Universal = Union.isUniversal()
+        Universality = time.perf_counter() - Start
+        Line = 'n=%2d  includedIn %-5s %8.3f s  converse %r %8.3f s  isUniversal %-5s %8.3f s' % (n,Included,Inclusion,Counterexample,Search,Universal,Universality)
+        if n <= 16:
+            Start = time.perf_counter()
+            D = Blowup.toDFA(True)
+            D = Window.toDFA(True)
+            D = Union.toDFA(True)
+            Line = Line + '  toDFA (all three) %8.3f s' % (time.perf_counter() - Start)
+            del D
+        print(Line)
+
+def benchMemory(args):
+    """
+    Tracks peak memory (with tracemalloc) through loading a keyword NFA with 
+    size*4 words, toDFA(), reduce() and DOT export, for each of args.sizes, 
+    along with the memoryReport() of the NFA and the DFA.  The results are 
+    written as JSON to args.json, or printed if it is not given.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== memory: peak memory per stage')
+    Dir = tempfile.mkdtemp()
+    Results = []
+    for n in args.sizes:
+        Words = randomWords(n*4)
+        Path = os.path.join(Dir,'keywords_%d.gv' % n)
+        writeKeywordNFA(Path,Words)
+        Stages = {}
+        tracemalloc.start()
+        for Stage in ['load','toDFA','reduce','export']:
+            tracemalloc.reset_peak()
+            Base = tracemalloc.get_traced_memory()[0]
+            Start = time.perf_counter()
+            if Stage == 'load':
+                N = automata.NFA(Path)
+            elif Stage == 'toDFA':
+                D = N.toDFA(True)
+            elif Stage == 'reduce':
+                D.reduce()
+            else:
+                D.writeDot(os.devnull)
+            Elapsed = time.perf_counter() - Start
+            Current, Peak = tracemalloc.get_traced_memory()
+            Stages[Stage] = {'seconds':Elapsed,'retained':Current - Base,'peak':Peak - Base}
+        tracemalloc.stop()
+        Results.append({'words':len(Words),'nfaStates':len(N.getStates()),'dfaStates':len(D.getStates()),
+                        'stages':Stages,'nfa':N.memoryReport(),'dfa':D.memoryReport()})
+        print('%6d words  ' % len(Words) + '  '.join('%s peak %9d bytes' % (i,Stages[i]['peak']) for i in Stages))
+        del D
+        del N
+        os.remove(Path)
+    os.rmdir(Dir)
+    Report = json.dumps({'benchmark':'memory','python':platform.python_version(),'results':Results},indent=2)
+    if args.json is None:
+        print(Report)
+    else:
+        with open(args.json,'w') as f:
+            f.write(Report + '\n')
+
+def benchNFAReduce(args):
+    """
+    Measures NFA reduction (see NFA.reduce()): states before and after, and 
+    the sparse subset construction time without and with it, on keyword NFAs, 
+    the blow-up NFAs (see writeBlowupNFA()) and the NFAs in ./testGraphs.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.sizes are the numbers of keywords and 
+        args.blowup the values of n.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== nfareduce: bisimulation reduction before subset construction')
+    Dir = tempfile.mkdtemp()
+    Corpus = []
+    for n in args.sizes:
+        Path = os.path.join(Dir,'keywords_%d.gv' % n)
+        writeKeywordNFA(Path,randomWords(n))
+        Corpus.append(('%d words' % n,Path))
+    for n in args.blowup:
+        Path = os.path.join(Dir,'blowup_%d.gv' % n)
+        writeBlowupNFA(Path,n)
+        Corpus.append(('blow-up n=%d' % n,Path))
+    for i in sorted(os.listdir('./testGraphs')):
+        if i.startswith('nfa_'):
+            Corpus.append((i,os.path.join('./testGraphs',i)))
+    Total = [0,0,0.0,0.0]
+    for Name, Path in Corpus:
+        N = automata.NFA(Path)
+        Before = len(N.getStates())
+        Start = time.perf_counter()
+        D = N.toDFA(True)
+        Plain = time.perf_counter() - Start
+        Start = time.perf_counter()
+        N.reduce()
+        Reduce = time.perf_counter() - Start
+        Start = time.perf_counter()
+        R = N.toDFA(True)
+        Reduced = time.perf_counter() - Start
+        print('%-14s %7d -> %7d states  reduce %7.3f s  toDFA %7.3f s -> %7.3f s  (%d -> %d DFA states)' % (Name,Before,len(N.getStates()),Reduce,Plain,Reduced,len(D.getStates()),len(R.getStates())))
+        Total = [Total[0]+Before,Total[1]+len(N.getStates()),Total[2]+Plain,Total[3]+Reduce+Reduced]
+        del D
+        del R
+        del N
+        if Path.startswith(Dir):
+            os.remove(Path)
+    os.rmdir(Dir)
+    print('%-14s %7d -> %7d states  toDFA %7.3f s -> reduce + toDFA %7.3f s' % ('total',Total[0],Total[1],Total[2],Total[3]))
+
+def benchReduce(args):
+    """
+    Times DFA minimization with the NumPy and plain Python backends on the 
+    blow-up DFAs (see writeBlowupNFA()), which are already minimal and so take 
+    the most refinement rounds.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.blowup are the values of n.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== reduce: Moore minimization backends')
+    Dir = tempfile.mkdtemp()
+    for n in args.blowup:
+        Path = os.path.join(Dir,'blowup_%d.gv' % n)
+        writeBlowupNFA(Path,n)
+        N = automata.NFA(Path)
+        for Backend in ['numpy','python']:
+            D = N.toDFA()
+            Start = time.perf_counter()
+            D.reduce(Backend)
+            Elapsed = time.perf_counter() - Start
+            print('n=%2d  %7d states  %-6s %8.3f s' % (n,len(D.getStates()),Backend,Elapsed))
+            del D
+        del N
+        os.remove(Path)
+    os.rmdir(Dir)
+
+def benchSimulate(args):
+    """
+    Times direct NFA simulation of random strings on the blow-up NFAs (see 
+    writeBlowupNFA()) with size*10 states: bit-parallel NumPy lock-step versus 
+    one string at a time with Python int bit sets.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== simulate: NFA simulation of 1000 strings of length 100')
+    Dir = tempfile.mkdtemp()
+    Rand = random.Random(0)
+    Strings = [''.join(Rand.choice('ab') for i in range(100)) for j in range(1000)]
+    for n in args.sizes:
+        Path = os.path.join(Dir,'blowup_%d.gv' % (n*10))
+        writeBlowupNFA(Path,n*10)
+        N = automata.NFA(Path)
+        Sim = N.simulator()
+        Start = time.perf_counter()
+        Batch = Sim.acceptsMany(Strings)
+        Lockstep = time.perf_counter() - Start
+        Start = time.perf_counter()
+        Single = [Sim._NFASimulator__acceptsOne(i) for i in Strings]
+        Serial = time.perf_counter() - Start
+        assert Batch == Single
+        print('%5d states  lock-step %8.3f s  one-by-one %8.3f s' % (n*10+1,Lockstep,Serial))
+        del N
+        os.remove(Path)
+    os.rmdir(Dir)
+
+def benchSample(args):
+    """
+    Times drawing random accepted strings (see DFA.sample()) and enumerating 
+    them in shortlex order (see DFA.enumerate()), on word DFAs for args.sizes 
+    thousands of words and on the blow-up DFAs (see writeBlowupNFA()).
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== sample: uniform sampling and shortlex enumeration of accepted strings')
+    Dir = tempfile.mkdtemp()
+    Cases = []
+    for n in args.sizes:
+        Cases.append(('%d words' % (n*1000),automata.DFA.fromWords(randomWords(n*1000)),8))
+    for n in args.blowup:
+        Path = os.path.join(Dir,'blowup.gv')
+        writeBlowupNFA(Path,n)
+        Cases.append(('blow-up n=%d' % n,automata.NFA(Path).toDFA(True),2*n))
+        os.remove(Path)
+    os.rmdir(Dir)
+    Rng = random.Random(0)
+    for Name, D, Length in Cases:
+        Start = time.perf_counter()
+        D.sample(1,Length,Rng)
+        Setup = time.perf_counter() - Start
+        Start = time.perf_counter()
+        D.sample(100000,Length,Rng)
+        Draw = time.perf_counter() - Start - Setup
+        Start = time.perf_counter()
+        Strings = D.enumerate()
+        for i in range(100000):
+            next(Strings,None)
+        Walk = time.perf_counter() - Start
+        print('%-14s length %2d  setup %7.3f s  %6.2f M samples/min  %6.2f M enumerated/min' %
+              (Name,Length,Setup,6/max(Draw,1e-9),6/Walk))
+
+def benchScan(args):
+    """
+    Times scanning one long random string over {a,b} with the blow-up DFAs 
+    (see writeBlowupNFA()): a single sequential run versus speculative chunks 
+    with different numbers of worker processes.  The DFAs never die, and 
+    speculative runs converge after n characters.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.sizes are the string lengths (in 100000s 
+        of characters) and args.workers the worker counts.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== scan: one string, n=8 blow-up DFA (%d CPUs)' % os.cpu_count())
+    Dir = tempfile.mkdtemp()
+    Path = os.path.join(Dir,'blowup_8.gv')
+    writeBlowupNFA(Path,8)
+    N = automata.NFA(Path)
+    D = N.toDFA(True)
+    D.reduce()
+    Shared = D.toSharedMemory()
+    Rand = random.Random(0)
+    for n in args.sizes:
+        Text = ''.join(Rand.choice('ab') for i in range(n*100000))
+        Start = time.perf_counter()
+        Expected = Shared.scan(Text,1,len(Text))
+        Serial = time.perf_counter() - Start
+        print('%9d chars  sequential          %8.3f s  %8d matches' % (len(Text),Serial,len(Expected[1])))
+        for w in args.workers:
+            Start = time.perf_counter()
+            Result = Shared.scan(Text,w,max(1,len(Text) // (4*w)))
+            Elapsed = time.perf_counter() - Start
+            assert Result[0] == Expected[0] and Result[1] == Expected[1]
+            print('%9d chars  %2d workers speculative %8.3f s  speed-up %5.2f' % (len(Text),w,Elapsed,Serial/Elapsed))
+    Shared.close()
+    Shared.unlink()
+    del D
+    del N
+    os.remove(Path)
+    os.rmdir(Dir)
+
+def benchShared(args):
+    """
+    Times matching random strings against keyword DFAs through a shared 
+    memory table with different numbers of worker processes.  The table is 
+    built once; each worker attaches to it instead of holding a copy.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args; args.sizes are the numbers of keywords and 
+        args.workers the worker counts.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== shared: process-pool matching of 100000 strings (%d CPUs)' % os.cpu_count())
+    Dir = tempfile.mkdtemp()
+    Rand = random.Random(0)
+    for n in args.sizes:
+        Words = randomWords(n)
+        Probes = [Rand.choice(Words) if Rand.random() < 0.5 else w for w in randomWords(100000,seed=1)]
+        Path = os.path.join(Dir,'keywords_%d.gv' % n)
+        writeKeywordNFA(Path,Words)
+        N = automata.NFA(Path)
+        D = N.toDFA(True)
+        D.reduce()
+        Shared = D.toSharedMemory()
+        Start = time.perf_counter()
+        Expected = [D.accepts(i) for i in Probes]
+        Serial = time.perf_counter() - Start
+        print('%6d words  %7d states  FrozenDFA  %8.3f s' % (n,len(D.getStates()),Serial))
+        for w in args.workers:
+            Start = time.perf_counter()
+            Result = Shared.acceptsMany(Probes,w)
+            Elapsed = time.perf_counter() - Start
+            assert Result == Expected
+            print('%6d words  %7d states  %2d workers %8.3f s' % (n,len(D.getStates()),w,Elapsed))
+        Shared.close()
+        Shared.unlink()
+        del D
+        del N
+        os.remove(Path)
+    os.rmdir(Dir)
+
+def benchUpdate(args):
+    """
+    Compares updating a large minimal DFA in place (see DFA.addWords() and 
+    DFA.removeWords()) against rebuilding it from the whole word list (see 
+    DFA.fromWords()), for args.sizes thousands of words.  The first update 
+    also builds the update index; later ones reuse it.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== update: in-place word updates vs. rebuilding with fromWords()')
+    for n in args.sizes:
+        Words = randomWords(n*1000)
+        Extra = [i for i in randomWords(1000,seed=1) if i not in set(Words)]
+        D = automata.DFA.fromWords(Words)
+        Start = time.perf_counter()
+        D.addWords(Extra[:1])
+        First = time.perf_counter() - Start
+        Current = set(Words) | set(Extra[:1])
+        Times = []
+        for i in range(1,len(Extra),100):
+            Start = time.perf_counter()
+            D.addWords(Extra[i:i + 50])
+            D.removeWords(Words[i:i + 50])
+            Times.append(time.perf_counter() - Start)
+            Current = (Current | set(Extra[i:i + 50])) - set(Words[i:i + 50])
+        Start = time.perf_counter()
+        R = automata.DFA.fromWords(sorted(Current))
+        Rebuild = time.perf_counter() - Start
+        print('%8d words  %8d states  first update %7.3f s  100-word update %7.4f s  rebuild %7.3f s (%d states)' %
+              (n*1000,len(D.getStates()),First,sorted(Times)[len(Times)//2],Rebuild,len(R.getStates())))
+        del D, R
+
+def benchWords(args):
+    """
+    Compares building the minimal DFA of a sorted word list directly (see 
+    DFA.fromWords()) against the keyword NFA route (write .gv, NFA(), toDFA(), 
+    reduce()), for args.sizes thousands of words.  The NFA route is skipped 
+    above 2000 words (loading the .gv file is quadratic).
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line args.
+
+    Returns
+    -------
+    None.
+
+    """
+    print('== words: minimal DFAs from sorted word lists')
+    Dir = tempfile.mkdtemp()
+    for n in args.sizes:
+        Words = randomWords(n*1000)
+        Start = time.perf_counter()
+        D = automata.DFA.fromWords(Words)
+        Direct = time.perf_counter() - Start
+        Line = '%8d words  %8d states  fromWords %8.3f s' % (len(Words),len(D.getStates()),Direct)
+        if len(Words) <= 2000:
+            Path = os.path.join(Dir,'words.gv')
+            Start = time.perf_counter()
+            writeKeywordNFA(Path,Words)
+            R = automata.NFA(Path).toDFA(True)
+            R.reduce()
+            Line = Line + '  NFA route %8.3f s (%d states)' % (time.perf_counter() - Start,len(R.getStates()))
+            os.remove(Path)
+            del R
+        print(Line)
+        del D
+    os.rmdir(Dir)
+
+def main():
+    """
+    Main function that gathers command line args, and runs the benchmarks.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks for the NFA and DFA classes.')
+    parser.add_argument('-s','--sizes',action='store',type=int,nargs='+',default=[25,50,100],help='the synthetic automaton sizes to benchmark')
+    parser.add_argument('-n','--blowup',action='store',type=int,nargs='+',default=[14,16],help='the blow-up NFA sizes')
+    parser.add_argument('-w','--workers',action='store',type=int,nargs='+',default=[1,2,4],help='the worker counts for the multi-process benchmarks')
+    parser.add_argument('-j','--json',action='store',default=None,help='the file the memory benchmark writes its JSON results to')
+    parser.add_argument('-b','--bench',action='store',nargs='+',choices=sorted(BENCHMARKS),default=sorted(BENCHMARKS),help='the benchmarks to run')
+    args = parser.parse_args()
+    for i in args.bench:
+        BENCHMARKS[i](args)
+
+BENCHMARKS = {'compile':benchCompile,'dot':benchDot,'inclusion':benchInclusion,'memory':benchMemory,'nfareduce':benchNFAReduce,'reduce':benchReduce,'sample':benchSample,'scan':benchScan,'shared':benchShared,'simulate':benchSimulate,'storage':benchStorage,'update':benchUpdate,'words':benchWords}
+
+if __name__ == '__main__':
+    main()
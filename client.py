@@ -0,0 +1,110 @@
+"""
+    Program for converting NFAs to DFAs.
+    Copyright (C) 2021  Jim Leon
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#! /usr/bin/python3
+
+"""
+Thin command line client for the conversion server (see server.py).  Jobs are
+sent over the server's Unix domain socket as one JSON object per line, and each
+gets one JSON object per line back.  Only the standard library is imported, so
+a job costs the interpreter startup and a round trip, not the networkx and
+graphviz imports.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+#The socket the server listens on, unless AUTOMATA_SOCKET says otherwise.
+SOCKET = os.environ.get('AUTOMATA_SOCKET',os.path.join(tempfile.gettempdir(),'automata-%d.sock' % os.getuid()))
+
+def request(message,path=SOCKET):
+    """
+    Sends one job to the server and waits for its reply.
+
+    Parameters
+    ----------
+    message : dict
+        The job; 'op' names it (see server.py), and file names in it should be
+        absolute, since the server does not share the caller's directory.
+    path : str, optional
+        The server socket.  The default is SOCKET.
+
+    Returns
+    -------
+    dict
+        The reply.  'ok' is False, and 'error' says why, if the job failed.
+
+    """
+    with socket.socket(socket.AF_UNIX,socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        Chunks = []
+        while not Chunks or not Chunks[-1].endswith(b'\n'):
+            Chunk = s.recv(1 << 16)
+            if not Chunk:
+                break
+            Chunks.append(Chunk)
+    return json.loads(b''.join(Chunks))
+
+def main():
+    """
+    Main function that gathers command line args, sends the job, and prints
+    the reply.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(description='Client for the NFA to DFA conversion server.')
+    parser.add_argument('--socket',action='store',default=SOCKET,help='the server socket (default: %(default)s)')
+    Commands = parser.add_subparsers(dest='op',required=True)
+    for i in ['convert','minimize']:
+        Command = Commands.add_parser(i,help='%s an NFA (.gv) file' % i)
+        Command.add_argument('NFA',action='store',type=str,help='the NFA file (as a .gv filetype)')
+        Command.add_argument('-o','--output',action='store',default=None,help='the .gv file to write the DFA to')
+        Command.add_argument('-f','--full',action='store_true',help='keep the trap and NULL states')
+    Command = Commands.add_parser('match',help='match strings against the minimal DFA of an NFA file')
+    Command.add_argument('NFA',action='store',type=str,help='the NFA file (as a .gv filetype)')
+    Command.add_argument('strings',action='store',nargs='*',help='the strings (default: one per line of stdin)')
+    for i, Help in [('ping','check that the server is up'),('stats','show the server cache counters'),('shutdown','stop the server')]:
+        Commands.add_parser(i,help=Help)
+    args = parser.parse_args()
+    Message = {'op':args.op}
+    if args.op in ['convert','minimize','match']:
+        Message['path'] = os.path.abspath(args.NFA)
+    if args.op in ['convert','minimize']:
+        Message['full'] = args.full
+        if args.output is not None:
+            Message['output'] = os.path.abspath(args.output)
+    if args.op == 'match':
+        Message['strings'] = args.strings if args.strings else sys.stdin.read().splitlines()
+    Reply = request(Message,args.socket)
+    if not Reply.get('ok'):
+        sys.exit('error: %s' % Reply.get('error'))
+    if args.op == 'match':
+        for i in range(len(Message['strings'])):
+            print('%s\t%s' % ('accept' if Reply['results'][i] else 'reject',Message['strings'][i]))
+    else:
+        print(json.dumps(Reply,indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+"""
+    Program for converting NFAs to DFAs.
+    Copyright (C) 2021  Jim Leon
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#! /usr/bin/python3
+
+"""
+Long-lived conversion server.  The automata module (with networkx and graphviz)
+is imported once, and the DFAs built from each NFA file are kept in memory,
+along with their compiled matchers (see DFA.compile()), until the file changes.
+Jobs arrive over a Unix domain socket as one JSON object per line, and each
+gets one JSON object per line back (see client.py):
+
+    {"op": "convert", "path": ..., "full": false, "output": ...}
+    {"op": "minimize", "path": ..., "full": false, "output": ...}
+    {"op": "match", "path": ..., "strings": [...]}
+    {"op": "ping"}, {"op": "stats"}, {"op": "shutdown"}
+
+'convert' builds the DFA of the NFA file (sparse, or with the trap and NULL
+states if 'full'), 'minimize' also reduces it, and both write it to 'output'
+(a .gv file) if given.  'match' runs the strings through the minimal DFA.
+Subset construction and minimization run in a bounded process pool, so the
+server keeps answering while they do.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import automata
+from client import SOCKET
+
+#Most DFAs kept in memory; the least recently used one is dropped first.
+CACHE_SIZE = 64
+#Minimal DFAs with at most this many states are matched with compiled code
+#(see DFA.compile()); larger ones with their transition table.
+COMPILE_STATES = 5000
+
+def _convert(path,minimize,full):
+    """
+    Builds the DFA of an NFA file, in a pool process.
+
+    Parameters
+    ----------
+    path : str
+        The NFA (.gv) file.
+    minimize : bool
+        If True, the DFA is reduced.
+    full : bool
+        If True, the trap and NULL states are kept.
+
+    Returns
+    -------
+    tuple
+        The States, Alphabet, Delta-transitions and final states of the DFA.
+
+    """
+    N = automata.NFA(path)
+    if full:
+        D = N.toDFA()
+        D.trim(removeDead=False)
+    else:
+        D = N.toDFA(sparse=True)
+    if minimize:
+        D.reduce()
+    return D.getStates(), D.getAlphabet(), D.getDeltas(), D.getFinalStates()
+
+class Server:
+    """Class representing the conversion server."""
+    __slots__ = ('__Path','__Workers','__Size','__Cache','__Pending','__Pool','__Stop','__Ready','__Counts','__Started','__Connections')
+
+    def __init__(self,path=SOCKET,workers=2,cache=CACHE_SIZE):
+        """
+        Constructor for the Server.
+
+        Parameters
+        ----------
+        path : str, optional
+            The socket to listen on.  The default is SOCKET.
+        workers : int, optional
+            The number of pool processes for subset construction and
+            minimization.  The default is 2.
+        cache : int, optional
+            The most DFAs kept in memory.  The default is CACHE_SIZE.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__Path = path
+        self.__Workers = workers
+        self.__Size = cache
+        #DFAs (and their matchers) by file, modification time, size and options, oldest first.
+        self.__Cache = {}
+        self.__Pending = {}
+        self.__Connections = set()
+        self.__Pool = None
+        self.__Stop = None
+        self.__Ready = threading.Event()
+        self.__Counts = {'jobs':0,'hits':0,'misses':0,'errors':0}
+        self.__Started = time.time()
+
+    def ready(self,timeout=None):
+        """
+        Waits until the server accepts connections.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The most seconds to wait.  The default is None (no limit).
+
+        Returns
+        -------
+        bool
+            True if the server is accepting connections.  False otherwise.
+
+        """
+        return self.__Ready.wait(timeout)
+
+    def run(self):
+        """
+        Serves jobs until a 'shutdown' job (or, in the main thread, SIGINT or
+        SIGTERM) arrives, then removes the socket.
+
+        Returns
+        -------
+        None.
+
+        """
+        asyncio.run(self.__serve())
+
+    async def __serve(self):
+        """
+        Opens the socket and the process pool, and serves until stopped.
+
+        Returns
+        -------
+        None.
+
+        """
+        if os.path.exists(self.__Path):
+            with socket.socket(socket.AF_UNIX,socket.SOCK_STREAM) as s:
+                try:
+                    s.connect(self.__Path)
+                except OSError:
+                    os.unlink(self.__Path)
+                else:
+                    raise RuntimeError('a server is already listening on %s' % self.__Path)
+        self.__Stop = asyncio.Event()
+        if threading.current_thread() is threading.main_thread():
+            for i in [signal.SIGINT,signal.SIGTERM]:
+                asyncio.get_running_loop().add_signal_handler(i,self.__Stop.set)
+        self.__Pool = concurrent.futures.ProcessPoolExecutor(self.__Workers)
+        Listener = await asyncio.start_unix_server(self.__handle,self.__Path,limit=1 << 26)
+        try:
+            self.__Ready.set()
+            await self.__Stop.wait()
+        finally:
+            self.__Ready.clear()
+            Listener.close()
+            await Listener.wait_closed()
+            #connections still open (or not yet seen to be closed) are dropped.
+            for i in self.__Connections:
+                i.cancel()
+            await asyncio.gather(*self.__Connections,return_exceptions=True)
+            self.__Pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.__Path):
+                os.unlink(self.__Path)
+
+    async def __handle(self,reader,writer):
+        """
+        Answers the jobs sent over one connection, in order.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            The incoming side of the connection.
+        writer : asyncio.StreamWriter
+            The outgoing side of the connection.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__Connections.add(asyncio.current_task())
+        try:
+            while not self.__Stop.is_set():
+                Line = await reader.readline()
+                if not Line:
+                    break
+                self.__Counts['jobs'] = self.__Counts['jobs'] + 1
+                Start = time.perf_counter()
+                try:
+                    Message = json.loads(Line)
+                    Reply = await self.__dispatch(Message)
+                except Exception as e:
+                    self.__Counts['errors'] = self.__Counts['errors'] + 1
+                    Reply = {'ok':False,'error':'%s: %s' % (type(e).__name__,e)}
+                Reply['seconds'] = time.perf_counter() - Start
+                writer.write(json.dumps(Reply).encode('utf-8') + b'\n')
+                await writer.drain()
+                if Reply['ok'] and Message['op'] == 'shutdown':
+                    self.__Stop.set()
+        except (ConnectionError,asyncio.CancelledError):
+            pass
+        finally:
+            self.__Connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def __dispatch(self,message):
+        """
+        Runs one job.
+
+        Parameters
+        ----------
+        message : dict
+            The job (see the module documentation).
+
+        Returns
+        -------
+        dict
+            The reply.
+
+        """
+        Op = message['op']
+        if Op == 'ping':
+            return {'ok':True,'pid':os.getpid()}
+        if Op == 'stats':
+            Reply = {'ok':True,'entries':len(self.__Cache),'workers':self.__Workers,'uptime':time.time() - self.__Started}
+            Reply.update(self.__Counts)
+            return Reply
+        if Op == 'shutdown':
+            return {'ok':True}
+        if Op in ['convert','minimize']:
+            Entry, Cached = await self.__entry(message['path'],Op == 'minimize',bool(message.get('full',False)))
+            D = Entry['DFA']
+            Reply = {'ok':True,'cached':Cached,'states':len(D.getStates()),'finals':len(D.getFinalStates()),
+                     'deltas':len(D.getDeltas())}
+            if message.get('output') is not None:
+                await asyncio.to_thread(D.writeDot,message['output'])
+                Reply['output'] = message['output']
+            return Reply
+        if Op == 'match':
+            Entry, Cached = await self.__entry(message['path'],True,False)
+            Results = await asyncio.to_thread(self.__match,Entry,message['strings'])
+            return {'ok':True,'cached':Cached,'results':Results}
+        raise ValueError('unknown op %r' % Op)
+
+    async def __entry(self,path,minimize,full):
+        """
+        Finds the DFA of an NFA file in the cache, or builds it in the process
+        pool.  Jobs for a DFA that is being built wait for that build.
+
+        Parameters
+        ----------
+        path : str
+            The NFA (.gv) file.
+        minimize : bool
+            If True, the DFA is reduced.
+        full : bool
+            If True, the trap and NULL states are kept.
+
+        Returns
+        -------
+        dict
+            The cache entry: the 'DFA' and its 'Matcher' (None until first
+            used).
+        bool
+            True if the entry was already in the cache.
+
+        """
+        Stat = os.stat(path)
+        Key = (os.path.realpath(path),Stat.st_mtime_ns,Stat.st_size,minimize,full)
+        if Key in self.__Cache:
+            self.__Counts['hits'] = self.__Counts['hits'] + 1
+            Entry = self.__Cache.pop(Key)
+            self.__Cache[Key] = Entry
+            return Entry, True
+        self.__Counts['misses'] = self.__Counts['misses'] + 1
+        if Key not in self.__Pending:
+            self.__Pending[Key] = asyncio.ensure_future(self.__build(Key))
+        try:
+            return await asyncio.shield(self.__Pending[Key]), False
+        finally:
+            if Key in self.__Pending and self.__Pending[Key].done():
+                del self.__Pending[Key]
+
+    async def __build(self,key):
+        """
+        Builds a cache entry in the process pool, and adds it to the cache.
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key: file, modification time, size, minimize and full.
+
+        Returns
+        -------
+        dict
+            The cache entry (see __entry()).
+
+        """
+        Loop = asyncio.get_running_loop()
+        Pool = self.__Pool
+        try:
+            Components = await Loop.run_in_executor(Pool,_convert,key[0],key[3],key[4])
+        except concurrent.futures.process.BrokenProcessPool:
+            #a pool process died (e.g. out of memory); later jobs get a new pool, 
+            #once, however many jobs the broken one failed.
+            if self.__Pool is Pool:
+                Pool.shutdown(wait=False,cancel_futures=True)
+                self.__Pool = concurrent.futures.ProcessPoolExecutor(self.__Workers)
+            raise
+        Entry = {'DFA':await asyncio.to_thread(automata.DFA.fromComponents,*Components),'Matcher':None}
+        self.__Cache[key] = Entry
+        while len(self.__Cache) > self.__Size:
+            del self.__Cache[next(iter(self.__Cache))]
+        return Entry
+
+    def __match(self,entry,strings):
+        """
+        Matches strings against a cache entry's DFA, compiling its matcher on
+        first use.
+
+        Parameters
+        ----------
+        entry : dict
+            The cache entry (see __entry()).
+        strings : List
+            The strings.
+
+        Returns
+        -------
+        List
+            True for each string the DFA accepts.  False otherwise.
+
+        """
+        if entry['Matcher'] is None:
+            D = entry['DFA']
+            entry['Matcher'] = D.compile() if len(D.getStates()) <= COMPILE_STATES else D.snapshot().accepts
+        Matcher = entry['Matcher']
+        return [Matcher(i) for i in strings]
+
+def main():
+    """
+    Main function that gathers command line args, and runs the server.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(description='Server that keeps NFA to DFA conversions warm, for client.py.')
+    parser.add_argument('--socket',action='store',default=SOCKET,help='the socket to listen on (default: %(default)s)')
+    parser.add_argument('-w','--workers',action='store',type=int,default=2,help='the pool processes for conversions (default: %(default)s)')
+    parser.add_argument('--cache',action='store',type=int,default=CACHE_SIZE,help='the most DFAs kept in memory (default: %(default)s)')
+    args = parser.parse_args()
+    Server(args.socket,args.workers,args.cache).run()
+
+if __name__ == '__main__':
+    main()
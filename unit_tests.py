@@ -23,8 +23,19 @@ Created on Fri Feb 26 19:34:34 2021
 
 @author: jimleon
 """
+import concurrent.futures
+import io
+import itertools
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
 import automata
+import client
+import server
 
 class Test_Automatons_NFA_getStates(unittest.TestCase):
     
@@ -151,6 +162,13 @@ class Test_Automatons_NFA_getAlphabet(unittest.TestCase):
         for i in range(len(ActSyms)):
             self.assertEqual(Syms[i],ActSyms[i])
         del NFA
+        
+    def test_nfa9(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        Syms = NFA.getAlphabet()
+        ActSyms = ['[0-9]','[a-f]','[a-zA-Z0-9_]','[a-zA-Z_]','x']
+        self.assertEqual(Syms,ActSyms)
+        del NFA
 
 class Test_Automatons_NFA_getDeltas(unittest.TestCase):
         
@@ -231,6 +249,763 @@ class Test_Automatons_DFA_getAlphabet(unittest.TestCase):
         del NFA
         del DFA
         
+    def test_nfa9(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        Alpha = DFA.getAlphabet()
+        ActAlpha = ['[0-9]','[A-Z_g-wy-z]','[a-f]','x']
+        self.assertEqual(Alpha,ActAlpha)
+        del NFA
+        del DFA
+        
+class Test_Automatons_DFA_accepts(unittest.TestCase):
+    
+    def test_nfa1(self):
+        NFA = automata.NFA('./testGraphs/nfa_1.gv')
+        DFA = NFA.toDFA()
+        for i in ['aa','aaa','aaaa','aaaaaa']:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['','a','aaaaa','ab']:
+            self.assertFalse(DFA.accepts(i))
+        del NFA
+        del DFA
+        
+    def test_nfa2(self):
+        NFA = automata.NFA('./testGraphs/nfa_2.gv')
+        DFA = NFA.toDFA()
+        for i in ['','10','1010']:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['1','0','11','101']:
+            self.assertFalse(DFA.accepts(i))
+        del NFA
+        del DFA
+        
+    def test_nfa9(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        for i in ['x','x9f','_id0','Zeta','xff00']:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['','9x','a-b','\u00e9t\u00e9']:
+            self.assertFalse(DFA.accepts(i))
+        del NFA
+        del DFA
+        
+    def test_nfa9_reduced(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        DFA.reduce()
+        for i in ['x','x9f','_id0','Zeta','xff00']:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['','9x','a-b']:
+            self.assertFalse(DFA.accepts(i))
+        del NFA
+        del DFA
+
+
+class Test_Automatons_NFA_accepts(unittest.TestCase):
+    
+    def test_nfa1(self):
+        NFA = automata.NFA('./testGraphs/nfa_1.gv')
+        self.assertTrue(NFA.accepts('aaaa'))
+        self.assertFalse(NFA.accepts('aaaaa'))
+        del NFA
+        
+    def test_nfa8_many(self):
+        NFA = automata.NFA('./testGraphs/nfa_8.gv')
+        DFA = NFA.toDFA()
+        Words = [''.join(i) for n in range(7) for i in itertools.product('ab',repeat=n)]
+        self.assertEqual(NFA.acceptsMany(Words),[DFA.accepts(i) for i in Words])
+        del NFA
+        del DFA
+        
+    def test_nfa9_many(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        Words = ['x','x9f','_id0','Zeta','xff00','','9x','a-b','\u00e9t\u00e9']
+        self.assertEqual(NFA.acceptsMany(Words),[True]*5 + [False]*4)
+        del NFA
+        
+class Test_Automatons_NFA_reduce(unittest.TestCase):
+    
+    def test_nfa2(self):
+        NFA = automata.NFA('./testGraphs/nfa_2.gv')
+        NFA.reduce()
+        self.assertEqual(NFA.getStates(),['q_0','q_1'])
+        self.assertEqual(NFA.getFinalStates(),['q_0'])
+        del NFA
+        
+    def test_nfa8(self):
+        NFA = automata.NFA('./testGraphs/nfa_8.gv')
+        Words = [''.join(j) for n in range(8) for j in itertools.product('ab',repeat=n)]
+        Expected = NFA.acceptsMany(Words)
+        NFA.reduce()
+        self.assertEqual(len(NFA.getStates()),6)
+        self.assertEqual(NFA.acceptsMany(Words),Expected)
+        self.assertEqual(NFA.toDFA().acceptsMany(Words),Expected)
+        del NFA
+        
+class Test_Automatons_NFA_removeLambdas(unittest.TestCase):
+    
+    def test_nfa2(self):
+        NFA = automata.NFA('./testGraphs/nfa_2.gv')
+        Words = [''.join(j) for n in range(7) for j in itertools.product('01',repeat=n)]
+        Expected = NFA.acceptsMany(Words)
+        NFA.removeLambdas()
+        self.assertNotIn('\u03BB',NFA.getAlphabet())
+        self.assertEqual(NFA.getFinalStates(),['q_0'])
+        self.assertEqual(NFA.acceptsMany(Words),Expected)
+        del NFA
+        
+    def test_nfa8(self):
+        NFA = automata.NFA('./testGraphs/nfa_8.gv')
+        Words = [''.join(j) for n in range(8) for j in itertools.product('ab',repeat=n)]
+        Expected = NFA.acceptsMany(Words)
+        NFA.removeLambdas()
+        for i in NFA.getDeltas():
+            self.assertNotEqual(i[1],'\u03BB')
+        self.assertEqual(NFA.toDFA().acceptsMany(Words),Expected)
+        del NFA
+        
+class Test_Automatons_NFA_inclusion(unittest.TestCase):
+    
+    def test_includedIn(self):
+        Keyword = automata.NFA('./testGraphs/nfa_10.gv')
+        Numbers = automata.NFA('./testGraphs/nfa_11.gv')
+        self.assertTrue(Keyword.includedIn(Keyword))
+        self.assertFalse(Keyword.includedIn(Numbers))
+        self.assertEqual(Keyword.findCounterexample(Numbers),'if')
+        DFA = Numbers.toDFA()
+        DFA.reduce()
+        self.assertTrue(Numbers.includedIn(DFA))
+        Counterexample = Numbers.findCounterexample(Keyword)
+        self.assertEqual(len(Counterexample),1)
+        self.assertTrue(Numbers.accepts(Counterexample))
+        del Keyword, Numbers, DFA
+        
+    def test_isUniversal(self):
+        Any = '[\\u0000-\\U0010FFFF]'
+        NFA = automata.NFA.fromComponents(['q_0','q_1'],[Any,'\u03BB'],[['q_0',Any,'q_0'],['q_0','\u03BB','q_1']],['q_1'])
+        self.assertTrue(NFA.isUniversal())
+        self.assertIsNone(NFA.findCounterexample())
+        NFA = automata.NFA('./testGraphs/nfa_11.gv')
+        self.assertFalse(NFA.isUniversal())
+        self.assertEqual(NFA.findCounterexample(),'')
+        del NFA
+        
+    def test_shortest(self):
+        Left = automata.NFA.fromComponents(['q_0','q_1'],['a','b','\u03BB'],
+                                           [['q_0','b','q_1'],['q_0','\u03BB','q_1'],['q_1','a','q_1'],['q_1','b','q_0']],['q_0'])
+        Right = automata.NFA.fromComponents(['q_0','q_1','q_2'],['a','b'],
+                                            [['q_0','a','q_2'],['q_1','a','q_2'],['q_2','b','q_1'],['q_2','b','q_2']],['q_0'])
+        self.assertEqual(Left.findCounterexample(Right),'b')
+        Rand = random.Random(0)
+        for n in range(100):
+            Pair = []
+            for k in range(2):
+                States = ['q_' + str(i) for i in range(Rand.randint(1,4))]
+                Deltas = [[i,j,l] for i in States for j in 'ab\u03BB' for l in States if Rand.random() < 0.25 and (j != '\u03BB' or i != l)]
+                Pair.append(automata.NFA.fromComponents(States,['a','b','\u03BB'],Deltas,[i for i in States if Rand.random() < 0.4]))
+            Counterexample = Pair[0].findCounterexample(Pair[1])
+            Words = [''.join(i) for Length in range(7) for i in itertools.product('ab',repeat=Length)]
+            Accepted = [Pair[0].acceptsMany(Words),Pair[1].acceptsMany(Words)]
+            Shortest = next((Words[i] for i in range(len(Words)) if Accepted[0][i] and not Accepted[1][i]),None)
+            if Shortest is not None:
+                self.assertEqual(len(Counterexample),len(Shortest))
+            if Counterexample is not None:
+                self.assertTrue(Pair[0].accepts(Counterexample) and not Pair[1].accepts(Counterexample))
+        del Left, Right
+        
+class Test_Automatons_memoryReport(unittest.TestCase):
+    
+    def test_nfa(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        Report = NFA.memoryReport()
+        self.assertEqual(sorted(Report),['caches','indexes','states','total','transitions'])
+        self.assertEqual(Report['caches'],0)
+        self.assertEqual(Report['total'],Report['states'] + Report['transitions'] + Report['indexes'])
+        NFA.simulator()
+        self.assertGreater(NFA.memoryReport()['caches'],0)
+        del NFA
+        
+    def test_dfa(self):
+        DFA = automata.DFA.fromWords(['abc','abd','bcd'])
+        Report = DFA.memoryReport()
+        self.assertGreater(Report['states'],0)
+        self.assertGreater(Report['indexes'],0)
+        self.assertEqual(Report['caches'],0)
+        DFA.search('xabcx')
+        self.assertGreater(DFA.memoryReport()['caches'],0)
+        DFA.addWords(['abcabcabc'])
+        self.assertGreater(DFA.memoryReport()['indexes'],Report['indexes'])
+        del DFA
+        
+class Test_Automatons_reverse(unittest.TestCase):
+    
+    def test_nfa6(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Reversed = [NFA.reverse(),DFA.reverse()]
+        for n in range(6):
+            for i in itertools.product('abc',repeat=n):
+                Word = ''.join(i)
+                for j in Reversed:
+                    self.assertEqual(j.accepts(Word),DFA.accepts(Word[::-1]))
+        del NFA
+        del DFA
+        
+    def test_search(self):
+        NFA = automata.NFA('./testGraphs/nfa_11.gv')
+        DFA = NFA.toDFA(sparse=True)
+        self.assertEqual(DFA.search('pi is 3.14159!'),(6,13))
+        self.assertEqual(DFA.search('x = 12. + 3.5'),(4,6))
+        self.assertEqual(DFA.search('no digits'),None)
+        self.assertEqual(DFA.search(''),None)
+        del NFA
+        del DFA
+
+class Test_Automatons_DFA_storage(unittest.TestCase):
+    
+    def test_nfa6_sparse(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA(sparse=True)
+        self.assertNotIn('\u2205',DFA.getStates())
+        for i in DFA.getDeltas():
+            self.assertNotEqual(i[2],'\u2205')
+        del NFA
+        del DFA
+        
+    def test_nfa9_modes(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        Rows = len(DFA.getStates()) - 1
+        for i in ['dense','sparse','auto']:
+            DFA.setStorage(i)
+            Count = DFA.getStorage()
+            self.assertEqual(Count['dense'] + Count['sparse'],Rows)
+            if i != 'auto':
+                self.assertEqual(Count[i],Rows)
+            self.assertTrue(DFA.accepts('x0a'))
+            self.assertTrue(DFA.accepts('ident_9'))
+            self.assertFalse(DFA.accepts('0x'))
+        with self.assertRaises(ValueError):
+            DFA.setStorage('Dense')
+        self.assertEqual(DFA.getStorage()['dense'] + DFA.getStorage()['sparse'],Rows)
+        with self.assertRaises(ValueError):
+            automata.FrozenDFA(DFA.getAlphabet(),DFA.getDeltas(),DFA.getFinalStates(),'compact')
+        del NFA
+        del DFA
+
+class Test_Automatons_DFA_fromWords(unittest.TestCase):
+    
+    Words = sorted(['car','cars','cat','cats','do','dog','dogs','done','[x]'])
+    
+    def test_accepts(self):
+        DFA = automata.DFA.fromWords(self.Words)
+        for i in self.Words:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['','ca','dot','catss','x']:
+            self.assertFalse(DFA.accepts(i))
+        del DFA
+        
+    def test_minimal(self):
+        DFA = automata.DFA.fromWords(self.Words)
+        Count = len(DFA.getStates())
+        DFA.reduce()
+        self.assertEqual(len(DFA.getStates()),Count)
+        self.assertEqual(DFA.getStates()[0],'q_0')
+        del DFA
+        
+    def test_unsorted(self):
+        with self.assertRaises(ValueError):
+            automata.DFA.fromWords(['b','a'])
+
+class Test_Automatons_DFA_update(unittest.TestCase):
+    
+    Words = sorted(['car','cars','cat','cats','do','dog','dogs','done','[x]'])
+    
+    def test_words(self):
+        DFA = automata.DFA.fromWords(self.Words)
+        DFA.addWords(['cab','dot','zoo',''])
+        DFA.removeWords(['cars','dogs','cow'])
+        Words = sorted((set(self.Words) | {'cab','dot','zoo',''}) - {'cars','dogs'})
+        for i in Words:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['cars','dogs','cow','ca','zo']:
+            self.assertFalse(DFA.accepts(i))
+        self.assertEqual(len(DFA.getStates()),len(automata.DFA.fromWords(Words).getStates()))
+        self.assertEqual(DFA.getStates()[0],'q_0')
+        del DFA
+        
+    def test_cyclic(self):
+        DFA = automata.NFA('./testGraphs/nfa_11.gv').toDFA()
+        DFA.reduce()
+        DFA.addWords(['1.','.5'])
+        DFA.removeWords(['42','0.1'])
+        for i in ['1.','.5','3.14','7','420']:
+            self.assertTrue(DFA.accepts(i))
+        for i in ['42','0.1','.','1..']:
+            self.assertFalse(DFA.accepts(i))
+        Count = len(DFA.getStates())
+        DFA.reduce()
+        self.assertEqual(len(DFA.getStates()),Count)
+        del DFA
+
+class Test_Automatons_DFA_fingerprint(unittest.TestCase):
+    
+    def test_equivalent(self):
+        DFA = automata.NFA('./testGraphs/dfa.gv').toDFA()
+        DFA.reduce()
+        Other = automata.NFA('./testGraphs/dfa_7.gv').toDFA(True)
+        Other.reduce()
+        self.assertEqual(DFA.fingerprint(),Other.fingerprint())
+        Other = automata.NFA('./testGraphs/dfa_1.gv').toDFA()
+        Other.reduce()
+        self.assertNotEqual(DFA.fingerprint(),Other.fingerprint())
+        del DFA, Other
+        
+    def test_canonicalize(self):
+        DFA = automata.DFA.fromWords(['ab','b'])
+        Other = automata.DFA.fromWords([])
+        Other.addWords(['b','ab'])
+        Fingerprint = Other.fingerprint()
+        DFA.canonicalize()
+        Other.canonicalize()
+        self.assertEqual(DFA.getStates(),['q_0','q_1','q_2'])
+        self.assertEqual(DFA.getDeltas(),Other.getDeltas())
+        self.assertEqual(Other.fingerprint(),Fingerprint)
+        self.assertTrue(DFA.accepts('ab') and DFA.accepts('b'))
+        self.assertFalse(DFA.accepts('a'))
+        del DFA, Other
+
+    def test_empty_language(self):
+        NFA = automata.NFA.fromComponents(['q_0','q_1'],['a','b'],[['q_0','a','q_1'],['q_1','b','q_0']],[])
+        Dense = NFA.toDFA()
+        Sparse = NFA.toDFA(True)
+        self.assertEqual(Dense.fingerprint(),Sparse.fingerprint())
+        Dense.reduce()
+        Sparse.reduce()
+        self.assertEqual(Dense.getDeltas(),[])
+        self.assertEqual(Dense.fingerprint(),Sparse.fingerprint())
+        Dense.addWords(['ab'])
+        self.assertEqual(len(Dense.getStates()),len(automata.DFA.fromWords(['ab']).getStates()))
+        self.assertEqual(Dense.fingerprint(),automata.DFA.fromWords(['ab']).fingerprint())
+        del NFA, Dense, Sparse
+        
+class Test_Automatons_DFA_count(unittest.TestCase):
+    
+    def test_count(self):
+        DFA = automata.NFA('./testGraphs/nfa_11.gv').toDFA()
+        self.assertEqual(DFA.countAccepted(0),0)
+        self.assertEqual(DFA.countAccepted(3),1100)
+        self.assertEqual(DFA.countAcceptedUpTo(3),1210)
+        self.assertEqual(DFA.countAccepted(30),38*10**29)
+        Prime = 1000003
+        self.assertEqual(DFA.countAccepted(10**6,Prime),(pow(10,10**6,Prime) + (10**6 - 2)*pow(10,10**6 - 1,Prime)) % Prime)
+        del DFA
+        
+    def test_finite(self):
+        DFA = automata.DFA.fromWords(['ab','abc','b'])
+        self.assertTrue(DFA.isFinite())
+        self.assertFalse(DFA.isEmpty())
+        self.assertEqual(DFA.countAcceptedUpTo(10**18),3)
+        DFA = automata.NFA('./testGraphs/nfa_11.gv').toDFA()
+        self.assertFalse(DFA.isFinite())
+        DFA = automata.DFA.fromWords([])
+        self.assertTrue(DFA.isEmpty())
+        self.assertEqual(DFA.countAccepted(2),0)
+        del DFA
+        
+    def test_no_edges(self):
+        for DFA in [automata.DFA.fromWords(['']),
+                    automata.DFA.fromComponents(['q_0','q_1'],['a'],[],['q_0']),
+                    automata.DFA.fromComponents(['q_0','q_1'],['a'],[['q_0','a','q_1']],['q_0'])]:
+            self.assertEqual([DFA.countAccepted(n) for n in range(6)],[1,0,0,0,0,0])
+            self.assertEqual([DFA.countAcceptedUpTo(n) for n in range(4)],[1,1,1,1])
+            self.assertEqual(DFA.countAccepted(1,7),0)
+            self.assertTrue(DFA.isFinite())
+            del DFA
+
+class Test_Automatons_DFA_enumerate(unittest.TestCase):
+    
+    def test_enumerate(self):
+        DFA = automata.DFA.fromWords(['a','ab','abc','b','ba'])
+        self.assertEqual(list(DFA.enumerate()),['a','b','ab','ba','abc'])
+        self.assertEqual(list(DFA.enumerate(1)),['a','b'])
+        DFA = automata.NFA('./testGraphs/nfa_11.gv').toDFA()
+        Strings = DFA.enumerate()
+        self.assertEqual([next(Strings) for i in range(12)],['0','1','2','3','4','5','6','7','8','9','00','01'])
+        self.assertEqual(len(list(DFA.enumerate(3))),DFA.countAcceptedUpTo(3))
+        del DFA
+        
+    def test_sample(self):
+        DFA = automata.NFA('./testGraphs/nfa_11.gv').toDFA()
+        Strings = DFA.sample(12000,4,random.Random(0))
+        self.assertTrue(all(len(i) == 4 and DFA.accepts(i) for i in Strings))
+        #10000 of the 12000 strings of length 4 have no '.'.
+        self.assertTrue(9500 < sum('.' not in i for i in Strings) < 10500)
+        with self.assertRaises(ValueError):
+            automata.DFA.fromWords(['ab']).sample(1,3)
+        del DFA
+
+class Test_Automatons_DFA_compile(unittest.TestCase):
+    
+    def test_nfa9_cached(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        Words = ['x','x9f','_id0','Zeta','xff00','','9x','a-b','\u00e9t\u00e9']
+        with tempfile.TemporaryDirectory() as Dir:
+            for i in range(2):
+                Match = DFA.compile(Dir)
+                self.assertEqual([Match(j) for j in Words],[True]*5 + [False]*4)
+            self.assertEqual(len(os.listdir(Dir)),1)
+        del NFA
+        del DFA
+        
+    def test_nfa6_uncached(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA(sparse=True)
+        DFA.reduce()
+        Match = DFA.compile(None)
+        Words = [''.join(j) for n in range(7) for j in itertools.product('abc',repeat=n)]
+        self.assertEqual([Match(j) for j in Words],[DFA.accepts(j) for j in Words])
+        del NFA
+        del DFA
+
+class Test_Automatons_DFA_reduce(unittest.TestCase):
+    
+    def test_nfa1(self):
+        NFA = automata.NFA('./testGraphs/nfa_1.gv')
+        DFA = NFA.toDFA()
+        DFA.reduce()
+        self.assertEqual(len(DFA.getStates()),6)
+        del NFA
+        del DFA
+        
+    def test_nfa8(self):
+        NFA = automata.NFA('./testGraphs/nfa_8.gv')
+        DFA = NFA.toDFA()
+        DFA.reduce()
+        self.assertEqual(len(DFA.getStates()),5)
+        self.assertEqual(len(DFA.getFinalStates()),2)
+        del NFA
+        del DFA
+        
+    def test_nfa9(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        DFA.reduce()
+        self.assertEqual(DFA.getStates(),['q_0','q_1'])
+        self.assertEqual(DFA.getFinalStates(),['q_1'])
+        del NFA
+        del DFA
+        
+    def test_start_not_first(self):
+        for Backend in ['python'] + (['numpy'] if automata.np is not None else []):
+            DFA = automata.DFA.fromComponents(['q_1','q_0'],['a'],[['q_1','a','q_1'],['q_0','a','q_1']],['q_0','q_1'])
+            DFA.reduce(Backend)
+            self.assertEqual(DFA.getStates(),['q_0'])
+            self.assertTrue(DFA.accepts(''))
+            self.assertTrue(DFA.accepts('aa'))
+            del DFA
+        
+    @unittest.skipIf(automata.np is None,'needs NumPy')
+    def test_backends_agree(self):
+        for i in range(1,10):
+            NFA = automata.NFA('./testGraphs/nfa_%d.gv' % i)
+            DFA1 = NFA.toDFA()
+            DFA1.reduce('numpy')
+            DFA2 = NFA.toDFA()
+            DFA2.reduce('python')
+            self.assertEqual(DFA1.getStates(),DFA2.getStates())
+            self.assertEqual(DFA1.getDeltas(),DFA2.getDeltas())
+            del NFA
+            del DFA1
+            del DFA2
+            
+    def test_backend_errors(self):
+        DFA = automata.NFA('./testGraphs/nfa_6.gv').toDFA()
+        States = DFA.getStates()
+        with self.assertRaises(ValueError):
+            DFA.reduce('fortran')
+        Numpy = automata.np
+        automata.np = None
+        try:
+            with self.assertRaises(ImportError):
+                DFA.reduce('numpy')
+        finally:
+            automata.np = Numpy
+        self.assertEqual(DFA.getStates(),States)
+        del DFA
+        
+class Test_Automatons_DFA_trim(unittest.TestCase):
+    
+    def test_nfa6(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        DFA.trim()
+        self.assertNotIn('\u2205',DFA.getStates())
+        self.assertEqual(len(DFA.getStates()),4)
+        self.assertTrue(DFA.accepts('abab'))
+        self.assertFalse(DFA.accepts('b'))
+        del NFA
+        del DFA
+        
+    def test_nfa6_keep_dead(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        States = DFA.getStates()
+        DFA.trim(removeDead=False)
+        self.assertEqual(DFA.getStates(),States)
+        del NFA
+        del DFA
+
+class Test_Automatons_Lexer_tokenize(unittest.TestCase):
+    
+    Files = ['./testGraphs/nfa_%d.gv' % i for i in [10,9,11,12]]
+    
+    def test_longest_match(self):
+        Lexer = automata.Lexer([automata.NFA(i) for i in self.Files])
+        Text = 'if iffy = 12.5+x1*3.'
+        Tokens = [(i[0],Text[i[1]:i[2]]) for i in Lexer.tokenize(Text)]
+        self.assertEqual(Tokens,[(0,'if'),(3,' '),(1,'iffy'),(3,' '),(3,'='),(3,' '),(2,'12.5'),(3,'+'),
+                                 (1,'x1'),(3,'*'),(2,'3'),(3,'.')])
+        
+    def test_chunks(self):
+        Lexer = automata.Lexer([automata.NFA(i) for i in self.Files])
+        Text = 'if iffy = 12.5+x1*3.'
+        for n in [1,2,5]:
+            Chunks = [Text[i:i+n] for i in range(0,len(Text),n)]
+            self.assertEqual(list(Lexer.tokenize(Chunks)),list(Lexer.tokenize(Text)))
+        self.assertEqual(list(Lexer.tokenize('')),[])
+        
+    def test_no_match(self):
+        Lexer = automata.Lexer([automata.NFA(i) for i in self.Files])
+        with self.assertRaises(ValueError):
+            list(Lexer.tokenize('if ! x'))
+
+class Test_Automatons_writeDot(unittest.TestCase):
+    
+    def test_nfa2(self):
+        NFA = automata.NFA('./testGraphs/nfa_2.gv')
+        Out = io.StringIO()
+        NFA.writeDot(Out)
+        Text = Out.getvalue()
+        self.assertIn('"q_1" -> "q_2" [label="0,1"];',Text)
+        self.assertIn('q_i -> "q_0"',Text)
+        del NFA
+        
+    def test_nfa9_roundtrip(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA()
+        DFA.reduce()
+        del NFA
+        with tempfile.TemporaryDirectory() as Dir:
+            Name = os.path.join(Dir,'dfa_9.gv')
+            DFA.writeDot(Name)
+            NFA = automata.NFA(Name)
+        self.assertEqual(NFA.getStates(),DFA.getStates())
+        self.assertEqual(NFA.getFinalStates(),DFA.getFinalStates())
+        Copy = NFA.toDFA()
+        for i in ['x','x9f','_id0','','9x','a-b']:
+            self.assertEqual(Copy.accepts(i),DFA.accepts(i))
+        del NFA
+        del DFA
+        del Copy
+        
+    def test_backslash_roundtrip(self):
+        States = ['q_0','q_1\\']
+        Deltas = [['q_0','\\','q_1\\'],['q_1\\','[\\]\\\\]','q_0']]
+        NFA = automata.NFA.fromComponents(States,['\\','[\\]\\\\]'],Deltas,['q_1\\'])
+        with tempfile.TemporaryDirectory() as Dir:
+            Name = os.path.join(Dir,'backslash.gv')
+            NFA.writeDot(Name)
+            Copy = automata.NFA(Name)
+        self.assertEqual(Copy.getStates(),States)
+        self.assertEqual(Copy.getFinalStates(),['q_1\\'])
+        self.assertEqual(sorted(Copy.getDeltas()),sorted(Deltas))
+        for i in ['\\','\\]\\','\\\\\\','\\]']:
+            self.assertEqual(Copy.accepts(i),NFA.accepts(i))
+        del NFA
+        del Copy
+        
+    def test_nfa6_collapse(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Out = io.StringIO()
+        DFA.writeDot(Out,collapse=True)
+        Text = Out.getvalue()
+        self.assertIn('"{q_1,q_2,q_3} (3 states)"',Text)
+        self.assertNotIn('"q_2" ->',Text)
+        del NFA
+        del DFA
+        
+    def test_nfa6_focus(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Out = io.StringIO()
+        DFA.writeDot(Out,focus=['q_3'],hops=1)
+        Text = Out.getvalue()
+        self.assertIn('"q_3" -> "q_2"',Text)
+        self.assertNotIn('"q_0"',Text)
+        del NFA
+        del DFA
+        
+    def test_focus_limit(self):
+        States = ['q_' + str(i) for i in range(20)]
+        DFA = automata.DFA.fromComponents(States,['a'],[[States[i],'a',States[i+1]] for i in range(19)],['q_19'])
+        Out = io.StringIO()
+        DFA.writeDot(Out,focus=['q_10'],hops=3,limit=3)
+        Text = Out.getvalue()
+        self.assertIn('"q_10" -> "q_11"',Text)
+        self.assertIn('"q_11" -> "q_12"',Text)
+        self.assertNotIn('"q_9"',Text)
+        Out = io.StringIO()
+        DFA.writeDot(Out,focus=['q_10'],hops=3,limit=3,collapse=True)
+        self.assertIn('"q_10" -> "q_11"',Out.getvalue())
+        del DFA
+        
+    def test_nfa8_limit(self):
+        NFA = automata.NFA('./testGraphs/nfa_8.gv')
+        DFA = NFA.toDFA()
+        Out = io.StringIO()
+        DFA.writeDot(Out,limit=2)
+        Text = Out.getvalue()
+        self.assertIn('q_i -> "q_0"',Text)
+        self.assertNotIn('"q_2"',Text)
+        del NFA
+        del DFA
+
+def convert(file):
+    NFA = automata.NFA(file)
+    DFA = NFA.toDFA()
+    DFA.reduce()
+    Words = [''.join(i) for n in range(5) for i in itertools.product('ab01x_',repeat=n)]
+    return (DFA.getStates(),DFA.getDeltas(),DFA.getFinalStates(),[DFA.accepts(i) for i in Words])
+
+class Test_Automatons_concurrency(unittest.TestCase):
+    
+    Files = ['./testGraphs/nfa_%d.gv' % i for i in range(1,10)]
+    
+    def test_instances_isolated(self):
+        NFA1 = automata.NFA('./testGraphs/nfa_1.gv')
+        NFA2 = automata.NFA('./testGraphs/nfa_2.gv')
+        self.assertEqual(NFA1.getStates(),['q_0','q_1','q_2','q_3','q_4','q_5'])
+        self.assertEqual(NFA2.getStates(),['q_0','q_1','q_2'])
+        self.assertEqual(NFA1.getAlphabet(),['a'])
+        del NFA2
+        self.assertEqual(len(NFA1.getDeltas()),6)
+        
+    def test_threaded_conversions(self):
+        Serial = {}
+        for i in self.Files:
+            Serial[i] = convert(i)
+        Jobs = [self.Files[i % len(self.Files)] for i in range(300)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as Pool:
+            Results = list(Pool.map(convert,Jobs))
+        for i in range(len(Jobs)):
+            self.assertEqual(Results[i],Serial[Jobs[i]])
+            
+    def test_snapshot(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Frozen = DFA.snapshot()
+        with self.assertRaises(AttributeError):
+            Frozen.accepts = None
+        DFA.setStorage('sparse')
+        self.assertIsNot(DFA.snapshot(),Frozen)
+        self.assertEqual(Frozen.getStorage()['sparse'],0)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as Pool:
+            Results = list(Pool.map(Frozen.accepts,['abab']*100 + ['b']*100))
+        self.assertEqual(Results,[True]*100 + [False]*100)
+        
+    @unittest.skipIf(automata.np is None,'needs NumPy')
+    def test_shared_memory(self):
+        NFA = automata.NFA('./testGraphs/nfa_9.gv')
+        DFA = NFA.toDFA(True)
+        DFA.reduce()
+        Words = ['x','x9f','_id0','Zeta','xff00','','9x','a-b','\u00e9t\u00e9']*50
+        Shared = DFA.toSharedMemory()
+        Attached = automata.DFA.fromSharedMemory(Shared.getName())
+        self.assertEqual(Attached.acceptsMany(Words),[DFA.accepts(i) for i in Words])
+        self.assertEqual(Shared.acceptsMany(Words,workers=2,batch=64),[DFA.accepts(i) for i in Words])
+        with self.assertRaises(ValueError):
+            Attached.unlink()
+        Attached.close()
+        Shared.close()
+        Shared.unlink()
+        self.assertEqual(DFA.acceptsMany(Words,workers=2),[DFA.accepts(i) for i in Words])
+        del NFA
+        del DFA
+        
+    @unittest.skipIf(automata.np is None,'needs NumPy')
+    def test_shared_memory_process(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Shared = DFA.toSharedMemory()
+        #a separate interpreter has its own resource tracker; its exit must not destroy the block.
+        Script = ('import automata\nD = automata.DFA.fromSharedMemory(%r)\nprint(D.accepts(%r))\nD.close()\n' 
+                  % (Shared.getName(),'abab'))
+        Result = subprocess.run([sys.executable,'-c',Script],capture_output=True,text=True,timeout=120)
+        self.assertEqual(Result.stdout.strip(),str(DFA.accepts('abab')))
+        self.assertNotIn('leaked',Result.stderr)
+        Attached = automata.DFA.fromSharedMemory(Shared.getName())
+        self.assertEqual(Attached.accepts('abab'),DFA.accepts('abab'))
+        Attached.close()
+        Shared.close()
+        Shared.unlink()
+        del NFA
+        del DFA
+        
+    @unittest.skipIf(automata.np is None,'needs NumPy')
+    def test_parallel_scan(self):
+        NFA = automata.NFA('./testGraphs/nfa_6.gv')
+        DFA = NFA.toDFA()
+        Text = 'abbabaababbbaab'*20
+        Expected = [i for i in range(len(Text)+1) if DFA.accepts(Text[:i])]
+        Serial = DFA.scan(Text)
+        self.assertEqual(Serial[1],Expected)
+        self.assertEqual(DFA.scan(Text,workers=2,chunk=7),Serial)
+        with tempfile.TemporaryDirectory() as Dir:
+            Path = os.path.join(Dir,'text.txt')
+            with open(Path,'w',encoding='utf-8') as f:
+                f.write(Text)
+            self.assertEqual(DFA.scanFile(Path,workers=2,chunk=16),Serial)
+        del NFA
+        del DFA
+
+        
+class Test_Server(unittest.TestCase):
+    
+    def test_jobs(self):
+        Dir = tempfile.mkdtemp()
+        Socket = os.path.join(Dir,'automata.sock')
+        Server = server.Server(Socket,workers=1)
+        Thread = threading.Thread(target=Server.run)
+        Thread.start()
+        self.assertTrue(Server.ready(30))
+        Path = os.path.abspath('./testGraphs/nfa_6.gv')
+        Output = os.path.join(Dir,'dfa.gv')
+        Reply = client.request({'op':'minimize','path':Path,'output':Output},Socket)
+        self.assertTrue(Reply['ok'])
+        self.assertFalse(Reply['cached'])
+        self.assertTrue(os.path.exists(Output))
+        NFA = automata.NFA(Path)
+        DFA = NFA.toDFA(sparse=True)
+        DFA.reduce()
+        self.assertEqual(Reply['states'],len(DFA.getStates()))
+        Words = [''.join(i) for n in range(4) for i in itertools.product('abc',repeat=n)]
+        Reply = client.request({'op':'match','path':Path,'strings':Words},Socket)
+        self.assertTrue(Reply['cached'])
+        self.assertEqual(Reply['results'],[NFA.accepts(i) for i in Words])
+        Reply = client.request({'op':'convert','path':os.path.join(Dir,'missing.gv')},Socket)
+        self.assertFalse(Reply['ok'])
+        self.assertEqual(client.request({'op':'stats'},Socket)['hits'],1)
+        self.assertTrue(client.request({'op':'shutdown'},Socket)['ok'])
+        Thread.join(30)
+        self.assertFalse(os.path.exists(Socket))
+        os.remove(Output)
+        os.rmdir(Dir)
+        del NFA
+        del DFA
 
 
 if __name__ == '__main__':